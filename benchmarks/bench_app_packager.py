@@ -0,0 +1,106 @@
+"""
+Measures AppPackager throughput on a generated source tree.
+
+Generates `--files` files (mostly small text files plus a few larger binaries,
+roughly like an application checkout) and packages them as .zip and .tar.gz
+with the standard library's `zipfile`/`tarfile` and with AppPackager at
+several worker counts, then times an incremental rebuild after one file
+changed.
+
+Usage:
+    python benchmarks/bench_app_packager.py --files 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from app_packager import AppPackager
+
+WORDS = [b"deploy", b"package", b"config", b"return", b"import", b"self", b"logger", b"value", b"\n"]
+
+
+def generate_tree(root, file_count):
+    """Writes `file_count` files under `root`; returns their total size in bytes."""
+    rng = random.Random(42)
+    total = 0
+    for index in range(file_count):
+        path = os.path.join(root, f"pkg{index % 50}", f"module{index % 400}", f"file{index}.py")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if index % 1000 == 0:
+            data = os.urandom(rng.randrange(512 * 1024, 2 * 1024 * 1024))
+        else:
+            data = b" ".join(rng.choice(WORDS) for _ in range(rng.randrange(50, 4000)))
+        with open(path, "wb") as f:
+            f.write(data)
+        total += len(data)
+    return total
+
+
+def stdlib_zip(source_dir, package_path):
+    with zipfile.ZipFile(package_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for root, _, files in os.walk(source_dir):
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                archive.write(full_path, os.path.relpath(full_path, source_dir))
+
+
+def stdlib_tar_gz(source_dir, package_path):
+    with tarfile.open(package_path, "w:gz", compresslevel=6) as archive:
+        archive.add(source_dir, arcname=".")
+
+
+def run_benchmark(file_count, worker_counts):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        source_dir = os.path.join(workdir, "source")
+        total_bytes = generate_tree(source_dir, file_count)
+        print(f"Generated {file_count} files, {total_bytes / (1024 * 1024):.1f} MB")
+
+        for package_name, baseline in (("app.zip", stdlib_zip), ("app.tar.gz", stdlib_tar_gz)):
+            package_path = os.path.join(workdir, "baseline-" + package_name)
+            start = time.perf_counter()
+            baseline(source_dir, package_path)
+            results.append((package_name, "stdlib", time.perf_counter() - start, os.path.getsize(package_path)))
+
+            for workers in worker_counts:
+                packager = AppPackager(source_dir, os.path.join(workdir, f"out{workers}"), MagicMock(),
+                                       package_name=package_name, workers=workers)
+                start = time.perf_counter()
+                packager.create_package()
+                results.append((package_name, f"AppPackager x{workers}", time.perf_counter() - start,
+                                os.path.getsize(packager.package_path)))
+
+            changed_path = os.path.join(source_dir, "pkg7", "module7", "file7.py")
+            with open(changed_path, "ab") as f:
+                f.write(b"\n# changed\n")
+            start = time.perf_counter()
+            packager.create_package()
+            results.append((package_name, "1-file rebuild", time.perf_counter() - start,
+                            os.path.getsize(packager.package_path)))
+    return total_bytes, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    total_bytes, results = run_benchmark(args.files, sorted(set(args.workers)))
+    for package_name, builder, seconds, size in results:
+        print(f"{package_name:<11} {builder:<16} {seconds:7.2f}s  "
+              f"{total_bytes / (1024 * 1024) / seconds:7.1f} MB/s  {size / (1024 * 1024):7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Measures response size and latency of latest-commit lookups against a local stand-in.
+
+The "full page" rows fetch the default commit list and read its first entry,
+as the managers used to (30 GitHub commits, 100 Azure DevOps commits). The
+other rows use the managers' lookups: a one-commit list for the default
+branch, or the branch ref when a branch is configured. The stand-in serves
+commit objects shaped like the real APIs' and adds `--latency-ms` to every
+response.
+
+Usage:
+    python benchmarks/bench_commit_lookup.py --lookups 50 --latency-ms 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from azure_manager import AzureDevOpsManager
+from github_manager import GitHubRepositoryManager
+from http_session import PooledSession
+from standins import CommitHistoryHandler, http_standin
+
+
+def measure(lookup, session, count):
+    """Returns (response bytes, per-lookup latencies in ms) for `count` calls of `lookup`."""
+    sizes = []
+    session.hooks["response"] = [lambda response, *args, **kwargs: sizes.append(len(response.content))]
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        if not lookup():
+            raise RuntimeError("lookup returned no commit")
+        latencies.append((time.perf_counter() - start) * 1000)
+    session.hooks["response"] = []
+    return sizes[-1], latencies
+
+
+def run_benchmark(count, latency):
+    session = PooledSession()
+    with http_standin(CommitHistoryHandler, latency=latency) as base_url:
+        def github(branch=None):
+            manager = GitHubRepositoryManager("vzlatsin", "app", MagicMock(), session=session, branch=branch)
+            manager.api_base = base_url
+            manager.api_url = f"{base_url}/repos/vzlatsin/app/commits"
+            return manager
+
+        def azure(branch=None):
+            manager = AzureDevOpsManager(f"{base_url}/org/project/_git/app", "org", "project", "app", "token",
+                                         MagicMock(), session=session, branch=branch)
+            manager.api_base = base_url
+            return manager
+
+        azure_page_url = f"{base_url}/org/project/_apis/git/repositories/app/commits?api-version=6.0"
+        lookups = {
+            "GitHub full page": lambda: session.get(github().api_url).json()[0]["sha"],
+            "GitHub per_page=1": github().fetch_latest_commit,
+            "GitHub branch ref": github("main").fetch_latest_commit,
+            "Azure full page": lambda: session.get(azure_page_url).json()["value"][0]["commitId"],
+            "Azure $top=1": azure().get_latest_commit,
+            "Azure branch ref": azure("main").get_latest_commit,
+        }
+        results = {name: measure(lookup, session, count) for name, lookup in lookups.items()}
+    session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    for name, (size, latencies) in run_benchmark(args.lookups, args.latency_ms / 1000).items():
+        latencies.sort()
+        print(f"{name:<18} {size:>8} bytes  mean {statistics.mean(latencies):6.2f} ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Measures configuration loading and per-app parameter formatting.
+
+A generated `step_parameters.json` with per-app overrides for `--apps` apps is
+loaded and formatted for every step of every app:
+1. the previous approach: `json.load` of both files on every orchestrator
+   (steps_config.json twice), then `str.format(app=...)` on every value;
+2. deployment_config.py: the first (cold) load, which parses, validates
+   and compiles the templates;
+3. deployment_config.py: later (warm) loads, which only stat the files,
+   plus formatting from the compiled templates.
+
+Usage:
+    python benchmarks/bench_config.py --apps 500 --rounds 20
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+CONFIG_DIR = os.path.join(BENCH_DIR, "..", "config")
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from deployment_config import load_step_parameters, load_steps_config
+
+
+def write_config(config_dir, apps):
+    shutil.copy(os.path.join(CONFIG_DIR, "steps_config.json"), config_dir)
+    with open(os.path.join(CONFIG_DIR, "step_parameters.json")) as f:
+        parameters = json.load(f)
+    parameters["apps"] = {app: {"deploy": {"remote_package_path": f"/srv/{app}/{{app}}.tar.gz"}} for app in apps}
+    with open(os.path.join(config_dir, "step_parameters.json"), "w") as f:
+        json.dump(parameters, f, indent=4)
+    return [step for step in parameters if step not in ("apps", "http")]
+
+
+def previous_approach(config_dir, steps, apps):
+    with open(os.path.join(config_dir, "steps_config.json")) as f:
+        json.load(f)
+    with open(os.path.join(config_dir, "step_parameters.json")) as f:
+        parameters = json.load(f)
+    with open(os.path.join(config_dir, "steps_config.json")) as f:
+        json.load(f)
+    for app in apps:
+        for step in steps:
+            params = {**parameters.get(step, {}), **parameters["apps"].get(app, {}).get(step, {})}
+            {key: value.format(app=app) if isinstance(value, str) else value for key, value in params.items()}
+
+
+def cached_loader(config_dir, steps, apps):
+    load_steps_config(config_dir=config_dir)
+    parameters = load_step_parameters(config_dir=config_dir)
+    for app in apps:
+        for step in steps:
+            parameters.for_app(step, app)
+
+
+def timed_ms(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=20, help="Runs (orchestrators) measured per variant")
+    args = parser.parse_args()
+
+    apps = [f"app{index}" for index in range(args.apps)]
+    with tempfile.TemporaryDirectory() as config_dir:
+        steps = write_config(config_dir, apps)
+        previous = min(timed_ms(previous_approach, config_dir, steps, apps) for _ in range(args.rounds))
+        cold = timed_ms(cached_loader, config_dir, steps, apps)
+        warm = min(timed_ms(cached_loader, config_dir, steps, apps) for _ in range(args.rounds))
+
+    print(f"{args.apps} apps x {len(steps)} steps, best of {args.rounds} runs:")
+    print(f"   json.load + str.format   {previous:8.2f} ms")
+    print(f"   compiled, cold load      {cold:8.2f} ms")
+    print(f"   compiled, cached load    {warm:8.2f} ms  ({previous / warm:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
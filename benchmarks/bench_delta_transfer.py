@@ -0,0 +1,88 @@
+"""
+Compares a full SFTP upload with DeltaTransfer for a package that changed slightly.
+
+The previous package is placed on a local paramiko SSH/SFTP stand-in, then a
+new version (a few inserted and rewritten regions) is deployed both ways over
+one pooled connection. Reports bytes sent and wall time for each.
+
+Usage:
+    python benchmarks/bench_delta_transfer.py --size-mb 64 --changes 4
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from delta_transfer import DeltaTransfer
+from remote_deployer import RemoteDeployer
+from ssh_pool import SSHConnectionPool
+from standins import ssh_standin
+
+
+def make_versions(workdir, size_mb, changes):
+    """Writes an old package and a new one with `changes` small edits."""
+    rng = random.Random(1)
+    old_data = os.urandom(size_mb * 1024 * 1024)
+    new_data = bytearray(old_data)
+    for _ in range(changes):
+        offset = rng.randrange(len(new_data) - 64 * 1024)
+        if rng.random() < 0.5:
+            new_data[offset:offset] = os.urandom(rng.randrange(1, 4096))
+        else:
+            new_data[offset:offset + 16 * 1024] = os.urandom(16 * 1024)
+
+    paths = {}
+    for name, data in (("old", old_data), ("new", bytes(new_data))):
+        paths[name] = os.path.join(workdir, f"{name}.tar.gz")
+        with open(paths[name], "wb") as f:
+            f.write(data)
+    return paths
+
+
+def run_benchmark(size_mb, changes):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = make_versions(workdir, size_mb, changes)
+        remote_path = os.path.join(workdir, "remote.tar.gz")
+
+        with ssh_standin(workdir) as standin:
+            pool = SSHConnectionPool()
+            deployer = RemoteDeployer(standin.host, standin.user, standin.key_path, MagicMock(), pool=pool, port=standin.port)
+
+            shutil.copyfile(paths["old"], remote_path)
+            start = time.perf_counter()
+            deployer.upload_file(paths["new"], remote_path)
+            results["full upload"] = (os.path.getsize(paths["new"]), time.perf_counter() - start)
+
+            shutil.copyfile(paths["old"], remote_path)
+            start = time.perf_counter()
+            stats = DeltaTransfer(deployer, MagicMock()).upload(paths["new"], remote_path)
+            results["delta upload"] = (stats["bytes_sent"], time.perf_counter() - start)
+
+            with open(remote_path, "rb") as remote, open(paths["new"], "rb") as local:
+                assert remote.read() == local.read(), "delta upload produced a different file"
+
+            pool.close_all()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--changes", type=int, default=4)
+    args = parser.parse_args()
+
+    for name, (bytes_sent, seconds) in run_benchmark(args.size_mb, args.changes).items():
+        print(f"{name:<13} {bytes_sent / (1024 * 1024):8.2f} MB sent  {seconds:7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
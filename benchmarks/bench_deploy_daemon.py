@@ -0,0 +1,75 @@
+"""
+Compares the per-job overhead of spawning `deploy.py` with submitting to the daemon.
+
+Each job runs the `cleanup` step (a no-op) for one app, so the time measured
+is the fixed cost around a deployment: interpreter start, imports, config
+parsing and step loading for `deploy.py`; interpreter start of the
+standard-library client plus one local HTTP round trip for the daemon.
+
+Usage:
+    python benchmarks/bench_deploy_daemon.py --jobs 20
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, "..", "src")
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure(command, count):
+    """Returns per-run wall times in milliseconds."""
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_benchmark(count):
+    results = {"deploy.py": measure([sys.executable, os.path.join(SRC_DIR, "deploy.py"),
+                                     "--steps", "cleanup", "--app", "demo"], count)}
+
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    daemon = subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "deploy_daemon.py"), "--port", str(port)],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    client = [sys.executable, os.path.join(SRC_DIR, "deploy_client.py"), "--url", url]
+    try:
+        deadline = time.time() + 30
+        while subprocess.run(client + ["health"], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL).returncode != 0:
+            if time.time() > deadline:
+                raise RuntimeError("daemon did not start")
+            time.sleep(0.1)
+        results["daemon + client"] = measure(client + ["submit", "--steps", "cleanup", "--app", "demo", "--wait"],
+                                             count)
+    finally:
+        daemon.terminate()
+        daemon.wait()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=20)
+    args = parser.parse_args()
+
+    for name, timings in run_benchmark(args.jobs).items():
+        timings.sort()
+        print(f"{name:<16} mean {statistics.mean(timings):7.1f} ms  p50 {timings[len(timings) // 2]:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares per-request latency of module-level `requests.get` with a shared PooledSession.
+
+Each client fetches a commit list `--requests` times from a local HTTPS
+stand-in. `requests.get` opens a new TCP connection and TLS handshake for every
+call; the pooled session keeps the connection alive and reuses it.
+
+Usage:
+    python benchmarks/bench_http_session.py --requests 200
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import requests
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from http_session import PooledSession
+from standins import CommitsAPIHandler, https_standin
+
+
+def measure(get, url, cert_path, count):
+    """Returns per-request latencies in milliseconds."""
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = get(url, verify=cert_path, timeout=10)
+        response.raise_for_status()
+        response.json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run_benchmark(count):
+    with tempfile.TemporaryDirectory() as workdir:
+        with https_standin(CommitsAPIHandler, workdir) as (base_url, cert_path):
+            url = f"{base_url}/repos/vzlatsin/app/commits"
+            session = PooledSession()
+            results = {
+                "requests.get": measure(requests.get, url, cert_path, count),
+                "PooledSession": measure(session.get, url, cert_path, count),
+            }
+            session.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    for name, latencies in run_benchmark(args.requests).items():
+        latencies.sort()
+        print(f"{name:<14} mean {statistics.mean(latencies):6.2f} ms  p50 {latencies[len(latencies) // 2]:6.2f} ms  "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
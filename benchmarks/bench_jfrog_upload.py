@@ -0,0 +1,65 @@
+"""
+Measures JFrogUploader throughput versus artifact size against a local Artifactory stand-in.
+
+Each size is uploaded as one streamed PUT and as a concurrent multipart
+upload, then deployed once more to a new path, which the checksum deploy
+completes without sending the bytes. With `--fail-every N` the stand-in rejects every N-th part with 503 so
+the cost of retrying only the failed parts can be compared.
+
+Usage:
+    python benchmarks/bench_jfrog_upload.py --sizes-mb 1 16 64 256 --concurrency 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from jfrog_uploader import JFrogUploader
+from standins import artifactory_standin
+
+
+def run_benchmark(sizes_mb, part_size_mb, concurrency, fail_every):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        with artifactory_standin(os.path.join(workdir, "storage"), fail_every=fail_every) as repo_url:
+            for size_mb in sizes_mb:
+                package_path = os.path.join(workdir, f"app-{size_mb}.tar.gz")
+                with open(package_path, "wb") as f:
+                    for _ in range(size_mb):
+                        f.write(os.urandom(1024 * 1024))
+
+                for mode in ("single", "multipart", "checksum"):
+                    uploader = JFrogUploader(repo_url, MagicMock())
+                    uploader.part_size = part_size_mb * 1024 * 1024
+                    uploader.multipart_threshold = 0 if mode == "multipart" else float("inf")
+                    # Only the last run may be deduplicated against the bytes the first two stored
+                    uploader.checksum_deploy = mode == "checksum"
+                    uploader.concurrency = concurrency
+                    uploader.backoff_base = 0.05
+                    if not uploader.upload_package(package_path, retry_count=5, target_path=f"{mode}/{size_mb}.tar.gz"):
+                        raise RuntimeError(f"{mode} upload of {size_mb} MB failed")
+                    results.append((size_mb, mode, uploader.last_stats))
+                os.remove(package_path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--part-size-mb", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--fail-every", type=int, default=None)
+    args = parser.parse_args()
+
+    for size_mb, mode, stats in run_benchmark(args.sizes_mb, args.part_size_mb, args.concurrency, args.fail_every):
+        print(f"{size_mb:>5} MB  {mode:<10} {stats['seconds']:7.2f}s  {stats['mb_per_second']:8.1f} MB/s  "
+              f"attempts={stats['attempts']}  skipped={stats['bytes_skipped'] / (1024 * 1024):.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measures the cost of DeploymentLogger calls.
+
+1. Per-call overhead of a suppressed `log_debug` with an eagerly built
+   f-string versus lazy %-style arguments.
+2. Per-call latency of `log_info` written to a rotating file, synchronously
+   and through the queue, in text and JSON format.
+3. Throughput of many concurrent "deploys" (threads that each log inside
+   their own run/app/step context), synchronously versus queued.
+
+Console output is disabled so that the terminal does not dominate the numbers.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 20000 --deploys 32
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+
+from deployment_logger import DeploymentLogger, log_context, shutdown_logging
+
+PARAMS = {"repo_owner": "example", "repo_name": "service", "branch": "main", "retry_count": 3}
+
+
+def per_call_ns(function, calls):
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter_ns() - start) / calls
+
+
+def bench_suppressed_debug(calls):
+    logger = DeploymentLogger(console=False)
+    eager = per_call_ns(lambda: logger.log_debug(f"🔹 Parameters for fetch: {PARAMS}"), calls)
+    lazy = per_call_ns(lambda: logger.log_debug("🔹 Parameters for %s: %s", "fetch", PARAMS), calls)
+    print(f"suppressed log_debug   eager f-string {eager:8.0f} ns/call   lazy args {lazy:8.0f} ns/call")
+
+
+def bench_file_logging(calls, log_file):
+    for json_format in (False, True):
+        for use_queue in (False, True):
+            logger = DeploymentLogger(json_format=json_format, use_queue=use_queue, console=False, log_file=log_file)
+            with log_context(run_id="bench", app="service", step="deploy"):
+                latency = per_call_ns(lambda: logger.log_info("🚀 Deploying %s to %s", "service", "host1"), calls)
+            start = time.perf_counter()
+            shutdown_logging()  # drains the queue
+            drain = (time.perf_counter() - start) * 1000
+            label = f"{'json' if json_format else 'text'} {'queued' if use_queue else 'sync'}"
+            print(f"log_info to file {label:<12} {latency:8.0f} ns/call in the caller, {drain:6.1f} ms to drain")
+
+
+def bench_concurrent_deploys(deploys, calls_per_deploy, log_file):
+    for use_queue in (False, True):
+        logger = DeploymentLogger(json_format=True, use_queue=use_queue, console=False, log_file=log_file)
+
+        def deploy(index):
+            with log_context(run_id="bench", app=f"app{index}"):
+                for call in range(calls_per_deploy):
+                    with log_context(step="deploy"):
+                        logger.log_info("Deployed batch %d", call, duration=0.01)
+
+        threads = [threading.Thread(target=deploy, args=(index,)) for index in range(deploys)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        callers_done = time.perf_counter() - start
+        shutdown_logging()
+        written = time.perf_counter() - start
+
+        total = deploys * calls_per_deploy
+        print(f"{deploys} concurrent deploys {'queued' if use_queue else 'sync':<6}  "
+              f"{total / callers_done:9.0f} records/s seen by callers, {total / written:9.0f} records/s written")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--deploys", type=int, default=32)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        log_file = os.path.join(workdir, "deploy.log")
+        bench_suppressed_debug(args.calls)
+        bench_file_logging(args.calls, log_file)
+        bench_concurrent_deploys(args.deploys, max(1, args.calls // args.deploys), log_file)
+
+
+if __name__ == "__main__":
+    main()
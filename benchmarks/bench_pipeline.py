@@ -0,0 +1,172 @@
+"""
+End-to-end benchmark of the deployment pipeline against local stand-ins.
+
+The real DeploymentOrchestrator runs `fetch package upload deploy` for
+`--apps` applications at once:
+- fetch reads branch refs and zipballs from a GitHub API stand-in;
+- package builds from generated source trees of `--files` files of about
+  `--file-kb` KB each;
+- upload goes to an Artifactory stand-in;
+- deploy goes over SFTP to a local paramiko SSH server.
+Nothing leaves 127.0.0.1.
+
+Each of `--runs` runs starts from empty caches ("cold"), then repeats the
+same deployment with unchanged inputs ("warm"). The report covers:
+- latency: median wall time and per-app p50/max;
+- throughput: apps/s and source MB/s;
+- memory: peak RSS of the process, which includes the stand-ins;
+- per-step wall time and network bytes (sent + received), from the orchestrator's run metrics.
+
+`--save` writes the results to benchmarks/results/ (see results.py) and
+`--compare` reports the change against an earlier result file, exiting
+with status 1 if a metric regressed by more than `--threshold`.
+
+Usage:
+    python benchmarks/bench_pipeline.py --apps 4 --files 200 --file-kb 16 --runs 3 --save
+    python benchmarks/bench_pipeline.py --compare benchmarks/results/pipeline-<commit>.json
+"""
+import argparse
+import hashlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from deployment_logger import DeploymentLogger
+from deployment_orchestrator import DeploymentOrchestrator
+from instrumentation import peak_rss_bytes
+from results import compare, format_comparison, load_results, metric, save_results
+from standins import (GitHubAPIHandler, artifactory_standin, generate_source_tree, http_standin, make_zipball,
+                      ssh_standin)
+
+STEPS = ["fetch", "package", "upload", "deploy"]
+
+
+def pipeline_parameters(workdir, github_url, artifactory_url, ssh):
+    """Step parameters of `config/step_parameters.json`, pointed at the stand-ins and `workdir`."""
+    cache_dir = os.path.join(workdir, "cache")
+    return {
+        "fetch": {"repo_owner": "bench", "repo_name": "{app}", "branch": "main", "api_base": github_url,
+                  "target_directory": os.path.join(workdir, "build", "{app}", "source"), "cache_dir": cache_dir},
+        "package": {"output_dir": os.path.join(workdir, "build"), "package_name": "{app}.tar.gz",
+                    "compression_level": 6, "cache_dir": cache_dir},
+        "upload": {"repo_url": artifactory_url, "target_path": "{app}/{app}.tar.gz", "retry_count": 3},
+        "deploy": {"target": ssh.host, "ssh_port": ssh.port, "ssh_user": ssh.user, "ssh_key_path": ssh.key_path,
+                   "local_package_path": os.path.join(workdir, "build", "{app}.tar.gz"),
+                   "remote_package_path": os.path.join(workdir, "remote", "{app}.tar.gz"),
+                   "transfer_mode": "sftp", "fallback_to_scp": False},
+    }
+
+
+def create_repositories(root, apps, files, file_size):
+    """Generates a source tree and zipball per app. Returns ({app: (sha, zip path)}, total source bytes)."""
+    repositories = {}
+    total = 0
+    for index, app in enumerate(apps):
+        source = os.path.join(root, "sources", app)
+        total += generate_source_tree(source, files=files, file_size=file_size, seed=index)
+        sha = hashlib.sha1(app.encode("utf-8")).hexdigest()
+        repositories[app] = (sha, make_zipball(source, os.path.join(root, f"{app}.zip"), f"bench-{app}-{sha[:7]}"))
+    return repositories, total
+
+
+def timed_deploy(orchestrator, apps, max_parallel_apps):
+    start = time.perf_counter()
+    results = orchestrator.execute_for_apps(STEPS, apps, max_parallel_apps=max_parallel_apps)
+    wall = time.perf_counter() - start
+    failed = {app: result for app, result in results.items() if result["status"] != "success"}
+    if failed:
+        raise RuntimeError(f"deployment failed: {failed}")
+    return wall, [result["duration"] for result in results.values()], orchestrator.metrics.report()
+
+
+def run_benchmark(app_count, files, file_kb, runs, max_parallel_apps):
+    apps = [f"app{index}" for index in range(app_count)]
+    logger = DeploymentLogger(console=False)
+    samples = {"cold": [], "warm": []}
+
+    with tempfile.TemporaryDirectory() as root:
+        repositories, source_bytes = create_repositories(root, apps, files, file_kb * 1024)
+        with http_standin(GitHubAPIHandler, repositories=repositories) as github_url, \
+                artifactory_standin(os.path.join(root, "artifactory")) as artifactory_url, \
+                ssh_standin(root) as ssh:
+            for run in range(runs):
+                workdir = os.path.join(root, f"run{run}")
+                os.makedirs(os.path.join(workdir, "remote"))
+                orchestrator = DeploymentOrchestrator(logger, run_state_dir=os.path.join(workdir, "run-state"))
+                orchestrator.step_parameters = pipeline_parameters(workdir, github_url, artifactory_url, ssh)
+
+                samples["cold"].append(timed_deploy(orchestrator, apps, max_parallel_apps))
+                for app in apps:
+                    if not os.path.exists(os.path.join(workdir, "remote", f"{app}.tar.gz")):
+                        raise RuntimeError(f"{app} was not deployed")
+                samples["warm"].append(timed_deploy(orchestrator.for_job(), apps, max_parallel_apps))
+
+    metrics = {}
+    for scenario, runs_of_scenario in samples.items():
+        walls = [wall for wall, _, _ in runs_of_scenario]
+        latencies = sorted(latency for _, app_latencies, _ in runs_of_scenario for latency in app_latencies)
+        wall = statistics.median(walls)
+        metrics[f"{scenario}.wall_seconds"] = metric(round(wall, 4), "s")
+        metrics[f"{scenario}.app_latency_p50"] = metric(round(statistics.median(latencies), 4), "s")
+        metrics[f"{scenario}.app_latency_max"] = metric(round(latencies[-1], 4), "s")
+        metrics[f"{scenario}.apps_per_second"] = metric(round(app_count / wall, 3), "apps/s", "higher")
+        metrics[f"{scenario}.source_mb_per_second"] = metric(
+            round(source_bytes / (1024 * 1024) / wall, 3), "MB/s", "higher")
+        for step in STEPS:
+            step_walls = [sum(app_report["steps"].get(step, {}).get("wall_seconds", 0.0)
+                              for app_report in report["apps"].values()) for _, _, report in runs_of_scenario]
+            step_bytes = [sum(app_report["steps"].get(step, {}).get("bytes_sent", 0)
+                              + app_report["steps"].get(step, {}).get("bytes_received", 0)
+                              for app_report in report["apps"].values()) for _, _, report in runs_of_scenario]
+            metrics[f"{scenario}.{step}.wall_seconds"] = metric(round(statistics.median(step_walls), 4), "s")
+            metrics[f"{scenario}.{step}.network_bytes"] = metric(statistics.median(step_bytes), "bytes")
+    metrics["peak_rss_mb"] = metric(round(peak_rss_bytes() / (1024 * 1024), 1), "MB")
+    return metrics, source_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=4)
+    parser.add_argument("--files", type=int, default=200, help="Source files per app")
+    parser.add_argument("--file-kb", type=int, default=16, help="Approximate size of each source file")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-parallel-apps", type=int, default=4)
+    parser.add_argument("--save", nargs="?", const="", metavar="PATH",
+                        help="Save the results (default: benchmarks/results/pipeline-<commit>.json)")
+    parser.add_argument("--compare", metavar="PATH", help="Result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative worsening that counts as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    metrics, source_bytes = run_benchmark(args.apps, args.files, args.file_kb, args.runs, args.max_parallel_apps)
+    parameters = {"apps": args.apps, "files": args.files, "file_kb": args.file_kb, "runs": args.runs,
+                  "max_parallel_apps": args.max_parallel_apps, "source_bytes": source_bytes}
+
+    print(f"{args.apps} apps x {args.files} files ({source_bytes / (1024 * 1024):.1f} MB of sources), "
+          f"median of {args.runs} runs:")
+    for name, entry in metrics.items():
+        print(f"   {name:<36} {entry['value']:>12.4g} {entry['unit']}")
+
+    if args.save is not None:
+        print(f"Saved to {save_results('pipeline', metrics, parameters, args.save or None)}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        current = {"metrics": metrics}
+        if baseline.get("parameters", {}) != parameters:
+            print(f"⚠️ Baseline was measured with different parameters: {baseline.get('parameters')}")
+        rows = compare(baseline, current, args.threshold)
+        for line in format_comparison(baseline, current, rows):
+            print(line)
+        return 1 if any(regressed for *_, regressed in rows) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Compares peak memory of the in-memory and streaming repository download paths.
+
+A synthetic ZIP archive of `--size-mb` megabytes is served from a local HTTP
+server. Each download mode runs in its own child process so that the reported
+peak RSS belongs to that mode alone.
+
+Usage:
+    python benchmarks/bench_repository_download.py --size-mb 300
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+
+def build_archive(path, size_mb, file_mb=8):
+    """Writes a ZIP of incompressible files totalling roughly `size_mb` megabytes."""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for index in range(max(1, size_mb // file_mb)):
+            archive.writestr(f"repo-main/data/blob_{index:04d}.bin", os.urandom(file_mb * 1024 * 1024))
+
+
+def run_child(mode, base_url):
+    """Downloads once in the current process and prints timing and peak RSS as JSON."""
+    from unittest.mock import MagicMock
+    from github_manager import GitHubRepositoryManager
+
+    manager = GitHubRepositoryManager("owner", "repo", MagicMock())
+    manager.api_base = base_url
+
+    with tempfile.TemporaryDirectory() as target:
+        start = time.perf_counter()
+        manager.download_repository(target, streaming=(mode == "streaming"))
+        elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }))
+
+
+def run_benchmark(size_mb):
+    """Serves a generated archive locally and measures both download modes."""
+    from standins import RangeFileHandler, http_standin
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        archive_path = os.path.join(workdir, "repo.zip")
+        build_archive(archive_path, size_mb)
+        archive_mb = os.path.getsize(archive_path) / (1024 * 1024)
+
+        with http_standin(RangeFileHandler, file_path=archive_path, drop_after=None) as base_url:
+            for mode in ("in-memory", "streaming"):
+                output = subprocess.run(
+                    [sys.executable, __file__, "--child", mode, "--url", base_url],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                result["archive_mb"] = round(archive_mb, 1)
+                results.append(result)
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=300, help="Size of the synthetic archive")
+    parser.add_argument("--child", choices=["in-memory", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.url)
+        return
+
+    for result in run_benchmark(args.size_mb):
+        print(f"{result['mode']:<10} archive={result['archive_mb']:.1f} MB "
+              f"time={result['seconds']:.2f}s peak_rss={result['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compares a sequential drift check of many repositories with BatchSyncChecker.
+
+Every repository is looked up on a local stand-in that answers both the GitHub
+and the Azure DevOps commit APIs after `--latency-ms`. The sequential check
+calls `fetch_latest_commit` and `compare_with_azure` one repository after the
+other, as the pipeline did; the batch check runs all lookups concurrently with
+at most `--concurrency` requests in flight. A tenth of the repositories are
+made outdated.
+
+Usage:
+    python benchmarks/bench_repository_sync.py --repositories 100 --latency-ms 50 --concurrency 32
+"""
+import argparse
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from azure_manager import AzureDevOpsManager
+from github_manager import GitHubRepositoryManager
+from http_session import PooledSession
+from repository_sync import BatchSyncChecker
+from standins import RepositoryAPIHandler, http_standin
+
+
+def make_repositories(github_url, azure_url, count, session):
+    repositories = []
+    for i in range(count):
+        github = GitHubRepositoryManager("vzlatsin", f"app{i}", MagicMock(), session=session)
+        github.api_url = f"{github_url}/repos/vzlatsin/app{i}/commits"
+        azure = AzureDevOpsManager(f"{azure_url}/app{i}", "org", "project", f"app{i}", "token", MagicMock(),
+                                   session=session)
+        azure.api_base = azure_url
+        repositories.append((f"app{i}", github, azure))
+    return repositories
+
+
+def run_benchmark(count, latency, concurrency):
+    # Azure lookups of every tenth repository see an older commit
+    commits = {f"app{i}": "fedcba9876543210fedcba9876543210fedcba98" for i in range(0, count, 10)}
+    session = PooledSession(pool_maxsize=concurrency)
+    with http_standin(RepositoryAPIHandler, latency=latency, commits={}) as github_url, \
+            http_standin(RepositoryAPIHandler, latency=latency, commits=commits) as azure_url:
+        repositories = make_repositories(github_url, azure_url, count, session)
+
+        start = time.perf_counter()
+        sequential_in_sync = sum(azure.compare_with_azure(github.fetch_latest_commit())
+                                 for _, github, azure in repositories)
+        sequential_seconds = time.perf_counter() - start
+
+        report = BatchSyncChecker(MagicMock(), max_concurrency=concurrency).run(repositories)
+    session.close()
+    return {
+        "sequential": (sequential_seconds, sequential_in_sync),
+        "batch": (report["duration"], report["in_sync"]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repositories", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.repositories, args.latency_ms / 1000, args.concurrency)
+    for name, (seconds, in_sync) in results.items():
+        print(f"{name:<10} {seconds:7.2f}s  {in_sync}/{args.repositories} in sync")
+    print(f"speedup    {results['sequential'][0] / results['batch'][0]:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares SFTP upload throughput of a plain `sftp.put` with SFTPTransferEngine.
+
+Uploads a `--size-mb` package to a local paramiko SSH/SFTP stand-in over one
+pooled connection and reports MB/s for each configuration.
+
+Usage:
+    python benchmarks/bench_sftp_transfer.py --size-mb 64
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from remote_deployer import RemoteDeployer
+from sftp_transfer import SFTPTransferEngine
+from ssh_pool import SSHConnectionPool
+from standins import ssh_standin
+
+
+def run_benchmark(size_mb):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        local_path = os.path.join(workdir, "app.tar.gz")
+        with open(local_path, "wb") as f:
+            f.write(os.urandom(size_mb * 1024 * 1024))
+        remote_path = os.path.join(workdir, "remote.tar.gz")
+
+        with ssh_standin(workdir) as standin:
+            pool = SSHConnectionPool()
+            deployer = RemoteDeployer(standin.host, standin.user, standin.key_path, MagicMock(), pool=pool, port=standin.port)
+
+            with deployer.connection() as connection:
+                with connection.sftp() as sftp:
+                    start = time.perf_counter()
+                    sftp.put(local_path, remote_path)
+                    results["sftp.put"] = size_mb / (time.perf_counter() - start)
+
+            for concurrency in (1, 2, 4, 8):
+                engine = SFTPTransferEngine(deployer, MagicMock(), window_size=4 * 1024 * 1024, concurrency=concurrency)
+                results[f"engine x{concurrency}"] = engine.upload(local_path, remote_path)["mb_per_second"]
+
+            pool.close_all()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=64)
+    args = parser.parse_args()
+
+    for name, mb_per_second in run_benchmark(args.size_mb).items():
+        print(f"{name:<12} {mb_per_second:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
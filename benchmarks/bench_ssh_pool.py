@@ -0,0 +1,83 @@
+"""
+Measures SSH handshakes and latency per deploy with and without connection pooling.
+
+Each deploy checks the remote directory, uploads a package over SFTP and
+verifies its checksum against a local paramiko SSH/SFTP stand-in. The
+"fresh" mode opens a new connection for every operation, as the deployer did
+before pooling; the "pooled" mode shares one SSHConnectionPool.
+
+Usage:
+    python benchmarks/bench_ssh_pool.py --deploys 20 --package-kb 512
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, "..", "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from remote_deployer import RemoteDeployer
+from ssh_pool import SSHConnectionPool
+from standins import ssh_standin
+
+
+class FreshConnectionPool(SSHConnectionPool):
+    """Pool that never reuses a connection, reproducing one handshake per operation."""
+
+    def connection(self, host, user, key_path, port=22):
+        self.close_all()
+        return super().connection(host, user, key_path, port=port)
+
+
+def run_deploys(standin, pool, package_path, remote_dir, deploys):
+    latencies = []
+    handshakes_before = standin.handshakes
+    deployer = RemoteDeployer(standin.host, standin.user, standin.key_path, MagicMock(), pool=pool, port=standin.port)
+
+    for index in range(deploys):
+        start = time.perf_counter()
+        ok = deployer.deploy_to_server(package_path, os.path.join(remote_dir, f"app{index}.tar.gz"))
+        latencies.append(time.perf_counter() - start)
+        if not ok:
+            raise RuntimeError("deploy against the stand-in failed")
+
+    pool.close_all()
+    return {
+        "handshakes": standin.handshakes - handshakes_before,
+        "mean_ms": 1000 * sum(latencies) / len(latencies),
+        "max_ms": 1000 * max(latencies),
+    }
+
+
+def run_benchmark(deploys, package_kb):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        package_path = os.path.join(workdir, "app.tar.gz")
+        with open(package_path, "wb") as f:
+            f.write(os.urandom(package_kb * 1024))
+        remote_dir = os.path.join(workdir, "remote")
+        os.makedirs(remote_dir)
+
+        with ssh_standin(workdir) as standin:
+            results["fresh"] = run_deploys(standin, FreshConnectionPool(), package_path, remote_dir, deploys)
+            results["pooled"] = run_deploys(standin, SSHConnectionPool(), package_path, remote_dir, deploys)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deploys", type=int, default=20)
+    parser.add_argument("--package-kb", type=int, default=512)
+    args = parser.parse_args()
+
+    for mode, result in run_benchmark(args.deploys, args.package_kb).items():
+        print(f"{mode:<7} deploys={args.deploys} handshakes={result['handshakes']} "
+              f"mean={result['mean_ms']:.1f} ms/deploy max={result['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures how long `deploy.py` takes to start and which imports dominate.
+
+Each run spawns a fresh interpreter for `deploy.py --steps <steps> --app demo`.
+Wall times are reported per step list, followed by the slowest imports
+(cumulative, from `python -X importtime`) of the first step list. Step modules
+are loaded with importlib and so are not listed themselves, but the imports
+they trigger are. The default `cleanup` step is a no-op, so its time is almost
+entirely startup; steps that reach the network may fail here, which still
+measures their startup cost.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 10 --steps cleanup
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+DEPLOY = os.path.join(BENCH_DIR, "..", "src", "deploy.py")
+
+
+def deploy_command(steps, importtime=False):
+    options = ["-X", "importtime"] if importtime else []
+    return [sys.executable, *options, DEPLOY, "--steps", *steps, "--app", "demo"]
+
+
+def parse_importtime(stderr):
+    """Returns {module: cumulative microseconds} from `-X importtime` output."""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|", 2)
+        if cumulative.strip().isdigit():
+            imports[module.strip()] = int(cumulative)
+    return imports
+
+
+def imported_modules(steps):
+    """Returns the cumulative import times of one `deploy.py` run."""
+    result = subprocess.run(deploy_command(steps, importtime=True), stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    return parse_importtime(result.stderr)
+
+
+def measure(steps, runs):
+    """Returns per-run wall times in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(deploy_command(steps), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--steps", nargs="+", action="append",
+                        help="Step list to time (repeatable; default: cleanup)")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    args = parser.parse_args()
+    step_lists = args.steps or [["cleanup"]]
+
+    for steps in step_lists:
+        timings = sorted(measure(steps, args.runs))
+        print(f"{' '.join(steps):<24} mean {statistics.mean(timings):7.1f} ms  p50 {timings[len(timings) // 2]:7.1f} ms")
+
+    imports = imported_modules(step_lists[0])
+    print(f"\nSlowest imports for `{' '.join(step_lists[0])}` ({len(imports)} modules):")
+    for module, cumulative in sorted(imports.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"   {cumulative / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
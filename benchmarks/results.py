@@ -0,0 +1,87 @@
+"""
+Saves benchmark results and compares them between commits.
+
+A result file holds the environment it was measured in (commit, Python,
+platform, CPU count) and a flat set of metrics, each with its unit and
+whether lower or higher is better:
+
+    {"cold.wall_seconds": {"value": 2.31, "unit": "s", "better": "lower"}, ...}
+
+Files go to `benchmarks/results/<benchmark>-<commit>.json` by default.
+"""
+import json
+import os
+import platform
+import subprocess
+import time
+
+BENCH_DIR = os.path.abspath(os.path.dirname(__file__))
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+def metric(value, unit, better="lower"):
+    return {"value": value, "unit": unit, "better": better}
+
+
+def current_commit():
+    """Returns the short commit hash of the checkout (with `-dirty` for local changes), or "unknown"."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BENCH_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def environment():
+    return {
+        "commit": current_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def save_results(benchmark, metrics, parameters=None, path=None):
+    """Writes a result file and returns its path."""
+    result = {"benchmark": benchmark, "environment": environment(), "parameters": parameters or {}, "metrics": metrics}
+    if not path:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{benchmark}-{result['environment']['commit']}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compares the metrics two result files have in common. Returns rows of
+    (name, baseline value, current value, relative change, regressed), where a
+    metric regressed if it got worse by more than `threshold`.
+    """
+    rows = []
+    for name, entry in current["metrics"].items():
+        before = baseline["metrics"].get(name)
+        if before is None or not before["value"] or entry["value"] is None:
+            continue
+        change = (entry["value"] - before["value"]) / before["value"]
+        worse = change if entry["better"] == "lower" else -change
+        rows.append((name, before["value"], entry["value"], change, worse > threshold))
+    return rows
+
+
+def format_comparison(baseline, current, rows):
+    lines = [f"Compared with {baseline['environment']['commit']} ({baseline['environment']['timestamp']}):"]
+    for name, before, after, change, regressed in rows:
+        unit = current["metrics"][name]["unit"]
+        flag = "  <-- regression" if regressed else ""
+        lines.append(f"   {name:<36} {before:>12.4g} -> {after:>12.4g} {unit:<6} {change:+7.1%}{flag}")
+    return lines
@@ -0,0 +1,625 @@
+"""
+Local stand-ins for the external services used by the deployment pipeline.
+
+Everything here binds to 127.0.0.1 on an ephemeral port so benchmarks can run
+offline on a plain Linux box.
+"""
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import random
+import shutil
+import ssl
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    """Base request handler that does not print a line per request."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY keep-alive requests stall on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status, body, content_type="application/octet-stream", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+
+class RangeFileHandler(QuietHandler):
+    """
+    Serves `server.file_path` for any GET path with HTTP Range support,
+    honouring `If-Range` against the file's ETag.
+
+    If `server.drop_after` is set, the first response closes the connection
+    after that many body bytes to simulate an interrupted transfer.
+    """
+
+    def do_GET(self):
+        stat = os.stat(self.server.file_path)
+        size = stat.st_size
+        etag = f'"{size:x}-{stat.st_mtime_ns:x}"'
+        start = 0
+        status = 200
+
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and range_header.startswith("bytes=") and if_range in (None, etag):
+            start = int(range_header[len("bytes="):].split("-", 1)[0])
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(size - start))
+        self.send_header("ETag", etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.end_headers()
+
+        drop_after = self.server.drop_after
+        self.server.drop_after = None
+        sent = 0
+        with open(self.server.file_path, "rb") as f:
+            f.seek(start)
+            while True:
+                chunk = f.read(256 * 1024)
+                if not chunk:
+                    break
+                if drop_after is not None and sent + len(chunk) > drop_after:
+                    self.wfile.write(chunk[:drop_after - sent])
+                    self.close_connection = True
+                    return
+                self.wfile.write(chunk)
+                sent += len(chunk)
+
+
+class ArtifactoryHandler(QuietHandler):
+    """
+    Minimal Artifactory-like repository storing artifacts under `server.storage_dir`.
+
+    Supports single PUT deploys verified against `X-Checksum-Sha256`, and the
+    multipart protocol used by JFrogUploader: `POST <path>?uploads`,
+    `PUT <path>?partNumber=N&uploadId=ID` and `POST <path>?uploadId=ID`.
+    A PUT with `X-Checksum-Deploy: true` links content already stored with
+    the same SHA-256, or returns 404. Every `server.fail_every`-th part upload
+    is answered with 503 when set.
+    """
+
+    def _read_body(self):
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining > 0:
+            chunk = self.rfile.read(min(256 * 1024, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+    def _store(self, path, chunks, expected_sha256):
+        digest = hashlib.sha256()
+        temp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+        if expected_sha256 and digest.hexdigest() != expected_sha256:
+            os.remove(temp_path)
+            return False
+        os.replace(temp_path, path)
+        with self.server.lock:
+            self.server.checksums[digest.hexdigest()] = path
+        return True
+
+    def _artifact(self):
+        path, _, query = self.path.partition("?")
+        params = dict(item.partition("=")[::2] for item in query.split("&") if item)
+        return os.path.join(self.server.storage_dir, path.lstrip("/")), params
+
+    def do_PUT(self):
+        artifact_path, params = self._artifact()
+        if "uploadId" in params:
+            with self.server.lock:
+                self.server.part_requests += 1
+                fail = self.server.fail_every and self.server.part_requests % self.server.fail_every == 0
+            if fail:
+                for _ in self._read_body():
+                    pass
+                self.send_body(503, b"Service Unavailable")
+                return
+            part_path = os.path.join(self.server.storage_dir, ".uploads", params["uploadId"], params["partNumber"])
+            self._store(part_path, self._read_body(), None)
+            self.send_body(200, b"", headers={"ETag": f"part-{params['partNumber']}"})
+            return
+
+        if self.headers.get("X-Checksum-Deploy") == "true":
+            with self.server.lock:
+                source_path = self.server.checksums.get(self.headers.get("X-Checksum-Sha256"))
+            if source_path is None:
+                self.send_body(404, b"Checksum not found")
+                return
+            if os.path.abspath(source_path) != os.path.abspath(artifact_path):
+                os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+                shutil.copyfile(source_path, artifact_path)
+            self.send_body(201, b"{}", "application/json")
+            return
+
+        if not self._store(artifact_path, self._read_body(), self.headers.get("X-Checksum-Sha256")):
+            self.send_body(409, b"Checksum mismatch")
+            return
+        self.send_body(201, b"{}", "application/json")
+
+    def do_POST(self):
+        artifact_path, params = self._artifact()
+        if "uploads" in params:
+            for _ in self._read_body():
+                pass
+            with self.server.lock:
+                self.server.upload_count += 1
+                upload_id = f"upload-{self.server.upload_count}"
+            self.send_body(200, json.dumps({"uploadId": upload_id}).encode(), "application/json")
+            return
+
+        parts = json.loads(b"".join(self._read_body()))["parts"]
+        upload_dir = os.path.join(self.server.storage_dir, ".uploads", params["uploadId"])
+
+        def chunks():
+            for part in parts:
+                with open(os.path.join(upload_dir, str(part["partNumber"])), "rb") as f:
+                    yield from iter(lambda: f.read(1024 * 1024), b"")
+
+        stored = self._store(artifact_path, chunks(), self.headers.get("X-Checksum-Sha256"))
+        shutil.rmtree(upload_dir, ignore_errors=True)
+        if not stored:
+            self.send_body(409, b"Checksum mismatch")
+            return
+        self.send_body(201, b"{}", "application/json")
+
+
+@contextlib.contextmanager
+def artifactory_standin(storage_dir, fail_every=None):
+    """Runs an ArtifactoryHandler server storing artifacts in `storage_dir`. Yields the repository URL."""
+    with http_standin(ArtifactoryHandler, storage_dir=storage_dir, fail_every=fail_every,
+                      lock=threading.Lock(), part_requests=0, upload_count=0, checksums={}) as base_url:
+        yield f"{base_url}/artifactory/deployments"
+
+
+@contextlib.contextmanager
+def http_standin(handler_class, ssl_context=None, **server_attributes):
+    """
+    Runs a threaded HTTP server on 127.0.0.1 for the duration of the block,
+    serving HTTPS when an `ssl_context` is given.
+
+    Extra keyword arguments become attributes of the server object, where the
+    handler can read them as `self.server.<name>`. Yields the base URL.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.daemon_threads = True
+    if ssl_context is not None:
+        server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+    for name, value in server_attributes.items():
+        setattr(server, name, value)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        scheme = "https" if ssl_context is not None else "http"
+        yield f"{scheme}://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def self_signed_certificate(workdir):
+    """Writes a self-signed certificate for 127.0.0.1 and its key to `workdir`; returns (cert_path, key_path)."""
+    import datetime
+    import ipaddress
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "127.0.0.1")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(x509.SubjectAlternativeName([x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]), critical=False)
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(workdir, "standin-cert.pem")
+    key_path = os.path.join(workdir, "standin-key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+@contextlib.contextmanager
+def https_standin(handler_class, workdir, **server_attributes):
+    """
+    Like `http_standin`, over TLS with a fresh self-signed certificate.
+    Yields (base URL, certificate path) so clients can verify against it.
+    """
+    cert_path, key_path = self_signed_certificate(workdir)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    with http_standin(handler_class, ssl_context=context, **server_attributes) as base_url:
+        yield base_url, cert_path
+
+
+class CommitsAPIHandler(QuietHandler):
+    """Answers any GET with a small GitHub-style commit list, like `/repos/<owner>/<repo>/commits`."""
+
+    def do_GET(self):
+        self.send_body(200, b'[{"sha": "0123456789abcdef0123456789abcdef01234567"}]', "application/json")
+
+
+class SSHStandin:
+    """Connection details and counters for a running local SSH/SFTP stand-in."""
+
+    def __init__(self, host, port, key_path):
+        self.host = host
+        self.port = port
+        self.key_path = key_path
+        self.user = "deploy"
+        self.handshakes = 0
+        self.exec_requests = 0
+        self.sftp_sessions = 0
+
+
+def _local_sftp_classes():
+    """Builds SFTP server classes that map remote paths straight onto the local filesystem."""
+    import paramiko
+
+    class LocalSFTPHandle(paramiko.SFTPHandle):
+        def stat(self):
+            return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+        def chattr(self, attr):
+            return paramiko.SFTP_OK
+
+    class LocalSFTPServer(paramiko.SFTPServerInterface):
+        def __init__(self, server, *args, **kwargs):
+            super().__init__(server, *args, **kwargs)
+            server.standin.sftp_sessions += 1
+
+        def canonicalize(self, path):
+            return os.path.normpath(path if os.path.isabs(path) else os.path.join("/", path))
+
+        def list_folder(self, path):
+            try:
+                return [paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(path, name)), name)
+                        for name in os.listdir(path)]
+            except OSError as e:
+                return paramiko.SFTPServer.convert_errno(e.errno)
+
+        def stat(self, path):
+            try:
+                return paramiko.SFTPAttributes.from_stat(os.stat(path))
+            except OSError as e:
+                return paramiko.SFTPServer.convert_errno(e.errno)
+
+        lstat = stat
+
+        def open(self, path, flags, attr):
+            try:
+                fd = os.open(path, flags, 0o644)
+            except OSError as e:
+                return paramiko.SFTPServer.convert_errno(e.errno)
+            if flags & os.O_WRONLY:
+                mode = "ab" if flags & os.O_APPEND else "wb"
+            elif flags & os.O_RDWR:
+                mode = "a+b" if flags & os.O_APPEND else "r+b"
+            else:
+                mode = "rb"
+            handle = LocalSFTPHandle(flags)
+            handle.filename = path
+            handle.readfile = handle.writefile = os.fdopen(fd, mode)
+            return handle
+
+        def remove(self, path):
+            try:
+                os.remove(path)
+            except OSError as e:
+                return paramiko.SFTPServer.convert_errno(e.errno)
+            return paramiko.SFTP_OK
+
+        def rename(self, oldpath, newpath):
+            try:
+                os.replace(oldpath, newpath)
+            except OSError as e:
+                return paramiko.SFTPServer.convert_errno(e.errno)
+            return paramiko.SFTP_OK
+
+        posix_rename = rename
+
+        def mkdir(self, path, attr):
+            try:
+                os.mkdir(path)
+            except OSError as e:
+                return paramiko.SFTPServer.convert_errno(e.errno)
+            return paramiko.SFTP_OK
+
+        def chattr(self, path, attr):
+            return paramiko.SFTP_OK
+
+    return LocalSFTPServer
+
+
+@contextlib.contextmanager
+def ssh_standin(workdir):
+    """
+    Runs a paramiko-based SSH server on 127.0.0.1 for the duration of the block.
+
+    It accepts public key authentication with a generated client key (written to
+    `workdir`), runs exec requests as local shell commands and serves SFTP on
+    the local filesystem. Yields an SSHStandin with handshake counters.
+    """
+    import socket
+    import subprocess
+    import paramiko
+
+    # The server side logs every client disconnect as a socket error
+    logging.getLogger("paramiko.transport").setLevel(logging.CRITICAL)
+
+    host_key = paramiko.RSAKey.generate(2048)
+    client_key = paramiko.RSAKey.generate(2048)
+    key_path = os.path.join(workdir, "standin_id_rsa")
+    client_key.write_private_key_file(key_path)
+
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(64)
+    standin = SSHStandin("127.0.0.1", listener.getsockname()[1], key_path)
+    sftp_server_class = _local_sftp_classes()
+
+    class StandinServer(paramiko.ServerInterface):
+        def get_allowed_auths(self, username):
+            return "publickey"
+
+        def check_auth_publickey(self, username, key):
+            if key.get_base64() == client_key.get_base64():
+                return paramiko.AUTH_SUCCESSFUL
+            return paramiko.AUTH_FAILED
+
+        def check_channel_request(self, kind, chanid):
+            if kind == "session":
+                return paramiko.OPEN_SUCCEEDED
+            return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+        def check_channel_exec_request(self, channel, command):
+            standin.exec_requests += 1
+
+            def run():
+                process = subprocess.Popen(command.decode(), shell=True, stdin=subprocess.PIPE,
+                                           stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                errors = []
+
+                def pump_stdin():
+                    try:
+                        for data in iter(lambda: channel.recv(65536), b""):
+                            process.stdin.write(data)
+                        process.stdin.close()
+                    except (OSError, ValueError):
+                        pass
+
+                def read_stderr():
+                    errors.append(process.stderr.read())
+
+                threading.Thread(target=pump_stdin, daemon=True).start()
+                stderr_thread = threading.Thread(target=read_stderr, daemon=True)
+                stderr_thread.start()
+
+                for data in iter(lambda: process.stdout.read1(65536), b""):
+                    channel.sendall(data)
+                process.wait()
+                stderr_thread.join()
+                channel.sendall_stderr(errors[0])
+                channel.send_exit_status(process.returncode)
+                channel.close()
+
+            threading.Thread(target=run, daemon=True).start()
+            return True
+
+    def serve(sock):
+        transport = paramiko.Transport(sock)
+        transport.add_server_key(host_key)
+        transport.set_subsystem_handler("sftp", paramiko.SFTPServer, sftp_server_class)
+        server = StandinServer()
+        server.standin = standin
+        try:
+            transport.start_server(server=server)
+        except (paramiko.SSHException, EOFError, OSError):
+            return
+        standin.handshakes += 1
+
+    def accept_loop():
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(sock,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+    try:
+        yield standin
+    finally:
+        listener.close()
+
+
+class RepositoryAPIHandler(QuietHandler):
+    """
+    Answers GitHub (`/repos/<owner>/<repo>/commits`) and Azure DevOps
+    (`/<org>/<project>/_apis/git/repositories/<repo>/commits`) commit lookups
+    after `server.latency` seconds, like a remote API. Every repository's
+    latest commit is `server.commits[<repo>]`, or a fixed SHA.
+    """
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        parts = self.path.split("?")[0].strip("/").split("/")
+        commit = self.server.commits.get(parts[-2], "0123456789abcdef0123456789abcdef01234567")
+        if "_apis" in parts:
+            body = {"value": [{"commitId": commit}]}
+        else:
+            body = [{"sha": commit}]
+        self.send_body(200, json.dumps(body).encode("utf-8"), "application/json")
+
+
+def _github_commit(index):
+    """A GitHub REST commit object with the fields (and roughly the size) the real API returns."""
+    sha = hashlib.sha1(f"commit-{index}".encode("utf-8")).hexdigest()
+    user = {"login": "vzlatsin", "id": 1000, "node_id": "MDQ6VXNlcjEwMDA=", "type": "User", "site_admin": False,
+            "avatar_url": "https://avatars.githubusercontent.com/u/1000?v=4",
+            **{f"{name}_url": f"https://api.github.com/users/vzlatsin/{name}"
+               for name in ("html", "followers", "following", "gists", "starred", "subscriptions",
+                            "organizations", "repos", "events", "received_events")}}
+    signature = {"name": "Vadim", "email": "vzlatsin@example.com", "date": "2025-01-01T12:00:00Z"}
+    return {
+        "sha": sha,
+        "node_id": f"C_{sha[:20]}",
+        "commit": {"author": signature, "committer": signature, "message": f"Change number {index}\n\n" + "Details. " * 20,
+                   "tree": {"sha": sha[::-1], "url": f"https://api.github.com/repos/vzlatsin/app/git/trees/{sha[::-1]}"},
+                   "url": f"https://api.github.com/repos/vzlatsin/app/git/commits/{sha}", "comment_count": 0,
+                   "verification": {"verified": False, "reason": "unsigned", "signature": None, "payload": None}},
+        "url": f"https://api.github.com/repos/vzlatsin/app/commits/{sha}",
+        "html_url": f"https://github.com/vzlatsin/app/commit/{sha}",
+        "comments_url": f"https://api.github.com/repos/vzlatsin/app/commits/{sha}/comments",
+        "author": user,
+        "committer": user,
+        "parents": [{"sha": sha[1:] + "0", "url": f"https://api.github.com/repos/vzlatsin/app/commits/{sha[1:]}0"}],
+    }
+
+
+def _azure_commit(index):
+    """An Azure DevOps commit list entry as returned by `_apis/git/repositories/<repo>/commits`."""
+    sha = hashlib.sha1(f"commit-{index}".encode("utf-8")).hexdigest()
+    signature = {"name": "Vadim", "email": "vzlatsin@example.com", "date": "2025-01-01T12:00:00Z"}
+    return {
+        "commitId": sha, "author": signature, "committer": signature,
+        "comment": f"Change number {index}", "changeCounts": {"Add": 1, "Edit": 3, "Delete": 0},
+        "url": f"https://dev.azure.com/org/project/_apis/git/repositories/app/commits/{sha}",
+        "remoteUrl": f"https://dev.azure.com/org/project/_git/app/commit/{sha}",
+    }
+
+
+class CommitHistoryHandler(QuietHandler):
+    """
+    Serves realistic commit histories after `server.latency` seconds: GitHub
+    commit lists (`per_page`, default 30) and branch refs, and Azure DevOps
+    commit lists (`searchCriteria.$top`, default 100) and refs.
+    """
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        path, _, query = self.path.partition("?")
+        params = dict(item.split("=", 1) for item in query.split("&") if "=" in item)
+        head = _github_commit(0)["sha"]
+
+        if "/_apis/git/" in path and path.endswith("/refs"):
+            body = {"value": [{"name": "refs/heads/main", "objectId": head,
+                               "creator": {"displayName": "Vadim", "uniqueName": "vzlatsin@example.com"},
+                               "url": "https://dev.azure.com/org/project/_apis/git/repositories/app/refs?filter=heads%2Fmain"}],
+                    "count": 1}
+        elif "/_apis/git/" in path:
+            top = int(params.get("searchCriteria.$top", 100))
+            body = {"count": top, "value": [_azure_commit(i) for i in range(top)]}
+        elif "/git/ref/heads/" in path:
+            branch = path.split("/git/ref/heads/", 1)[1]
+            body = {"ref": f"refs/heads/{branch}", "node_id": "REF_kwDOAbc",
+                    "url": f"https://api.github.com/repos/vzlatsin/app/git/refs/heads/{branch}",
+                    "object": {"sha": head, "type": "commit",
+                               "url": f"https://api.github.com/repos/vzlatsin/app/git/commits/{head}"}}
+        else:
+            body = [_github_commit(i) for i in range(int(params.get("per_page", 30)))]
+        self.send_body(200, json.dumps(body).encode("utf-8"), "application/json")
+
+
+def generate_source_tree(root, files=200, file_size=16 * 1024, seed=0):
+    """
+    Writes a source tree of `files` text files of about `file_size` bytes each,
+    spread over nested package directories, and returns the total size. Files
+    are built from a fixed vocabulary so they compress like real source code.
+    """
+    rng = random.Random(seed)
+    words = ["def", "return", "self", "import", "class", "value", "config", "deploy", "logger", "for", "in",
+             "if", "else", "None", "True", "path", "request", "response", "step", "app", "=", "(", ")", ":"]
+    total = 0
+    for index in range(files):
+        directory = os.path.join(root, f"pkg{index % 10}", f"module{index % 7}")
+        os.makedirs(directory, exist_ok=True)
+        lines = []
+        size = 0
+        while size < file_size:
+            line = "    " * rng.randint(0, 3) + " ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+            lines.append(line)
+            size += len(line) + 1
+        with open(os.path.join(directory, f"file{index}.py"), "w") as f:
+            f.write("\n".join(lines) + "\n")
+        total += size
+    return total
+
+
+def make_zipball(source_root, zip_path, prefix):
+    """Zips `source_root` like a GitHub zipball: every entry under a single `prefix/` folder."""
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for directory, _, names in os.walk(source_root):
+            for name in sorted(names):
+                path = os.path.join(directory, name)
+                archive.write(path, os.path.join(prefix, os.path.relpath(path, source_root)))
+    return zip_path
+
+
+class GitHubAPIHandler(QuietHandler):
+    """
+    Serves the GitHub endpoints used by the fetch step from `server.repositories`
+    (repository name -> (commit SHA, zipball path)): branch refs
+    (`/repos/<owner>/<repo>/git/ref/heads/<branch>`) and zipballs
+    (`/repos/<owner>/<repo>/zipball[/<branch or SHA>]`).
+    """
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        repository = self.server.repositories.get(parts[2]) if len(parts) > 3 and parts[0] == "repos" else None
+        if repository is None:
+            self.send_body(404, b'{"message": "Not Found"}', "application/json")
+            return
+        commit, archive_path = repository
+
+        if parts[3] == "git" and parts[4:6] == ["ref", "heads"]:
+            body = {"ref": f"refs/heads/{'/'.join(parts[6:])}", "object": {"sha": commit, "type": "commit"}}
+            self.send_body(200, json.dumps(body).encode("utf-8"), "application/json")
+        elif parts[3] == "zipball":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/zip")
+            self.send_header("Content-Length", str(os.path.getsize(archive_path)))
+            self.end_headers()
+            with open(archive_path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile, 256 * 1024)
+        else:
+            self.send_body(404, b'{"message": "Not Found"}', "application/json")
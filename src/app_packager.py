@@ -1,9 +1,536 @@
+import fnmatch
+import hashlib
+import json
+import os
+import stat
+import struct
+import tarfile
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Timestamp stored for every archive member (1980-01-01, the earliest date zip can represent),
+# overridable with the reproducible-builds SOURCE_DATE_EPOCH variable
+DEFAULT_EPOCH = 315532800
+
+# Files and directories never packaged: VCS metadata and the fetch step's commit marker
+DEFAULT_EXCLUDES = (".git", ".commit_sha")
+
+# tar.gz members: consecutive files are compressed together until a member holds this many bytes
+# or a file whose path hash selects it ends the member, so boundaries stay stable as files change
+TAR_MEMBER_BYTES = 1024 * 1024
+TAR_MEMBER_BOUNDARY = 32
+
+# Compressed member data is kept in memory up to this size, then spilled to a temporary file
+SPOOL_BYTES = 16 * 1024 * 1024
+READ_BYTES = 1024 * 1024
+
+ZIP64_LIMIT = 0xFFFFFFFF
+
+
+class PackageFile:
+    """A file, symlink or empty directory to be packaged, identified by its archive path."""
+
+    def __init__(self, path, full_path, kind, mode, size=0, link_target=None, mtime_ns=None):
+        self.path = path
+        self.full_path = full_path
+        self.kind = kind  # "file", "symlink" or "dir"
+        self.mode = mode
+        self.size = size
+        self.link_target = link_target
+        self.mtime_ns = mtime_ns
+
+    @property
+    def archive_name(self):
+        return self.path + "/" if self.kind == "dir" else self.path
+
+
 class AppPackager:
-    def __init__(self, source_dir, output_dir, logger):
+    """
+    Builds reproducible `.zip` or `.tar.gz` packages from a source tree.
+
+    Files are read, hashed and compressed on `workers` threads (zlib and
+    hashlib release the GIL, so this scales across cores) and written in
+    sorted path order with fixed timestamps, owners and permissions, so the
+    same tree always produces a byte-identical package. A manifest with the
+    SHA-256 of every file and the archive layout is written next to the
+    package as `<package>.manifest.json`.
+
+    With `incremental=True` the manifest and package of the previous build are
+    used to copy the already-compressed members of unchanged files instead of
+    compressing them again, so a rebuild costs roughly the size of the change.
+    The result is identical to a clean build.
+    """
+
+    def __init__(self, source_dir, output_dir, logger, package_name="app.zip", workers=None,
+                 compression_level=6, exclude=DEFAULT_EXCLUDES, incremental=True):
         self.source_dir = source_dir
         self.output_dir = output_dir
         self.logger = logger
+        self.package_name = package_name
+        self.workers = workers or os.cpu_count() or 1
+        self.compression_level = compression_level
+        self.exclude = tuple(exclude)
+        self.epoch = int(os.environ.get("SOURCE_DATE_EPOCH", DEFAULT_EPOCH))
+        self.incremental = incremental
+        self.manifest = None
+        self.last_stats = None
+
+    @property
+    def package_path(self):
+        """Path of the package produced by `create_package`."""
+        return os.path.join(self.output_dir, self.package_name)
+
+    @property
+    def manifest_path(self):
+        """Path of the manifest written alongside the package."""
+        return self.package_path + ".manifest.json"
+
+    @property
+    def archive_format(self):
+        """Returns "zip" or "tar.gz" based on the package name."""
+        if self.package_name.endswith(".zip"):
+            return "zip"
+        if self.package_name.endswith((".tar.gz", ".tgz")):
+            return "tar.gz"
+        raise ValueError(f"❌ Unsupported package format: {self.package_name} (expected .zip, .tar.gz or .tgz)")
+
+    def collect_files(self):
+        """Returns the files, symlinks and empty directories under `source_dir`, sorted by archive path."""
+        entries = []
+        for root, dirs, files in os.walk(self.source_dir):
+            dirs[:] = [name for name in dirs if not self._excluded(name)]
+            relative_root = os.path.relpath(root, self.source_dir).replace(os.sep, "/")
+            prefix = "" if relative_root == "." else relative_root + "/"
+
+            for name in files + [name for name in dirs if os.path.islink(os.path.join(root, name))]:
+                if self._excluded(name):
+                    continue
+                full_path = os.path.join(root, name)
+                info = os.lstat(full_path)
+                if stat.S_ISLNK(info.st_mode):
+                    entries.append(PackageFile(prefix + name, full_path, "symlink", 0o777,
+                                               link_target=os.readlink(full_path)))
+                elif stat.S_ISREG(info.st_mode):
+                    # Only the executable bit is kept so permissions do not depend on the local umask
+                    mode = 0o755 if info.st_mode & stat.S_IXUSR else 0o644
+                    entries.append(PackageFile(prefix + name, full_path, "file", mode, size=info.st_size,
+                                               mtime_ns=info.st_mtime_ns))
+
+            if prefix and not files and not dirs:
+                entries.append(PackageFile(prefix.rstrip("/"), root, "dir", 0o755))
+
+        return sorted(entries, key=lambda entry: entry.path)
+
+    def load_previous_build(self):
+        """Returns the previous build of this package if it can be reused, otherwise None."""
+        if not os.path.exists(self.manifest_path) or not os.path.exists(self.package_path):
+            return None
+        try:
+            with open(self.manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        settings = {"format": self.archive_format, "compression_level": self.compression_level, "epoch": self.epoch}
+        if any(manifest.get(key) != value for key, value in settings.items()):
+            self.logger.log_info("🔹 Packaging settings changed since the previous build, rebuilding from scratch.")
+            return None
+        if manifest.get("size") != os.path.getsize(self.package_path):
+            self.logger.log_info(f"🔹 {self.package_path} does not match its manifest, rebuilding from scratch.")
+            return None
+        return PreviousBuild(manifest, self.package_path)
+
+    def _excluded(self, name):
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude)
 
     def create_package(self):
-        """Stub method for packaging."""
-        return f"{self.output_dir}/app.zip"
+        """Builds the package and its manifest. Returns the package path."""
+        archive_format = self.archive_format
+        if not os.path.isdir(self.source_dir):
+            raise FileNotFoundError(f"❌ Source directory not found: {self.source_dir}")
+
+        start = time.perf_counter()
+        entries = self.collect_files()
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.logger.log_info(
+            f"📦 Packaging {len(entries)} entries from {self.source_dir} into {self.package_path} "
+            f"({self.workers} workers)..."
+        )
+
+        previous = self.load_previous_build() if self.incremental else None
+        temp_path = self.package_path + ".part"
+        try:
+            with open(temp_path, "wb") as output:
+                writer_class = ZipWriter if archive_format == "zip" else TarGzWriter
+                writer = writer_class(self, previous)
+                files, members = writer.write(output, entries)
+        finally:
+            if previous is not None:
+                previous.close()
+        os.replace(temp_path, self.package_path)
+
+        elapsed = time.perf_counter() - start
+        input_bytes = sum(entry["size"] for entry in files)
+        package_bytes = os.path.getsize(self.package_path)
+        self.manifest = {
+            "package": self.package_name,
+            "format": archive_format,
+            "sha256": _file_sha256(self.package_path),
+            "size": package_bytes,
+            "compression_level": self.compression_level,
+            "epoch": self.epoch,
+            "files": files,
+            "members": members,
+        }
+        with open(self.manifest_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+        self.last_stats = {
+            "files": len(files),
+            "input_bytes": input_bytes,
+            "package_bytes": package_bytes,
+            "seconds": round(elapsed, 3),
+            "mb_per_second": round(input_bytes / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            "reused_members": writer.reused,
+            "compressed_members": len(members) - writer.reused,
+        }
+        if previous is not None:
+            self.logger.log_info(f"♻️ Reused {writer.reused} of {len(members)} compressed members from the previous build.")
+        self.logger.log_info(
+            f"✅ Packaged {len(files)} files ({input_bytes / (1024 * 1024):.1f} MB -> "
+            f"{package_bytes / (1024 * 1024):.1f} MB) in {self.last_stats['seconds']}s "
+            f"({self.last_stats['mb_per_second']} MB/s): {self.package_path}"
+        )
+        return self.package_path
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_entry(entry, sha256):
+    manifest_entry = {"path": entry.archive_name, "type": entry.kind, "mode": oct(entry.mode),
+                      "size": entry.size, "sha256": sha256}
+    if entry.kind == "file":
+        manifest_entry["mtime_ns"] = entry.mtime_ns
+    elif entry.kind == "symlink":
+        manifest_entry["link"] = entry.link_target
+    return manifest_entry
+
+
+class PreviousBuild:
+    """The manifest and package of an earlier build, used to reuse members of unchanged files."""
+
+    MEMBER_MAGIC = {"zip": b"PK\x03\x04", "tar.gz": b"\x1f\x8b"}
+
+    def __init__(self, manifest, package_path):
+        self.files = {entry["path"]: entry for entry in manifest["files"]}
+        self.members = manifest["members"]
+        self.magic = self.MEMBER_MAGIC[manifest["format"]]
+        self.package = open(package_path, "rb")
+
+    def unchanged(self, entry):
+        """
+        Returns (True, sha256) if `entry` is identical to the previous build.
+        Files with the same size and mtime are trusted without being read;
+        otherwise their contents are hashed and compared.
+        """
+        old = self.files.get(entry.archive_name)
+        if old is None or old["type"] != entry.kind or old["mode"] != oct(entry.mode) or old["size"] != entry.size:
+            return False, None
+        if entry.kind == "symlink":
+            return old.get("link") == entry.link_target, old["sha256"]
+        if entry.kind == "dir" or old.get("mtime_ns") == entry.mtime_ns:
+            return True, old["sha256"]
+
+        sha256 = _file_sha256(entry.full_path)
+        return sha256 == old["sha256"], sha256
+
+    def copy(self, member, output):
+        """Copies the bytes of a previously written member to `output`."""
+        self.package.seek(member["offset"])
+        remaining = member["length"]
+        first = True
+        while remaining > 0:
+            chunk = self.package.read(min(READ_BYTES, remaining))
+            if not chunk or (first and not chunk.startswith(self.magic)):
+                raise IOError(f"Previous package {self.package.name} is inconsistent with its manifest")
+            output.write(chunk)
+            remaining -= len(chunk)
+            first = False
+
+    def close(self):
+        self.package.close()
+
+
+def _ordered_results(executor, function, items, window):
+    """Yields `function(item)` for each item in order, keeping at most `window` results in flight."""
+    pending = []
+    for item in items:
+        pending.append(executor.submit(function, item))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for future in pending:
+        yield future.result()
+
+
+def _copy_spool(spool, output):
+    spool.seek(0)
+    for chunk in iter(lambda: spool.read(READ_BYTES), b""):
+        output.write(chunk)
+    spool.close()
+
+
+class ZipWriter:
+    """Writes a zip archive whose members are deflated in parallel (zip64 where needed)."""
+
+    DOS_TIME_DATE = (0, (0 << 9) | (1 << 5) | 1)  # 00:00:00, 1980-01-01
+
+    def __init__(self, packager, previous=None):
+        self.packager = packager
+        self.previous = previous
+        self.previous_members = {member["path"]: member for member in previous.members} if previous else {}
+        self.reused = 0
+
+    def compress(self, entry):
+        """
+        Returns (entry, sha256, crc32, method, compressed size, data) for one
+        archive member. `data` is a spool with the compressed bytes, or the
+        previous build's member when it can be copied as-is.
+        """
+        if entry.archive_name in self.previous_members:
+            unchanged, sha256 = self.previous.unchanged(entry)
+            if unchanged:
+                member = self.previous_members[entry.archive_name]
+                return entry, sha256, member["crc32"], member["method"], member["compressed_size"], member
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+        digest = hashlib.sha256()
+        crc = 0
+
+        if entry.kind == "symlink":
+            data = entry.link_target.encode("utf-8", "surrogateescape")
+            digest.update(data)
+            spool.write(data)
+            return entry, digest.hexdigest(), zlib.crc32(data), 0, len(data), spool
+        if entry.kind == "dir":
+            return entry, None, 0, 0, 0, spool
+
+        compressor = zlib.compressobj(self.packager.compression_level, zlib.DEFLATED, -15)
+        with open(entry.full_path, "rb") as f:
+            for chunk in iter(lambda: f.read(READ_BYTES), b""):
+                digest.update(chunk)
+                crc = zlib.crc32(chunk, crc)
+                spool.write(compressor.compress(chunk))
+        spool.write(compressor.flush())
+
+        if spool.tell() >= entry.size:
+            # Incompressible data is stored as-is
+            spool.close()
+            spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+            with open(entry.full_path, "rb") as f:
+                for chunk in iter(lambda: f.read(READ_BYTES), b""):
+                    spool.write(chunk)
+            return entry, digest.hexdigest(), crc, 0, spool.tell(), spool
+        return entry, digest.hexdigest(), crc, 8, spool.tell(), spool
+
+    def write(self, output, entries):
+        """Writes all entries to `output`. Returns (manifest file entries, member layout)."""
+        files, members, central_directory = [], [], []
+        workers = self.packager.workers
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip") as executor:
+            results = _ordered_results(executor, self.compress, entries, workers * 2)
+            for entry, sha256, crc, method, compressed_size, data in results:
+                offset = output.tell()
+                if isinstance(data, dict):
+                    # Local header and data of an unchanged file are identical, so copy them verbatim
+                    self.previous.copy(data, output)
+                    self.reused += 1
+                else:
+                    self._write_local_member(output, entry, crc, method, compressed_size, data)
+                central_directory.append(self._central_record(entry, crc, method, compressed_size, offset))
+                files.append(_manifest_entry(entry, sha256))
+                members.append({"path": entry.archive_name, "offset": offset, "length": output.tell() - offset,
+                                "compressed_size": compressed_size, "method": method, "crc32": crc})
+
+        self._write_central_directory(output, central_directory)
+        return files, members
+
+    @staticmethod
+    def _uncompressed_size(entry, compressed_size):
+        return entry.size if entry.kind == "file" else compressed_size
+
+    def _write_local_member(self, output, entry, crc, method, compressed_size, spool):
+        """Writes a local file header followed by the member data."""
+        name = entry.archive_name.encode("utf-8", "surrogateescape")
+        size = self._uncompressed_size(entry, compressed_size)
+        zip64 = size >= ZIP64_LIMIT or compressed_size >= ZIP64_LIMIT
+        local_extra = struct.pack("<HHQQ", 1, 16, size, compressed_size) if zip64 else b""
+        output.write(struct.pack(
+            "<IHHHHHIIIHH", 0x04034b50, 45 if zip64 else 20, 0x0800, method, *self.DOS_TIME_DATE, crc,
+            ZIP64_LIMIT if zip64 else compressed_size, ZIP64_LIMIT if zip64 else size, len(name), len(local_extra)
+        ))
+        output.write(name + local_extra)
+        _copy_spool(spool, output)
+
+    def _central_record(self, entry, crc, method, compressed_size, offset):
+        """Returns the central directory record of a member written at `offset`."""
+        name = entry.archive_name.encode("utf-8", "surrogateescape")
+        size = self._uncompressed_size(entry, compressed_size)
+        file_type = {"file": stat.S_IFREG, "symlink": stat.S_IFLNK, "dir": stat.S_IFDIR}[entry.kind]
+        external_attr = (file_type | entry.mode) << 16 | (0x10 if entry.kind == "dir" else 0)
+
+        central_fields = [value for value in (size, compressed_size, offset) if value >= ZIP64_LIMIT]
+        central_extra = struct.pack(f"<HH{len(central_fields)}Q", 1, 8 * len(central_fields), *central_fields) \
+            if central_fields else b""
+        version = 45 if central_fields or size >= ZIP64_LIMIT or compressed_size >= ZIP64_LIMIT else 20
+        return struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014b50, (3 << 8) | version, version, 0x0800, method, *self.DOS_TIME_DATE,
+            crc, min(compressed_size, ZIP64_LIMIT), min(size, ZIP64_LIMIT), len(name), len(central_extra),
+            0, 0, 0, external_attr, min(offset, ZIP64_LIMIT)
+        ) + name + central_extra
+
+    def _write_central_directory(self, output, records):
+        start = output.tell()
+        for record in records:
+            output.write(record)
+        size = output.tell() - start
+        count = len(records)
+
+        if count >= 0xFFFF or size >= ZIP64_LIMIT or start >= ZIP64_LIMIT:
+            zip64_end = output.tell()
+            output.write(struct.pack("<IQHHIIQQQQ", 0x06064b50, 44, (3 << 8) | 45, 45, 0, 0, count, count, size, start))
+            output.write(struct.pack("<IIQI", 0x07064b50, 0, zip64_end, 1))
+        output.write(struct.pack("<IHHHHIIH", 0x06054b50, 0, 0, min(count, 0xFFFF), min(count, 0xFFFF),
+                                 min(size, ZIP64_LIMIT), min(start, ZIP64_LIMIT), 0))
+
+
+class TarGzWriter:
+    """
+    Writes a tar archive as a series of independently compressed gzip members.
+
+    A multi-member gzip stream is a valid `.tar.gz` for `tar`, `gzip` and
+    Python's `tarfile`, and lets the members be compressed in parallel.
+    """
+
+    def __init__(self, packager, previous=None):
+        self.packager = packager
+        self.previous = previous
+        self.previous_members = {tuple(member["paths"]): member for member in previous.members} if previous else {}
+        self.reused = 0
+
+    def group(self, entries):
+        """Splits entries into the groups that are compressed into one gzip member each."""
+        groups, current, current_bytes = [], [], 0
+        for entry in entries:
+            current.append(entry)
+            current_bytes += entry.size + tarfile.BLOCKSIZE
+            boundary = int(hashlib.md5(entry.path.encode("utf-8", "surrogateescape")).hexdigest()[:8], 16)
+            if current_bytes >= TAR_MEMBER_BYTES or boundary % TAR_MEMBER_BOUNDARY == 0:
+                groups.append(current)
+                current, current_bytes = [], 0
+        if current:
+            groups.append(current)
+        return groups
+
+    def tar_info(self, entry):
+        info = tarfile.TarInfo(entry.path)
+        info.mode = entry.mode
+        info.mtime = self.packager.epoch
+        info.uid = info.gid = 0
+        info.uname = info.gname = ""
+        if entry.kind == "symlink":
+            info.type = tarfile.SYMTYPE
+            info.linkname = entry.link_target
+        elif entry.kind == "dir":
+            info.type = tarfile.DIRTYPE
+        else:
+            info.size = entry.size
+        return info
+
+    def compress(self, group):
+        """
+        Returns (manifest entries, uncompressed size, data) for a group of
+        entries; an empty group yields the end-of-archive member. `data` is a
+        spool with the gzip member, or the previous build's member when every
+        entry of the group is unchanged.
+        """
+        member = self.previous_members.get(tuple(entry.archive_name for entry in group))
+        if member is not None:
+            files = []
+            for entry in group:
+                unchanged, sha256 = self.previous.unchanged(entry)
+                if not unchanged:
+                    break
+                files.append(_manifest_entry(entry, sha256))
+            else:
+                return files, member["tar_bytes"], member
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+        compressor = zlib.compressobj(self.packager.compression_level, zlib.DEFLATED, -15)
+        crc = length = 0
+        files = []
+
+        def add(data):
+            nonlocal crc, length
+            crc = zlib.crc32(data, crc)
+            length += len(data)
+            spool.write(compressor.compress(data))
+
+        # Fixed gzip header: no name, mtime 0, unknown OS
+        spool.write(b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff")
+        if not group:
+            # End-of-archive marker: two zero blocks
+            add(b"\0" * (2 * tarfile.BLOCKSIZE))
+        for entry in group:
+            add(self.tar_info(entry).tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape"))
+            if entry.kind != "file":
+                files.append(_manifest_entry(entry, None))
+                continue
+
+            digest = hashlib.sha256()
+            remaining = entry.size
+            with open(entry.full_path, "rb") as f:
+                while remaining > 0:
+                    chunk = f.read(min(READ_BYTES, remaining))
+                    if not chunk:
+                        raise IOError(f"{entry.full_path} changed size during packaging")
+                    digest.update(chunk)
+                    add(chunk)
+                    remaining -= len(chunk)
+            padding = -entry.size % tarfile.BLOCKSIZE
+            if padding:
+                add(b"\0" * padding)
+            files.append(_manifest_entry(entry, digest.hexdigest()))
+
+        spool.write(compressor.flush())
+        spool.write(struct.pack("<II", crc, length & 0xFFFFFFFF))
+        return files, length, spool
+
+    def write(self, output, entries):
+        """Writes all entries to `output`. Returns (manifest file entries, member layout)."""
+        files, members = [], []
+        groups = self.group(entries)
+        # The end-of-archive marker (two zero blocks) is its own member
+        groups.append([])
+        workers = self.packager.workers
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gzip") as executor:
+            for group_files, length, data in _ordered_results(executor, self.compress, groups, workers * 2):
+                offset = output.tell()
+                if isinstance(data, dict):
+                    self.previous.copy(data, output)
+                    self.reused += 1
+                else:
+                    _copy_spool(data, output)
+                files.extend(group_files)
+                members.append({"offset": offset, "length": output.tell() - offset, "tar_bytes": length,
+                                "paths": [entry["path"] for entry in group_files]})
+        return files, members
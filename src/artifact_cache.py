@@ -0,0 +1,189 @@
+import collections
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+# Shared cache instances, one per cache directory, reused by every step in the process
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+class ArtifactCache:
+    """
+    Content-addressed local cache for downloaded sources and built packages.
+
+    Entries are stored under `objects/<key[:2]>/<key>` and tracked in
+    `index.json` with their size and last access time. When the total size
+    exceeds `max_bytes`, the least recently used entries are evicted, except
+    entries checked out with `checkout` and the entry just added. Files larger
+    than `max_bytes` are not cached.
+    """
+
+    def __init__(self, cache_dir, logger, max_bytes=2 * 1024 ** 3):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.logger = logger
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(self.cache_dir, "index.json")
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._pins = collections.Counter()  # key -> number of `checkout` blocks using the entry
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    @staticmethod
+    def make_key(*parts):
+        """Builds a cache key from JSON-serializable parts, e.g. (kind, repo, commit, params)."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+    def _object_path(self, key):
+        return os.path.join(self.cache_dir, "objects", key[:2], key)
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.log_error(f"❌ Ignoring unreadable cache index {self.index_path}: {e}")
+            return {}
+
+    def _save_index(self):
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(self.index, f)
+        os.replace(temp_path, self.index_path)
+
+    def get(self, key):
+        """
+        Returns the path of the cached file for `key`, or None on a miss. The
+        file may be evicted by another thread's `put` at any time; use
+        `checkout` to read it safely.
+        """
+        with self._lock:
+            return self._get(key)
+
+    @contextlib.contextmanager
+    def checkout(self, key):
+        """Yields the path of the cached file for `key` (None on a miss), which is not evicted within the block."""
+        with self._lock:
+            path = self._get(key)
+            if path is not None:
+                self._pins[key] += 1
+        try:
+            yield path
+        finally:
+            if path is not None:
+                with self._lock:
+                    self._pins[key] -= 1
+                    if not self._pins[key]:
+                        del self._pins[key]
+
+    def _get(self, key):
+        """Looks up `key` and records the hit or miss. Called with the lock held."""
+        entry = self.index.get(key)
+        path = self._object_path(key)
+
+        if entry is None or not os.path.exists(path):
+            self.index.pop(key, None)
+            self.misses += 1
+            return None
+
+        entry["last_access"] = time.time()
+        self.hits += 1
+        self.bytes_saved += entry["size"]
+        self._save_index()
+        self.logger.log_info(f"♻️ Cache hit for {entry.get('name', key)} ({entry['size']} bytes)")
+        return path
+
+    def put(self, key, source_path, name=None):
+        """
+        Copies `source_path` into the cache under `key` and returns the cached
+        path, or None when the file is larger than the whole cache.
+        """
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            self.logger.log_info(f"⏭️ Not caching {name or source_path}: {size} bytes exceed the cache size "
+                                 f"of {self.max_bytes} bytes")
+            return None
+        path = self._object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self.index[key] = {
+                "size": os.path.getsize(path),
+                "last_access": time.time(),
+                "name": name or os.path.basename(source_path),
+            }
+            self._evict(keep=key)
+            self._save_index()
+
+        self.logger.log_info(f"📦 Cached {name or source_path} ({self.index.get(key, {}).get('size', 0)} bytes)")
+        return path
+
+    def _evict(self, keep=None):
+        """
+        Removes least recently used entries until the cache fits in `max_bytes`.
+        Entries in use by `checkout` and the entry `keep` are never removed, so
+        the cache may stay over its size until they are released.
+        """
+        total = sum(entry["size"] for entry in self.index.values())
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep or key in self._pins:
+                continue
+            try:
+                os.remove(self._object_path(key))
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            del self.index[key]
+            self.evictions += 1
+            self.logger.log_info(f"🧹 Evicted {entry.get('name', key)} from cache")
+
+    @property
+    def size(self):
+        return sum(entry["size"] for entry in self.index.values())
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+            "entries": len(self.index),
+            "size": self.size,
+        }
+
+
+def get_cache(cache_dir, logger, max_bytes=2 * 1024 ** 3):
+    """Returns the shared ArtifactCache for `cache_dir`, creating it on first use."""
+    cache_dir = os.path.abspath(cache_dir)
+    with _CACHES_LOCK:
+        if cache_dir not in _CACHES:
+            _CACHES[cache_dir] = ArtifactCache(cache_dir, logger, max_bytes=max_bytes)
+        return _CACHES[cache_dir]
+
+
+def cache_stats():
+    """Returns combined statistics for every cache used in this process."""
+    totals = {"hits": 0, "misses": 0, "bytes_saved": 0, "evictions": 0}
+    with _CACHES_LOCK:
+        for cache in _CACHES.values():
+            for name, value in cache.stats().items():
+                if name in totals:
+                    totals[name] += value
+    return totals
@@ -1,5 +1,6 @@
 import requests
 import base64
+from urllib.parse import quote
 from deployment_logger import DeploymentLogger
 
 class AzureDevOpsManager:
@@ -7,7 +8,8 @@ class AzureDevOpsManager:
     Handles interactions with Azure DevOps repositories.
     """
     
-    def __init__(self, repo_url, organization, project, repo_name, access_token, logger: DeploymentLogger):
+    def __init__(self, repo_url, organization, project, repo_name, access_token, logger: DeploymentLogger,
+                 http_cache=None, session=None, timeout=10, branch=None):
         self.repo_url = repo_url
         self.organization = organization
         self.project = project
@@ -15,7 +17,13 @@ class AzureDevOpsManager:
         self.access_token = access_token
         self.logger = logger  # Inject logger
         self.class_name = self.__class__.__name__  # Store class name dynamically
+        self.api_base = "https://dev.azure.com"
         self.headers = {"Authorization": f"Basic {self._encode_pat()}", "Content-Type": "application/json"}
+        self.http_cache = http_cache  # Optional HTTPCache for conditional API requests
+        # HTTP client: an injected (pooled) session, or the `requests` module itself
+        self.http = session or requests
+        self.timeout = timeout
+        self.branch = branch  # None follows the repository's default branch
     
     def _encode_pat(self):
         """Encodes the Personal Access Token for Basic Auth."""
@@ -28,16 +36,32 @@ class AzureDevOpsManager:
         self.logger.log_info(f"[{self.class_name}] Pushing to Azure Repo: {self.repo_url}")
         return True  # Keeping the same functionality
     
+    @property
+    def latest_commit_url(self):
+        """
+        URL answering with only the newest commit: the branch ref when a branch
+        is set, otherwise the first entry of the default branch's commit list
+        (`$top=1`) instead of the default 100-commit page.
+        """
+        repository_url = f"{self.api_base}/{self.organization}/{self.project}/_apis/git/repositories/{self.repo_name}"
+        if self.branch:
+            return f"{repository_url}/refs?filter={quote(f'heads/{self.branch}')}&api-version=6.0"
+        return f"{repository_url}/commits?searchCriteria.$top=1&api-version=6.0"
+
     def get_latest_commit(self):
         """
         Fetches the latest commit SHA from Azure DevOps.
         """
-        self.logger.log_info(f"[{self.class_name}] Fetching latest commit for repo {self.repo_name}")
+        branch = f" ({self.branch})" if self.branch else ""
+        self.logger.log_info(f"[{self.class_name}] Fetching latest commit for repo {self.repo_name}{branch}")
 
-        url = f"https://dev.azure.com/{self.organization}/{self.project}/_apis/git/repositories/{self.repo_name}/commits?api-version=6.0"
+        url = self.latest_commit_url
 
         try:
-            response = requests.get(url, headers=self.headers)
+            if self.http_cache is not None:
+                response = self.http_cache.get(url, headers=self.headers, timeout=self.timeout, http=self.http)
+            else:
+                response = self.http.get(url, headers=self.headers, timeout=self.timeout)
 
             # ✅ Check API response
             if response.status_code != 200:
@@ -45,6 +69,10 @@ class AzureDevOpsManager:
                 return None  # 🔥 Return None to indicate failure
 
             commits = response.json().get("value", [])
+            if self.branch:
+                # The refs filter matches by prefix (heads/main also matches heads/main-old)
+                commits = [{"commitId": ref["objectId"]} for ref in commits
+                           if ref.get("name") == f"refs/heads/{self.branch}"]
             if commits:
                 latest_commit_sha = commits[0]["commitId"]
                 self.logger.log_info(f"[{self.class_name}] Latest Azure DevOps commit: {latest_commit_sha}")
@@ -0,0 +1,56 @@
+"""
+Block signatures and delta patching for DeltaTransfer.
+
+This module is sent to the target host and run there with `python3 -c`, so it
+must only use the standard library:
+
+    signature <path> <block_size>      prints "<weak> <md5>" for each block of a file
+    patch <basis> <delta> <output>     rebuilds a file from a basis and a delta
+"""
+import hashlib
+import os
+import struct
+import sys
+import zlib
+
+
+def weak_checksum(block):
+    """Adler-32 of a block; DeltaTransfer rolls the same value one byte at a time."""
+    return zlib.adler32(block)
+
+
+def signature(path, block_size, out):
+    """Writes the weak and strong checksum of every block of `path` to `out`."""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            out.write("%d %s\n" % (weak_checksum(block), hashlib.md5(block).hexdigest()))
+
+
+def patch(basis_path, delta_path, output_path):
+    """Rebuilds `output_path` from blocks of `basis_path` and literal data in the delta."""
+    temp_path = output_path + ".part"
+    with open(basis_path, "rb") as basis, open(delta_path, "rb") as delta, open(temp_path, "wb") as out:
+        if delta.read(4) != b"DLT1":
+            raise SystemExit("not a delta file")
+        block_size, = struct.unpack(">I", delta.read(4))
+        while True:
+            op = delta.read(1)
+            if not op:
+                break
+            if op == b"C":
+                index, count = struct.unpack(">QI", delta.read(12))
+                basis.seek(index * block_size)
+                out.write(basis.read(count * block_size))
+            elif op == b"D":
+                length, = struct.unpack(">I", delta.read(4))
+                out.write(delta.read(length))
+            else:
+                raise SystemExit("corrupt delta file")
+    os.replace(temp_path, output_path)
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "signature":
+        signature(sys.argv[2], int(sys.argv[3]), sys.stdout)
+    elif sys.argv[1] == "patch":
+        patch(sys.argv[2], sys.argv[3], sys.argv[4])
@@ -0,0 +1,205 @@
+import hashlib
+import mmap
+import os
+import shlex
+import struct
+import tempfile
+import time
+
+import delta_remote
+from delta_remote import weak_checksum, patch as apply_delta
+
+# Modulus of the Adler-32 sums used as the rolling weak checksum
+ADLER_MOD = 65521
+
+# Source of `delta_remote`, executed on the target host to sign and patch files
+with open(delta_remote.__file__, "r") as _f:
+    REMOTE_SCRIPT = _f.read()
+
+
+def _split(checksum):
+    """Splits an Adler-32 value into its (a, b) sums."""
+    return checksum & 0xffff, checksum >> 16
+
+
+def local_signature(path, block_size):
+    """Returns block signatures of a local file, as the remote `signature` command would."""
+    with open(path, "rb") as f:
+        return [(weak_checksum(block), hashlib.md5(block).hexdigest())
+                for block in iter(lambda: f.read(block_size), b"")]
+
+
+def compute_delta(new_path, signatures, block_size, delta_path, max_literal_ratio=1.0):
+    """
+    Writes a delta that rebuilds `new_path` from a basis with the given block
+    `signatures` (list of (weak, md5 hex) as produced by the signature command).
+
+    Matching uses an rsync-style rolling checksum, so blocks are found at any
+    byte offset, not only at block boundaries. Returns (literal_bytes,
+    matched_blocks), or None once literal data exceeds `max_literal_ratio` of
+    the file size (or of the first 8 MB or more scanned), in which case a full
+    upload is cheaper.
+    """
+    index = {}
+    for block_index, (weak, strong) in enumerate(signatures):
+        index.setdefault(weak, {}).setdefault(strong, block_index)
+
+    size = os.path.getsize(new_path)
+    max_literal = int(size * max_literal_ratio)
+    literal_bytes = 0
+    matched_blocks = 0
+
+    with open(delta_path, "wb") as delta:
+        delta.write(b"DLT1" + struct.pack(">I", block_size))
+        pending_copy = None  # (first block index, count) of the current run of copied blocks
+
+        def flush_copy():
+            if pending_copy is not None:
+                delta.write(b"C" + struct.pack(">QI", *pending_copy))
+
+        def write_literal(data):
+            for offset in range(0, len(data), 1 << 20):
+                piece = data[offset:offset + (1 << 20)]
+                delta.write(b"D" + struct.pack(">I", len(piece)) + piece)
+
+        if size == 0:
+            return 0, 0
+
+        with open(new_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = literal_start = 0
+            a = b = 0
+            if size >= block_size:
+                a, b = _split(weak_checksum(data[0:block_size]))
+
+            while position + block_size <= size:
+                candidates = index.get(a | (b << 16))
+                if candidates is not None:
+                    match = candidates.get(hashlib.md5(data[position:position + block_size]).hexdigest())
+                    if match is not None:
+                        if literal_start < position:
+                            flush_copy()
+                            pending_copy = None
+                            write_literal(data[literal_start:position])
+                            literal_bytes += position - literal_start
+                        if pending_copy is not None and pending_copy[0] + pending_copy[1] == match:
+                            pending_copy = (pending_copy[0], pending_copy[1] + 1)
+                        else:
+                            flush_copy()
+                            pending_copy = (match, 1)
+                        matched_blocks += 1
+                        position += block_size
+                        literal_start = position
+                        if position + block_size <= size:
+                            a, b = _split(weak_checksum(data[position:position + block_size]))
+                        continue
+
+                if position + block_size < size:
+                    old, new = data[position], data[position + block_size]
+                    a = (a - old + new) % ADLER_MOD
+                    b = (b - block_size * old + a - 1) % ADLER_MOD
+                position += 1
+
+                pending_literal = position - literal_start + literal_bytes
+                if pending_literal > max_literal:
+                    return None
+                if position >= (1 << 23) and pending_literal > position * max_literal_ratio:
+                    # Mostly unmatched after the first 8 MB: give up early instead of rolling byte by byte
+                    return None
+                if position - literal_start >= (1 << 22):
+                    # Keep pending literal data bounded for long unmatched stretches
+                    flush_copy()
+                    pending_copy = None
+                    write_literal(data[literal_start:position])
+                    literal_bytes += position - literal_start
+                    literal_start = position
+
+            if literal_start < size:
+                flush_copy()
+                pending_copy = None
+                write_literal(data[literal_start:size])
+                literal_bytes += size - literal_start
+            flush_copy()
+
+    if literal_bytes > max_literal:
+        return None
+    return literal_bytes, matched_blocks
+
+
+class DeltaTransfer:
+    """
+    Sends only the changed blocks of a package to a host that already has a previous version.
+
+    The target computes block signatures of its copy (by default the file at the
+    destination path), the delta is computed locally against them, uploaded, and
+    the new file is rebuilt on the target. Falls back to a full upload when the
+    target has no previous copy, cannot run `python3`, or the delta would not be
+    meaningfully smaller than the package.
+    """
+
+    def __init__(self, deployer, logger, block_size=32 * 1024, max_literal_ratio=0.7, **transfer_options):
+        self.deployer = deployer
+        self.logger = logger
+        self.block_size = block_size
+        self.max_literal_ratio = max_literal_ratio
+        self.transfer_options = transfer_options
+
+    def _remote_script(self, *args):
+        return "python3 -c " + shlex.quote(REMOTE_SCRIPT) + " " + " ".join(shlex.quote(str(arg)) for arg in args)
+
+    def remote_signature(self, remote_path):
+        """Returns block signatures of the remote file, or None if unavailable."""
+        exit_status, output, error = self.deployer.run_command(
+            f"test -f {shlex.quote(remote_path)} && " + self._remote_script("signature", remote_path, self.block_size)
+        )
+        if exit_status != 0:
+            self.logger.log_info(f"🔹 No usable basis for delta transfer at {remote_path} ({error.strip() or 'missing'})")
+            return None
+        return [(int(weak), strong) for weak, strong in (line.split() for line in output.splitlines() if line)]
+
+    def upload(self, local_path, remote_path, basis_path=None):
+        """Uploads `local_path` to `remote_path` as a delta against `basis_path` (defaults to `remote_path`)."""
+        basis_path = basis_path or remote_path
+        size = os.path.getsize(local_path)
+        start = time.perf_counter()
+
+        signatures = self.remote_signature(basis_path)
+        result = None
+        fd, delta_path = tempfile.mkstemp(suffix=".delta")
+        os.close(fd)
+        try:
+            if signatures:
+                result = compute_delta(local_path, signatures, self.block_size, delta_path, self.max_literal_ratio)
+
+            if result is None:
+                self.logger.log_info(f"🔹 Delta not worthwhile for {remote_path}, uploading the full package.")
+                self.deployer.upload_file(local_path, remote_path, **self.transfer_options)
+                return {"bytes": size, "bytes_sent": size, "matched_blocks": 0, "delta": False,
+                        "seconds": round(time.perf_counter() - start, 3)}
+
+            literal_bytes, matched_blocks = result
+            remote_delta_path = f"{remote_path}.delta"
+            self.deployer.upload_file(delta_path, remote_delta_path, **self.transfer_options)
+            exit_status, _, error = self.deployer.run_command(
+                self._remote_script("patch", basis_path, remote_delta_path, remote_path)
+                + f"; status=$?; rm -f {shlex.quote(remote_delta_path)}; exit $status"
+            )
+            if exit_status != 0:
+                raise IOError(f"Remote delta patch failed: {error.strip()}")
+
+            stats = {
+                "bytes": size,
+                "bytes_sent": os.path.getsize(delta_path),
+                "matched_blocks": matched_blocks,
+                "literal_bytes": literal_bytes,
+                "delta": True,
+                "seconds": round(time.perf_counter() - start, 3),
+            }
+        finally:
+            os.remove(delta_path)
+
+        saved = 100 - (100 * stats["bytes_sent"] // size if size else 0)
+        self.logger.log_info(
+            f"📤 Delta upload of {remote_path}: sent {stats['bytes_sent']} of {size} bytes "
+            f"({saved}% saved, {matched_blocks} blocks reused) in {stats['seconds']}s"
+        )
+        return stats
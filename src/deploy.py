@@ -8,21 +8,78 @@ import argparse
 from deployment_logger import DeploymentLogger
 from deployment_orchestrator import DeploymentOrchestrator
 
+def read_app_file(path):
+    """Reads app names from a file, one per line. Blank lines and `#` comments are ignored."""
+    with open(path, "r") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
 def main():
     parser = argparse.ArgumentParser(description="Deployment Automation System")
     parser.add_argument("--steps", nargs="+", help="Specify deployment steps (e.g., fetch compare upload)")
-    parser.add_argument("--app", type=str, required=True, help="Application name")
+    parser.add_argument("--app", nargs="+", default=[], help="Application name(s)")
+    parser.add_argument("--app-file", type=str, help="File listing application names, one per line")
+    parser.add_argument("--max-parallel-apps", type=int, default=4,
+                        help="Maximum number of apps deployed concurrently when several apps are given")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run independent steps concurrently based on their declared dependencies")
+    parser.add_argument("--max-workers", type=int, default=4, help="Maximum concurrent steps in --parallel mode")
+    parser.add_argument("--force", action="store_true",
+                        help="Run every step even if its inputs are unchanged since the last successful run")
+    parser.add_argument("--env", help="Apply the config/<name>.<env>.json overlays (default: DEPLOY_ENV)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="Console and file log format; json emits one structured record per line")
+    parser.add_argument("--log-file", help="Also write logs to this file (rotated at 10 MB)")
+    parser.add_argument("--report", help="Write per-step timing and resource usage of the run to this JSON file")
+    parser.add_argument("--prometheus-file",
+                        help="Write the run's metrics in Prometheus text format (e.g. for the node exporter's "
+                             "textfile collector directory)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile each step: per-step cProfile files plus merged collapsed stacks for flame graphs. "
+                             "Only the step's own thread is profiled; work on its worker pools shows up as waiting")
+    parser.add_argument("--profile-dir", help="Directory for profile output (default: .deploy_cache/profiles/<run id>)")
+    parser.add_argument("--profile-interval", type=float, default=0.005,
+                        help="Stack sampling interval in seconds for the collapsed-stack output")
 
     args = parser.parse_args()
 
-    logger = DeploymentLogger()
-    orchestrator = DeploymentOrchestrator(logger)
+    apps = list(args.app)
+    if args.app_file:
+        apps.extend(read_app_file(args.app_file))
+    if not apps:
+        parser.error("at least one application is required (use --app or --app-file)")
+
+    # Records are written by a background thread so concurrent deployments never wait on log I/O
+    logger = DeploymentLogger(json_format=args.log_format == "json", log_file=args.log_file, use_queue=True)
+    orchestrator = DeploymentOrchestrator(logger, force=args.force, environment=args.env)
+    if args.profile:
+        orchestrator.enable_profiling(args.profile_dir, interval=args.profile_interval)
 
     # Print parameters for debugging
-    logger.log_info(f"🔍 Debug Parameters: app={args.app}")
+    logger.log_info(f"🔍 Debug Parameters: app={', '.join(apps)}")
 
+    if len(apps) > 1:
+        results = orchestrator.execute_for_apps(
+            args.steps, apps,
+            max_parallel_apps=args.max_parallel_apps,
+            parallel_steps=args.parallel,
+            max_workers=args.max_workers,
+        )
+        succeeded = all(result["status"] == "success" for result in results.values())
+    else:
+        if args.parallel:
+            executed_steps = orchestrator.execute_steps_parallel(args.steps, apps[0], max_workers=args.max_workers)
+        else:
+            executed_steps = orchestrator.execute_steps(args.steps, apps[0])
+        orchestrator.log_cache_summary()
+        orchestrator.log_upload_summary()
+        orchestrator.log_skip_summary()
+        succeeded = len(executed_steps) == len(orchestrator.known_steps(args.steps))
 
-    executed_steps = orchestrator.execute_steps(args.steps, args.app)
+    orchestrator.log_metrics_summary()
+    if orchestrator.profiler is not None:
+        orchestrator.profiler.finish()
+    orchestrator.write_run_report(json_path=args.report, prometheus_path=args.prometheus_file)
+    return 0 if succeeded else 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Thin client for the deployment daemon (deploy_daemon.py).
+
+Only the standard library is imported, so submitting a job costs an
+interpreter start and one local HTTP request instead of loading the whole
+deployment stack.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+class DaemonClient:
+    """Calls the daemon's JSON API."""
+
+    def __init__(self, url=None, timeout=30):
+        self.url = (url or os.environ.get("DEPLOY_DAEMON_URL") or DEFAULT_URL).rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, method, path, body=None):
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        request = urllib.request.Request(f"{self.url}{path}", data=data, method=method,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            message = json.loads(e.read() or b"{}").get("error", e.reason)
+            raise RuntimeError(f"Daemon returned HTTP {e.code}: {message}") from None
+
+    def submit(self, steps, apps, parallel=False, max_workers=4, force=False):
+        return self._request("POST", "/jobs", {"steps": steps, "apps": apps, "parallel": parallel,
+                                               "max_workers": max_workers, "force": force})
+
+    def status(self, job_id):
+        return self._request("GET", f"/jobs/{job_id}")
+
+    def list_jobs(self):
+        return self._request("GET", "/jobs")["jobs"]
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def wait(self, job_id, poll_interval=1.0):
+        """Polls until the job has finished; returns its final record."""
+        while True:
+            job = self.status(job_id)
+            if job["status"] in ("succeeded", "failed"):
+                return job
+            time.sleep(poll_interval)
+
+
+def print_job(job):
+    print(f"Job {job['id']}: {job['status']} - steps={job['steps']} apps={job['apps']}")
+    for app, result in (job.get("results") or {}).items():
+        details = f" ({result['error']})" if result.get("error") else ""
+        print(f"   {app}: {result['status']} in {result['duration']}s, steps={result['executed_steps']}{details}")
+    if job.get("error"):
+        print(f"   error: {job['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Submit deployment jobs to a running deploy_daemon.py")
+    parser.add_argument("--url", help=f"Daemon URL (default: $DEPLOY_DAEMON_URL or {DEFAULT_URL})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit = commands.add_parser("submit", help="Queue a deployment job")
+    submit.add_argument("--steps", nargs="+", required=True, help="Deployment steps (e.g., fetch package deploy)")
+    submit.add_argument("--app", nargs="+", required=True, help="Application name(s)")
+    submit.add_argument("--parallel", action="store_true", help="Run independent steps concurrently")
+    submit.add_argument("--max-workers", type=int, default=4, help="Maximum concurrent steps in --parallel mode")
+    submit.add_argument("--force", action="store_true", help="Run every step even if its inputs are unchanged")
+    submit.add_argument("--wait", action="store_true", help="Wait for the job to finish and exit with its status")
+
+    status = commands.add_parser("status", help="Show a job and its per-app results")
+    status.add_argument("job_id")
+    commands.add_parser("list", help="List jobs")
+    commands.add_parser("health", help="Show queue depth and job counts")
+
+    args = parser.parse_args(argv)
+    client = DaemonClient(args.url)
+
+    try:
+        if args.command == "submit":
+            job = client.submit(args.steps, args.app, parallel=args.parallel, max_workers=args.max_workers,
+                                force=args.force)
+            if args.wait:
+                job = client.wait(job["id"])
+            print_job(job)
+            return 1 if job["status"] == "failed" else 0
+        if args.command == "status":
+            job = client.status(args.job_id)
+            print_job(job)
+            return 1 if job["status"] == "failed" else 0
+        if args.command == "list":
+            for job in client.list_jobs():
+                print_job(job)
+            return 0
+        print(json.dumps(client.health(), indent=2))
+        return 0
+    except (RuntimeError, urllib.error.URLError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
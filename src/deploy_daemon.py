@@ -0,0 +1,311 @@
+import sys
+import os
+
+# Ensure Python can find `src/` modules
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+import argparse
+import collections
+import itertools
+import json
+import queue
+import signal
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_PORT = 8765
+
+
+class DeploymentDaemon:
+    """
+    Runs deployment jobs inside one long-lived process.
+
+    The orchestrator (configuration, step registry) is loaded once, and the
+    shared HTTP session, API cache and SSH connection pool stay warm between
+    jobs. Submitted jobs wait in a queue of at most `max_queued_jobs` and
+    `max_concurrent_jobs` of them run at a time, each deploying its apps with
+    up to `max_parallel_apps` in parallel. Jobs sharing an app never run at
+    the same time and run in the order they were submitted; a free worker
+    takes the oldest queued job whose apps are idle, so jobs for other apps
+    are not held up behind a busy one. Only the latest `max_finished_jobs`
+    finished jobs are kept.
+    """
+
+    def __init__(self, orchestrator, logger, max_concurrent_jobs=2, max_queued_jobs=100, max_parallel_apps=4,
+                 max_finished_jobs=1000):
+        if max_concurrent_jobs < 1:
+            raise ValueError("max_concurrent_jobs must be at least 1")
+        self.orchestrator = orchestrator
+        self.logger = logger
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.max_parallel_apps = max_parallel_apps
+        self.max_finished_jobs = max_finished_jobs
+        self.max_queued_jobs = max_queued_jobs
+        self.pending = collections.deque()  # ids of queued jobs, oldest first
+        self.jobs = {}
+        self.lock = threading.Lock()
+        # Signalled when a job is queued or finishes (freeing its apps), and on stop
+        self.changed = threading.Condition(self.lock)
+        self.running_apps = set()
+        self._stopping = False
+        self.started_at = time.time()
+        self._ids = itertools.count(1)
+        self._workers = []
+
+    def start(self):
+        """Starts the job worker threads."""
+        for index in range(self.max_concurrent_jobs):
+            worker = threading.Thread(target=self._work, name=f"deploy-job-{index + 1}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        """Lets running jobs finish, then stops the workers. Queued jobs are left unstarted."""
+        with self.changed:
+            self._stopping = True
+            self.changed.notify_all()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        with self.lock:
+            self._stopping = False
+
+    def validate(self, steps, apps, max_workers):
+        """Raises ValueError unless the job names known steps and apps and a usable worker count."""
+        for name, values in (("steps", steps), ("apps", apps)):
+            if not isinstance(values, list) or not values \
+                    or not all(isinstance(value, str) and value for value in values):
+                raise ValueError(f"{name} must be a non-empty list of names, got {values!r}")
+        unknown = [step for step in steps if step not in self.orchestrator.known_steps(steps)]
+        if unknown:
+            raise ValueError(f"unknown steps: {', '.join(unknown)}")
+        if not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1:
+            raise ValueError(f"max_workers must be a positive integer, got {max_workers!r}")
+
+    def submit(self, steps, apps, parallel=False, max_workers=4, force=False):
+        """
+        Queues a job that runs `steps` for `apps`. Returns the job record;
+        raises ValueError for an invalid job and queue.Full when the queue is
+        at capacity.
+        """
+        self.validate(steps, apps, max_workers)
+        with self.changed:
+            if len(self.pending) >= self.max_queued_jobs:
+                raise queue.Full
+            job = {
+                "id": str(next(self._ids)),
+                "status": "queued",
+                "steps": list(steps),
+                "apps": list(dict.fromkeys(apps)),
+                "parallel": bool(parallel),
+                "max_workers": max_workers,
+                "force": bool(force),
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "results": None,
+                "error": None,
+            }
+            self.pending.append(job["id"])
+            self.jobs[job["id"]] = job
+            self.changed.notify()
+        self.logger.log_info(f"📥 Queued job {job['id']}: steps={job['steps']} apps={job['apps']}")
+        return self.status(job["id"])
+
+    def status(self, job_id):
+        """Returns a copy of a job record, or None for an unknown job."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def list_jobs(self):
+        """Returns all job records without their per-app results, oldest first."""
+        with self.lock:
+            return [{key: value for key, value in job.items() if key != "results"} for job in self.jobs.values()]
+
+    def health(self):
+        """Returns queue depth, job counts by status and uptime."""
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+            queued = len(self.pending)
+        return {"status": "ok", "queued": queued, "jobs": counts,
+                "max_concurrent_jobs": self.max_concurrent_jobs, "uptime": round(time.time() - self.started_at, 1)}
+
+    def _work(self):
+        while True:
+            with self.changed:
+                job_id = self._next_job()
+                while job_id is None and not self._stopping:
+                    self.changed.wait()
+                    job_id = self._next_job()
+                if self._stopping:
+                    return
+                self.pending.remove(job_id)
+                job = self.jobs[job_id]
+                self.running_apps.update(job["apps"])
+                job["status"] = "running"
+                job["started_at"] = time.time()
+            self._run_job(job)
+
+    def _next_job(self):
+        """
+        Returns the oldest queued job whose apps are idle, or None. A job is not
+        started ahead of an older queued job for one of its apps. Called with
+        the lock held.
+        """
+        blocked = set(self.running_apps)
+        for job_id in self.pending:
+            apps = self.jobs[job_id]["apps"]
+            if blocked.isdisjoint(apps):
+                return job_id
+            blocked.update(apps)
+        return None
+
+    def _run_job(self, job):
+        job_id = job["id"]
+        self.logger.log_info(f"🚀 Starting job {job_id}")
+
+        results, error = None, None
+        try:
+            orchestrator = self.orchestrator.for_job(force=job["force"])
+            results = orchestrator.execute_for_apps(
+                job["steps"], job["apps"], max_parallel_apps=self.max_parallel_apps,
+                parallel_steps=job["parallel"], max_workers=job["max_workers"],
+            )
+        except Exception as e:
+            error = str(e)
+            self.logger.log_error(f"❌ Job {job_id} raised: {e}")
+
+        succeeded = error is None and all(result["status"] == "success" for result in results.values())
+        with self.changed:
+            job["results"] = results
+            job["error"] = error
+            job["status"] = "succeeded" if succeeded else "failed"
+            job["finished_at"] = time.time()
+            self.running_apps.difference_update(job["apps"])
+            self.changed.notify_all()
+            self._evict_finished_jobs()
+        self.logger.log_info(f"{'✅' if succeeded else '❌'} Job {job_id} {job['status']} "
+                             f"in {job['finished_at'] - job['started_at']:.1f}s")
+
+    def _evict_finished_jobs(self):
+        """Drops the oldest finished jobs beyond `max_finished_jobs`. Called with the lock held."""
+        finished = [job_id for job_id, job in self.jobs.items() if job["finished_at"] is not None]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
+
+
+class DaemonRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON API of the daemon:
+    `POST /jobs` submits a job, `GET /jobs` lists jobs, `GET /jobs/<id>`
+    returns one job with its results, and `GET /health` reports queue state.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        daemon = self.server.deployment_daemon
+        if self.path == "/health":
+            self._send_json(200, daemon.health())
+        elif self.path == "/jobs":
+            self._send_json(200, {"jobs": daemon.list_jobs()})
+        elif self.path.startswith("/jobs/"):
+            job = daemon.status(self.path[len("/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "unknown job"})
+            else:
+                self._send_json(200, job)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise ValueError(f"expected a JSON object, got {type(request).__name__}")
+            job = self.server.deployment_daemon.submit(
+                request.get("steps"), request.get("apps"), parallel=request.get("parallel", False),
+                max_workers=request.get("max_workers", 4), force=request.get("force", False),
+            )
+        except queue.Full:
+            self._send_json(503, {"error": "job queue is full"})
+        except (ValueError, TypeError) as e:
+            self._send_json(400, {"error": str(e)})
+        else:
+            self._send_json(202, job)
+
+
+def serve(daemon, host="127.0.0.1", port=DEFAULT_PORT):
+    """Creates the daemon's HTTP server (not yet serving); `port=0` picks a free port."""
+    server = ThreadingHTTPServer((host, port), DaemonRequestHandler)
+    server.daemon_threads = True
+    server.deployment_daemon = daemon
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deployment Automation daemon: runs deployment jobs submitted "
+                                                 "with deploy_client.py in one long-lived process")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (local only by default)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-concurrent-jobs", type=int, default=2)
+    parser.add_argument("--max-queued-jobs", type=int, default=100)
+    parser.add_argument("--max-parallel-apps", type=int, default=4,
+                        help="Maximum number of apps deployed concurrently within one job")
+    parser.add_argument("--max-finished-jobs", type=int, default=1000,
+                        help="Finished jobs kept for status queries; older ones are forgotten")
+    parser.add_argument("--env", help="Apply the config/<name>.<env>.json overlays (default: DEPLOY_ENV)")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text")
+    parser.add_argument("--log-file", help="Also write logs to this file (rotated at 10 MB)")
+    args = parser.parse_args()
+
+    from deployment_logger import DeploymentLogger
+    from deployment_orchestrator import DeploymentOrchestrator
+    from ssh_pool import DEFAULT_POOL
+
+    logger = DeploymentLogger(json_format=args.log_format == "json", log_file=args.log_file, use_queue=True)
+    orchestrator = DeploymentOrchestrator(logger, environment=args.env)
+    daemon = DeploymentDaemon(orchestrator, logger, max_concurrent_jobs=args.max_concurrent_jobs,
+                              max_queued_jobs=args.max_queued_jobs, max_parallel_apps=args.max_parallel_apps,
+                              max_finished_jobs=args.max_finished_jobs)
+    daemon.start()
+    server = serve(daemon, args.host, args.port)
+    logger.log_info(f"🛰️ Deployment daemon listening on http://{args.host}:{server.server_address[1]}")
+
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.log_info("🛑 Shutting down, waiting for running jobs...")
+    finally:
+        server.server_close()
+        daemon.stop()
+        DEFAULT_POOL.close_all()
+        logger.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+import copy
+import hashlib
+import json
+import os
+import string
+import threading
+
+CONFIG_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "config"))
+
+# Placeholders a parameter value may contain; they are filled in per app
+TEMPLATE_FIELDS = {"app"}
+
+# Parameters read by several steps, with the types the steps expect
+PARAMETER_TYPES = {
+    "batch_size": int, "cache_max_mb": int, "canary_count": int, "chunk_size": int, "command_timeout": (int, float),
+    "compression_level": int, "concurrency": int, "http_cache_ttl": (int, float), "max_concurrency": int,
+    "max_failure_ratio": (int, float), "max_in_flight": int, "multipart_threshold": int, "part_size": int,
+    "retry_count": int, "ssh_port": int, "window_size": int, "workers": int, "fallback_to_scp": bool,
+    "incremental": bool,
+}
+
+# Options of the shared HTTP session (http_session.PooledSession) in the `http` section
+HTTP_OPTION_TYPES = {
+    "pool_connections": int, "pool_maxsize": int, "retries": int, "backoff_factor": (int, float),
+    "status_forcelist": list, "timeout": (int, float),
+}
+
+_lock = threading.Lock()
+_files = {}  # path -> (size, mtime_ns, sha256, parsed JSON)
+_compiled = {}  # ((path, sha256), ...) -> StepParameters
+
+
+class ConfigError(ValueError):
+    """A configuration file is malformed or does not match its schema."""
+
+
+class Template(tuple):
+    """A compiled parameter value: the literal text between its `{app}` placeholders."""
+
+
+def read_json(path):
+    """
+    Returns (parsed JSON, SHA-256) of a file. The file is only re-read when
+    its size or mtime changed, and only re-parsed when its content did. The
+    parsed value is shared between callers and must not be modified.
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    with _lock:
+        cached = _files.get(path)
+    if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+        return cached[3], cached[2]
+
+    with open(path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if cached is not None and cached[2] == digest:
+        value = cached[3]
+    else:
+        try:
+            value = json.loads(content)
+        except ValueError as e:
+            raise ConfigError(f"{path}: invalid JSON: {e}") from e
+    with _lock:
+        _files[path] = (stat.st_size, stat.st_mtime_ns, digest, value)
+    return value, digest
+
+
+def config_paths(name, environment=None, config_dir=None):
+    """
+    Returns the files making up configuration `name`: `<name>.json` followed by
+    the `<name>.<environment>.json` overlay when an environment is selected
+    (argument or `DEPLOY_ENV`).
+    """
+    config_dir = config_dir or CONFIG_DIR
+    environment = environment or os.environ.get("DEPLOY_ENV")
+    paths = [os.path.join(config_dir, f"{name}.json")]
+    if environment:
+        paths.append(os.path.join(config_dir, f"{name}.{environment}.json"))
+    return paths
+
+
+def merge(base, overlay):
+    """Returns `base` with `overlay` merged in; nested objects are merged, anything else is replaced."""
+    merged = dict(base)
+    for key, value in overlay.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+def _load(name, environment, config_dir):
+    """Returns (merged configuration, ((path, sha256), ...)). A missing base file raises FileNotFoundError."""
+    paths = config_paths(name, environment, config_dir)
+    merged, sources = {}, []
+    for index, path in enumerate(paths):
+        try:
+            value, digest = read_json(path)
+        except FileNotFoundError:
+            if index == 0:
+                raise
+            raise ConfigError(f"{path}: overlay for environment not found") from None
+        if not isinstance(value, dict):
+            raise ConfigError(f"{path}: expected a JSON object, got {type(value).__name__}")
+        merged = merge(merged, value) if merged else value
+        sources.append((os.path.abspath(path), digest))
+    return merged, tuple(sources)
+
+
+def validate_steps_config(config):
+    """Returns the problems of a `steps_config.json` mapping of step names to step class names."""
+    return [f"step '{step}': class name must be an identifier, got {class_name!r}"
+            for step, class_name in config.items()
+            if not isinstance(class_name, str) or not class_name.isidentifier()]
+
+
+def validate_host_groups(host_groups, where):
+    """Returns the problems of a `host_groups` parameter: an object mapping group names to lists of hosts."""
+    if not isinstance(host_groups, dict):
+        return [f"{where}: expected an object of host lists, got {type(host_groups).__name__}"]
+    return [f"{where}.{group}: expected a list of host names, got {hosts!r}"
+            for group, hosts in host_groups.items()
+            if not isinstance(hosts, list) or not all(isinstance(host, str) for host in hosts)]
+
+
+def validate_parameters(params, where):
+    errors = []
+    if not isinstance(params, dict):
+        return [f"{where}: expected an object of parameters, got {type(params).__name__}"]
+    for key, value in params.items():
+        expected = PARAMETER_TYPES.get(key)
+        if key == "host_groups":
+            errors.extend(validate_host_groups(value, f"{where}.{key}"))
+        elif expected is not None:
+            # bool is an int subclass, so `true` must not pass as a number
+            if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+                names = expected.__name__ if isinstance(expected, type) else "number"
+                errors.append(f"{where}.{key}: expected {names}, got {value!r}")
+        elif not isinstance(value, (str, int, float, bool, type(None), list)):
+            errors.append(f"{where}.{key}: unsupported value {value!r}")
+        if isinstance(value, str):
+            try:
+                compile_template(value)
+            except ValueError as e:
+                errors.append(f"{where}.{key}: {e}")
+    return errors
+
+
+def validate_http_options(options):
+    if not isinstance(options, dict):
+        return [f"http: expected an object of session options, got {type(options).__name__}"]
+    errors = []
+    for key, value in options.items():
+        expected = HTTP_OPTION_TYPES.get(key)
+        if expected is None:
+            errors.append(f"http.{key}: unknown option (expected one of {', '.join(HTTP_OPTION_TYPES)})")
+        elif not isinstance(value, expected) or isinstance(value, bool):
+            errors.append(f"http.{key}: expected {'a list' if expected is list else 'a number'}, got {value!r}")
+    return errors
+
+
+def validate_step_parameters(config):
+    """
+    Returns the problems of a `step_parameters.json`: an object of parameters
+    per step, an optional `http` object of HTTP session options and an
+    optional `apps` object of per-app overrides in the same shape as the
+    steps (`{"apps": {"<app>": {"<step>": {...}}}}`).
+    """
+    errors = []
+    for step, params in config.items():
+        if step == "http":
+            errors.extend(validate_http_options(params))
+        elif step == "apps":
+            if not isinstance(params, dict):
+                errors.append("apps: expected an object of per-app overrides")
+                continue
+            for app, steps in params.items():
+                if not isinstance(steps, dict):
+                    errors.append(f"apps.{app}: expected an object of steps")
+                    continue
+                for app_step, app_params in steps.items():
+                    errors.extend(validate_parameters(app_params, f"apps.{app}.{app_step}"))
+        else:
+            errors.extend(validate_parameters(params, step))
+    return errors
+
+
+def _validated(config, sources, validate):
+    errors = validate(config)
+    if errors:
+        files = ", ".join(path for path, _ in sources)
+        raise ConfigError(f"Invalid configuration ({files}): " + "; ".join(errors))
+    return config
+
+
+def compile_template(value):
+    """
+    Splits a parameter value around its `{app}` placeholders. Returns the
+    value itself when there is nothing to fill in, else a Template of the
+    literal segments, rendered with `app.join(template)`. Raises ValueError
+    for other placeholders or conversion/format specs, which
+    `str.format(app=...)` would fail on at run time.
+    """
+    segments, literal_text = [], ""
+    for literal, field, spec, conversion in string.Formatter().parse(value):
+        literal_text += literal
+        if field is None:
+            continue
+        if field not in TEMPLATE_FIELDS:
+            raise ValueError(f"unknown placeholder {{{field}}} in {value!r}")
+        if spec or conversion:
+            raise ValueError(f"unsupported format spec in {value!r}")
+        segments.append(literal_text)
+        literal_text = ""
+    # Without placeholders this is the value with `{{`/`}}` unescaped, as str.format returned it
+    return Template(segments + [literal_text]) if segments else literal_text
+
+
+class StepParameters:
+    """
+    Step parameters with their `{app}` templates compiled once, so getting
+    the parameters of a step for an app copies the constant values and joins
+    the template segments with the app name instead of parsing every value
+    with `str.format`. Per-app overrides from the `apps` section are applied
+    on top of the step's parameters.
+
+    `sources` holds the (path, SHA-256) of the files the parameters were
+    loaded from, or is empty for parameters built from a dict.
+    """
+
+    def __init__(self, config, sources=()):
+        self.config = config
+        self.sources = sources
+        self._compiled = {}  # (step, app with overrides or None) -> (constants, ((key, Template), ...))
+
+    def _compiled_for(self, step, app):
+        overrides = self.config.get("apps", {}).get(app, {}).get(step)
+        key = (step, app if overrides else None)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            params = {**self.config.get(step, {}), **(overrides or {})}
+            constants, templates = {}, []
+            for name, value in params.items():
+                value = compile_template(value) if isinstance(value, str) else value
+                if isinstance(value, Template):
+                    templates.append((name, value))
+                else:
+                    constants[name] = value
+            compiled = self._compiled[key] = (constants, tuple(templates))
+        return compiled
+
+    def for_app(self, step, app):
+        """Returns the parameters for `step` with `{app}` placeholders filled in."""
+        constants, templates = self._compiled_for(step, app)
+        params = dict(constants)
+        app = str(app)
+        for name, template in templates:
+            params[name] = app.join(template)
+        return params
+
+
+def load_steps_config(environment=None, config_dir=None):
+    """Returns the validated step-to-class mapping of `steps_config.json` with its environment overlay."""
+    config, sources = _load("steps_config", environment, config_dir)
+    return _validated(config, sources, validate_steps_config)
+
+
+def load_step_parameters(environment=None, config_dir=None):
+    """
+    Returns the validated, compiled StepParameters of `step_parameters.json`
+    with its environment overlay. Compiled parameters are cached by the
+    content of their files, so repeated loads only stat the files.
+    """
+    config, sources = _load("step_parameters", environment, config_dir)
+    with _lock:
+        cached = _compiled.get(sources)
+    if cached is not None:
+        return cached
+    parameters = StepParameters(_validated(config, sources, validate_step_parameters), sources)
+    with _lock:
+        # Drop parameters compiled from earlier versions of the same files
+        paths = [path for path, _ in sources]
+        for key in [key for key in _compiled if [path for path, _ in key] == paths]:
+            del _compiled[key]
+        _compiled[sources] = parameters
+    return parameters
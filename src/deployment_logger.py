@@ -1,24 +1,186 @@
+import atexit
+import contextlib
+import contextvars
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+LOGGER_NAME = "DeploymentLogger"
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Fields (run_id, app, step, host) describing what the current thread is working on
+_log_context = contextvars.ContextVar("deployment_log_context", default={})
+
+DEFAULT_OPTIONS = {
+    "json_format": False,
+    "log_file": None,
+    "use_queue": False,
+    "console": True,
+    "level": logging.INFO,
+}
+
+_setup_lock = threading.Lock()
+_setup = {"options": None, "handlers": [], "listener": None}
+
+
+@contextlib.contextmanager
+def log_context(**fields):
+    """Adds `fields` to every record logged by this thread inside the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def current_log_context():
+    """Returns the fields bound with `log_context`, e.g. to carry them into a worker thread."""
+    return dict(_log_context.get())
+
+
+class ContextFilter(logging.Filter):
+    """Copies the bound context onto each record in the calling thread, before it is queued."""
+
+    def filter(self, record):
+        record.context = _log_context.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, message, the bound context and any per-call fields."""
+
+    def format(self, record):
+        entry = {"time": self.formatTime(record), "level": record.levelname, "message": record.getMessage()}
+        entry.update(getattr(record, "context", {}))
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for the listener thread. Unlike the stock QueueHandler it
+    neither formats nor copies the record in the caller; only the message
+    arguments are merged, so mutable arguments cannot change before output.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def configure_logging(json_format=None, log_file=None, use_queue=None, console=None, level=None):
+    """
+    Installs the handlers of the deployment logger. Options left out keep their
+    current value (or the default on first use), and calling it again with the
+    same options is a no-op, so creating many DeploymentLogger instances never
+    duplicates output.
+
+    `json_format` writes structured records, `log_file` adds a rotating file,
+    and `use_queue` hands records to a background thread so that logging never
+    blocks a deployment on console or disk I/O.
+    """
+    with _setup_lock:
+        options = {"json_format": json_format, "log_file": log_file, "use_queue": use_queue,
+                   "console": console, "level": level}
+        merged = dict(_setup["options"] or DEFAULT_OPTIONS)
+        merged.update({key: value for key, value in options.items() if value is not None})
+
+        logger = logging.getLogger(LOGGER_NAME)
+        if merged == _setup["options"]:
+            return logger
+        _teardown(logger)
+
+        formatter = JsonFormatter() if merged["json_format"] else logging.Formatter(TEXT_FORMAT)
+        handlers = []
+        if merged["console"]:
+            handlers.append(logging.StreamHandler())
+        if merged["log_file"]:
+            os.makedirs(os.path.dirname(os.path.abspath(merged["log_file"])), exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(
+                merged["log_file"], maxBytes=10 * 1024 * 1024, backupCount=5, encoding="utf-8"))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        if merged["use_queue"]:
+            records = queue.SimpleQueue()
+            listener = logging.handlers.QueueListener(records, *handlers, respect_handler_level=True)
+            listener.start()
+            _setup["listener"] = listener
+            logger.addHandler(RecordQueueHandler(records))
+        else:
+            for handler in handlers:
+                logger.addHandler(handler)
+
+        logger.addFilter(_context_filter)
+        logger.setLevel(merged["level"])
+        _setup["options"] = merged
+        _setup["handlers"] = handlers
+        return logger
+
+
+def shutdown_logging():
+    """Writes out queued records and closes the handlers; the next logger reconfigures them."""
+    with _setup_lock:
+        _teardown(logging.getLogger(LOGGER_NAME))
+
+
+def _teardown(logger):
+    if _setup["listener"] is not None:
+        _setup["listener"].stop()
+        _setup["listener"] = None
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    for handler in _setup["handlers"]:
+        handler.close()
+    _setup["handlers"] = []
+    _setup["options"] = None
+
+
+_context_filter = ContextFilter()
+atexit.register(shutdown_logging)
+
 
 class DeploymentLogger:
-    def __init__(self):
+    """
+    Logger shared by every component of a deployment run.
+
+    Messages take %-style arguments that are only formatted if the record is
+    emitted, and keyword arguments become structured fields (e.g. duration) in
+    JSON output. See `configure_logging` for the options.
+    """
+
+    def __init__(self, json_format=None, log_file=None, use_queue=None, console=None, level=None):
         """Initialize the logger with basic configuration"""
-        self.logger = logging.getLogger("DeploymentLogger")
-        self.logger.setLevel(logging.INFO)
+        self.logger = configure_logging(json_format=json_format, log_file=log_file, use_queue=use_queue,
+                                        console=console, level=level)
 
-        # Console handler
-        handler = logging.StreamHandler()
-        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-        self.logger.addHandler(handler)
+    def _log(self, level, message, args, fields):
+        # Checked first so that suppressed calls cost no more than this comparison
+        if self.logger.isEnabledFor(level):
+            self.logger.log(level, message, *args, extra={"fields": fields} if fields else None)
 
-    def log_info(self, message):
+    def log_info(self, message, *args, **fields):
         """Log general info messages."""
-        self.logger.info(message)
+        self._log(logging.INFO, message, args, fields)
 
-    def log_error(self, message):
+    def log_warning(self, message, *args, **fields):
+        """Log problems that do not stop the deployment."""
+        self._log(logging.WARNING, message, args, fields)
+
+    def log_error(self, message, *args, **fields):
         """Log error messages before raising exceptions."""
-        self.logger.error(message)
+        self._log(logging.ERROR, message, args, fields)
 
-    def log_debug(self, message):
+    def log_debug(self, message, *args, **fields):
         """Log debug information (optional for development)."""
-        self.logger.debug(message)
+        self._log(logging.DEBUG, message, args, fields)
+
+    def shutdown(self):
+        """Flushes queued records; call before exiting when `use_queue` is set."""
+        shutdown_logging()
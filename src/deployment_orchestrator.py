@@ -1,65 +1,360 @@
-import json
+import contextlib
+import copy
 import os
-from deployment_steps import STEP_REGISTRY, load_steps
-from deployment_logger import DeploymentLogger
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from deployment_config import ConfigError, StepParameters, load_step_parameters, load_steps_config
+from deployment_steps import STEP_REGISTRY, StepContext, load_steps
+from deployment_logger import DeploymentLogger, log_context
+from step_scheduler import StepScheduler
+from run_state import RunStateStore
+from instrumentation import ALL_APPS, RunMetrics
+
+
+def loaded_stats(module_name, function_name):
+    """
+    Returns a stats module's counters, or None if no step imported it. The
+    caches and the uploader pull in `requests`, so they are only loaded by the
+    steps that use them rather than at startup.
+    """
+    module = sys.modules.get(module_name)
+    return getattr(module, function_name)() if module is not None else None
+
 
 class DeploymentOrchestrator:
-    def __init__(self, logger):
+    def __init__(self, logger, run_state_dir=".deploy_cache/run-state", force=False, environment=None):
         self.logger = logger
+        # Selects the `config/<name>.<environment>.json` overlays (default: `DEPLOY_ENV`)
+        self.environment = environment
+        # Steps whose inputs match their last successful run are skipped unless `force` is set
+        self.run_state = RunStateStore(run_state_dir, logger) if run_state_dir else None
+        self.force = force
+        # Tags every log record of this run so that interleaved output of concurrent runs can be told apart
+        self.run_id = uuid.uuid4().hex[:12]
+        # Per-step wall/CPU time, peak RSS and network usage of this run (see instrumentation.py)
+        self.metrics = RunMetrics(self.run_id)
+        # Set by enable_profiling(); None keeps profiling code out of the step path entirely
+        self.profiler = None
         self.step_config = self.load_step_config()
-        self.step_parameters = self.load_step_parameters()
-        load_steps(logger)
+        self.parameters = self.load_step_parameters()
+        self.last_timeline = None
+        self.last_drift_matrix = None
+        load_steps(logger, self.step_config)
 
-    def load_step_config(self):
-        """Loads step-to-class mapping from `config/steps_config.json`."""
-        project_root = os.path.abspath(os.path.dirname(__file__))  # Fix the path to avoid `src/config`
-        config_path = os.path.join(project_root, "..", "config", "steps_config.json")
+    @property
+    def step_parameters(self):
+        """The step parameters as loaded from the configuration (read-only)."""
+        return self.parameters.config
 
-        if not os.path.exists(config_path):
-            self.logger.log_error(f"❌ Configuration file {config_path} not found.")
-            return {}
+    @step_parameters.setter
+    def step_parameters(self, config):
+        self.parameters = StepParameters(config)
 
-        self.logger.log_info(f"✅ Loading step configurations from {config_path}")
+    def for_job(self, force=False):
+        """
+        Returns an orchestrator for one job of a long-running process: it shares
+        this instance's loaded configuration and step registry but has its own
+        run-state bookkeeping, results and `force` setting. Step parameters
+        loaded from files are refreshed if the files changed since.
+        """
+        job = copy.copy(self)
+        if self.parameters.sources:
+            job.parameters = self.load_step_parameters()
+        job.force = force
+        job.run_id = uuid.uuid4().hex[:12]
+        job.metrics = RunMetrics(job.run_id)
+        job.run_state = RunStateStore(self.run_state.state_dir, self.logger) if self.run_state is not None else None
+        job.last_timeline = None
+        job.last_drift_matrix = None
+        return job
 
-        with open(config_path, "r") as f:
-            return json.load(f)
+    def load_step_config(self):
+        """Loads step-to-class mapping from `config/steps_config.json` (see deployment_config.py)."""
+        try:
+            config = load_steps_config(self.environment)
+        except FileNotFoundError as e:
+            self.logger.log_error(f"❌ Configuration file {e.filename} not found.")
+            return {}
+        except ConfigError as e:
+            self.logger.log_error(f"❌ {e}")
+            raise
+
+        self.logger.log_info(f"✅ Loaded step configurations for {len(config)} steps")
+        return config
 
     def load_step_parameters(self):
-        """Loads step-specific parameters from `config/step_parameters.json`."""
-        project_root = os.path.abspath(os.path.dirname(__file__))  # Fix the path
-        parameters_path = os.path.join(project_root, "..", "config", "step_parameters.json")
+        """Loads compiled step parameters from `config/step_parameters.json` (see deployment_config.py)."""
+        try:
+            parameters = load_step_parameters(self.environment)
+        except FileNotFoundError as e:
+            self.logger.log_error(f"❌ Step parameters file {e.filename} not found.")
+            return StepParameters({})
+        except ConfigError as e:
+            self.logger.log_error(f"❌ {e}")
+            raise
 
-        if not os.path.exists(parameters_path):
-            self.logger.log_error(f"❌ Step parameters file {parameters_path} not found.")
-            return {}
+        self.logger.log_info(f"✅ Loaded step parameters from {', '.join(path for path, _ in parameters.sources)}")
+        return parameters
 
-        self.logger.log_info(f"✅ Loading step parameters from {parameters_path}")
+    def _format_params(self, step, app):
+        """Returns the parameters for `step` with `{app}` placeholders filled in."""
+        # Debug log to check step parameters
+        self.logger.log_debug("🔹 Parameters for %s: %s", step, self.parameters.config.get(step, {}))
 
-        with open(parameters_path, "r") as f:
-            return json.load(f)
+        return self.parameters.for_app(step, app)
 
-    def execute_steps(self, steps, app=None):
-        executed_steps = []
-        self.logger.log_info(f"🚀 Executing deployment steps: {steps}")
+    def _create_step(self, step):
+        step_instance = STEP_REGISTRY[step](self.logger)
+        step_instance.http_options = self.parameters.config.get("http", {})
+        return step_instance
 
+    def _run_step(self, step, app, context):
+        """Runs a single registered step. Returns False if the step reported a failure."""
+        with log_context(run_id=self.run_id, app=app, step=step), self.metrics.measure(app, step) as outcome:
+            step_instance = self._create_step(step)
+            step_instance.context = step_context = StepContext(context)
+            if step_instance.skip_when_in_sync and context.get("in_sync"):
+                self.logger.log_info(f"⏭️ Skipping step {step}: {app} is already in sync.")
+                outcome["status"] = "skipped"
+                return True
+            formatted_params = self._format_params(step, app)
+
+            fingerprint = None
+            if self.run_state is not None and step_instance.fingerprint_context is not None:
+                fingerprint = self.run_state.fingerprint(step, formatted_params, context,
+                                                         step_instance.fingerprint_context,
+                                                         step_instance.fingerprint_inputs(app, formatted_params))
+                record = self.run_state.unchanged(app, step, fingerprint) if fingerprint and not self.force else None
+                if record is not None:
+                    context.update(record["outputs"])
+                    self.run_state.mark_skipped(app, step, record)
+                    self.logger.log_info(f"⏭️ Skipping step {step}: inputs unchanged since the last successful run "
+                                         f"(saves ~{record['duration']}s).")
+                    outcome["status"] = "skipped"
+                    return True
+
+            # Execute step with dynamically loaded parameters
+            self.logger.log_info(f"🟢 Running step: {step} -> {step_instance.__class__.__name__}")
+            start = time.perf_counter()
+            profiling = self.profiler.profile(app, step) if self.profiler is not None else contextlib.nullcontext()
+            with profiling:
+                succeeded = step_instance.execute(app, **formatted_params) is not False
+            duration = time.perf_counter() - start
+            self.logger.log_info("⏱️ Step %s %s in %.2fs", step, "finished" if succeeded else "failed", duration,
+                                 duration=round(duration, 3))
+            if succeeded and fingerprint:
+                self.run_state.record(app, step, fingerprint, step_context.outputs(), duration)
+            outcome["status"] = "success" if succeeded else "failed"
+            return succeeded
+
+    def known_steps(self, steps):
+        """Returns the steps in `steps` that are present in the step registry."""
+        return [step for step in steps if step in STEP_REGISTRY]
+
+    def step_dependencies(self, steps):
+        """
+        Maps each registered step in `steps` to the steps it declares in
+        `depends_on`. When compare is part of the run, steps marked
+        `skip_when_in_sync` also depend on it, so they only check `in_sync`
+        after compare has set it.
+        """
+        dependencies = {}
         for step in steps:
             if step in STEP_REGISTRY:
                 step_instance = STEP_REGISTRY[step](self.logger)
+                depends_on = tuple(step_instance.depends_on)
+                if step_instance.skip_when_in_sync and step != "compare" and "compare" in steps \
+                        and "compare" not in depends_on:
+                    depends_on += ("compare",)
+                dependencies[step] = depends_on
+        return dependencies
+
+    def execute_steps(self, steps, app=None, context=None):
+        with log_context(run_id=self.run_id, app=app):
+            executed_steps = []
+            context = dict(context or {}, app=app)
+            self.logger.log_info(f"🚀 Executing deployment steps: {steps}")
+
+            for step in steps:
+                if step in STEP_REGISTRY:
+                    if not self._run_step(step, app, context):
+                        self.logger.log_error(f"❌ Step '{step}' failed, stopping execution.")
+                        break
+
+                    executed_steps.append(step)
+
+            self.logger.log_info(f"✅ Steps executed: {executed_steps}")
+            return executed_steps
+
+    def execute_steps_parallel(self, steps, app=None, max_workers=4, context=None):
+        """
+        Runs `steps` as a dependency graph, executing independent steps concurrently
+        on at most `max_workers` threads. The timeline of the run is kept in
+        `self.last_timeline` and logged when the run finishes.
+        """
+        with log_context(run_id=self.run_id, app=app):
+            self.logger.log_info(f"🚀 Executing deployment steps in parallel (max {max_workers} workers): {steps}")
+
+            known_steps = self.known_steps(steps)
+            context = dict(context or {}, app=app)
+            scheduler = StepScheduler(self.logger, max_workers=max_workers)
+
+            try:
+                executed_steps, _ = scheduler.run(
+                    known_steps, self.step_dependencies(known_steps), lambda step: self._run_step(step, app, context)
+                )
+            finally:
+                self.last_timeline = scheduler.timeline
+                if self.last_timeline is not None:
+                    for line in self.last_timeline.format_report():
+                        self.logger.log_info(line)
+
+            self.logger.log_info(f"✅ Steps executed: {executed_steps}")
+            return executed_steps
+
+    def execute_for_apps(self, steps, apps, max_parallel_apps=4, parallel_steps=False, max_workers=4):
+        """
+        Runs the step pipeline for every app in `apps` within this process, at most
+        `max_parallel_apps` apps at a time. The step registry and parsed step
+        parameters are shared by all apps.
+
+        When the compare step is requested, the drift matrix for all apps is
+        built once up front and each app's compare step reuses its row.
+
+        Returns a dict mapping each app to its result: status ("success" or
+        "failed"), executed steps, duration in seconds and an error message if a
+        step raised.
+        """
+        apps = list(dict.fromkeys(apps))
+        known_steps = self.known_steps(steps)
+        self.logger.log_info(f"🚀 Deploying {len(apps)} apps (max {max_parallel_apps} concurrently): {apps}")
+        drift = self.check_drift(apps) if "compare" in known_steps else {}
+
+        def run_app(app):
+            start = time.perf_counter()
+            error = None
+            executed_steps = []
+            context = {"drift": drift[app]} if app in drift else None
+            try:
+                if parallel_steps:
+                    executed_steps = self.execute_steps_parallel(steps, app, max_workers=max_workers, context=context)
+                else:
+                    executed_steps = self.execute_steps(steps, app, context=context)
+            except Exception as e:
+                error = str(e)
+                self.logger.log_error(f"❌ [{app}] Deployment raised: {e}")
+
+            succeeded = error is None and len(executed_steps) == len(known_steps)
+            return {
+                "status": "success" if succeeded else "failed",
+                "executed_steps": executed_steps,
+                "duration": round(time.perf_counter() - start, 3),
+                "error": error,
+            }
+
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel_apps), thread_name_prefix="app") as executor:
+            results = dict(zip(apps, executor.map(run_app, apps)))
+
+        self.log_app_summary(results)
+        return results
+
+    def check_drift(self, apps):
+        """
+        Runs the compare step's drift check for all `apps` concurrently. Returns
+        the matrix rows by app (kept in `self.last_drift_matrix`); an app whose
+        check cannot run is compared again by its own compare step.
+        """
+        step_instance = self._create_step("compare")
+        if not hasattr(step_instance, "check_apps"):
+            return {}
+        try:
+            with log_context(run_id=self.run_id, step="compare"), self.metrics.measure(ALL_APPS, "compare") as outcome:
+                self.last_drift_matrix = step_instance.check_apps(
+                    {app: self._format_params("compare", app) for app in apps})
+                outcome["status"] = "success"
+        except Exception as e:
+            self.logger.log_error(f"❌ Batch version drift check failed: {e}")
+            return {}
+        return self.last_drift_matrix["apps"]
+
+    def log_cache_summary(self):
+        """Logs artifact and HTTP cache hits, misses and savings for this process."""
+        stats = loaded_stats("artifact_cache", "cache_stats")
+        if stats and (stats["hits"] or stats["misses"]):
+            self.logger.log_info(
+                f"♻️ Artifact cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['bytes_saved'] / (1024 * 1024):.1f} MB saved, {stats['evictions']} evictions"
+            )
+
+        stats = loaded_stats("http_cache", "http_cache_stats")
+        if stats and (stats["hits"] or stats["revalidated"] or stats["misses"]):
+            self.logger.log_info(
+                f"♻️ API cache: {stats['hits']} fresh hits, {stats['revalidated']} revalidated (304), "
+                f"{stats['misses']} misses, {stats['rate_limit_saved']} requests kept off the rate limit"
+            )
+
+    def log_upload_summary(self):
+        """Logs how many artifact bytes were uploaded and how many were skipped by checksum deploys."""
+        stats = loaded_stats("jfrog_uploader", "upload_stats")
+        if stats and stats["uploads"]:
+            self.logger.log_info(
+                f"📤 Artifact uploads: {stats['uploads']} ({stats['checksum_deploys']} by checksum), "
+                f"{stats['bytes_uploaded'] / (1024 * 1024):.1f} MB sent, "
+                f"{stats['bytes_skipped'] / (1024 * 1024):.1f} MB skipped"
+            )
+
+    def log_skip_summary(self):
+        """Logs the steps skipped because their inputs were unchanged and the time that saved."""
+        if self.run_state is None:
+            return
+        summary = self.run_state.summary()
+        if summary["skipped"]:
+            steps = ", ".join(f"{app}:{step}" for app, step in summary["skipped"])
+            self.logger.log_info(f"⏭️ Skipped {len(summary['skipped'])} unchanged steps ({steps}), "
+                                 f"saving ~{summary['seconds_saved']}s. Use --force to run them anyway.")
 
-                # Load step parameters dynamically
-                step_params = self.step_parameters.get(step, {})
+    def enable_profiling(self, output_dir=None, interval=0.005):
+        """
+        Profiles every step executed from now on (see step_profiler.py). Files go
+        to `output_dir`, by default `.deploy_cache/profiles/<run id>`; call
+        `self.profiler.finish()` after the run to write the merged stacks.
+        """
+        from step_profiler import StepProfiler
 
-                # Debug log to check step parameters
-                self.logger.log_debug(f"🔹 Parameters for {step}: {step_params}")
+        output_dir = output_dir or os.path.join(".deploy_cache", "profiles", self.run_id)
+        self.profiler = StepProfiler(output_dir, self.logger, interval=interval)
+        self.logger.log_info(f"🔬 Profiling steps into {output_dir}")
+        return self.profiler
 
-                formatted_params = {key: value.format(app=app) if isinstance(value, str) else value
-                                    for key, value in step_params.items()}
+    def log_metrics_summary(self):
+        """Logs wall time, CPU time and network usage of every step measured in this run."""
+        for line in self.metrics.format_report():
+            self.logger.log_info(line)
 
-                # Execute step with dynamically loaded parameters
-                self.logger.log_info(f"🟢 Running step: {step} -> {step_instance.__class__.__name__}")
-                step_instance.execute(app, **formatted_params)
+    def write_run_report(self, json_path=None, prometheus_path=None):
+        """Writes the run's metrics as a JSON report and/or a Prometheus textfile-collector file."""
+        if json_path:
+            self.metrics.write_json(json_path)
+            self.logger.log_info(f"📊 Run report written to {json_path}")
+        if prometheus_path:
+            self.metrics.write_prometheus(prometheus_path)
+            self.logger.log_info(f"📊 Prometheus metrics written to {prometheus_path}")
 
-                executed_steps.append(step)
+    def log_app_summary(self, results):
+        """Logs one line per app and an overall success count."""
+        self.logger.log_info("📋 Deployment summary:")
+        for app, result in results.items():
+            icon = "✅" if result["status"] == "success" else "❌"
+            details = f" ({result['error']})" if result["error"] else ""
+            self.logger.log_info(
+                f"   {icon} {app}: {result['status']} in {result['duration']}s, "
+                f"steps={result['executed_steps']}{details}"
+            )
 
-        self.logger.log_info(f"✅ Steps executed: {executed_steps}")
-        return executed_steps
+        succeeded = sum(1 for result in results.values() if result["status"] == "success")
+        self.logger.log_info(f"📋 {succeeded}/{len(results)} apps deployed successfully.")
+        self.log_cache_summary()
+        self.log_upload_summary()
+        self.log_skip_summary()
@@ -1,6 +1,8 @@
-import json
-import os
 import importlib
+import importlib.util
+import threading
+from collections.abc import MutableMapping
+from deployment_config import load_steps_config
 from deployment_logger import DeploymentLogger
 
 # Global registry for dynamically loaded steps
@@ -8,42 +10,145 @@ STEP_REGISTRY = {}
 
 class DeploymentStep:
     """Base class for all deployment steps."""
+
+    # Names of steps that must complete before this one when run as a DAG.
+    # Dependencies that are not part of the requested run are ignored.
+    depends_on = ()
+
+    # Skipped (and counted as done) once the compare step finds the app in sync everywhere
+    skip_when_in_sync = False
+
+    # Context values (besides the step parameters) that fully determine the step's result.
+    # Steps that set this are skipped when a previous run succeeded with the same inputs;
+    # None means the step always runs (e.g. it reads remote state).
+    fingerprint_context = None
+
+    def fingerprint_inputs(self, app, params):
+        """
+        Returns further inputs of the step that are resolved outside its
+        parameters and context (e.g. from environment variables); they are
+        fingerprinted with them.
+        """
+        return {}
+
+    # Options of the shared HTTP session from the `http` section of `step_parameters.json`.
+    # Set by the orchestrator; they take effect when the session is first created.
+    http_options = {}
+
     def __init__(self, logger):
         if logger is None:
             raise ValueError("Logger instance must be provided")  # Prevents missing logger
         self.logger = logger
+        # Per-app run state shared between the steps of one pipeline run (e.g. commit_sha, package_path).
+        # The orchestrator replaces this with the run's dict before calling execute().
+        self.context = {}
 
     def execute(self, app=None, target=None):
         raise NotImplementedError("Each step must implement an execute method.")
 
+    def http_session(self):
+        """Returns the process-wide pooled HTTP session, created with `http_options` by the first caller."""
+        from http_session import get_session  # Imports `requests`, which only network steps need
+        return get_session(**self.http_options)
+
     @classmethod
     def register(cls, name, logger):
         """Registers a deployment step in the global registry."""
         STEP_REGISTRY[name] = lambda logger=logger: cls(logger)  # ✅ Ensures correct logger!
-        logger.log_debug(f"🔹 Step Registered: {name} -> {cls.__name__}")
+        logger.log_debug("🔹 Step Registered: %s -> %s", name, cls.__name__)
 
-# Load steps from configuration file in `config/`
-def load_steps(logger):
-    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-    config_path = os.path.join(project_root, "config", "steps_config.json")
+class StepContext(MutableMapping):
+    """
+    One step's view of the run's shared context. Reads and writes go to the
+    shared dict; the keys the step set are kept in `written`, so the step's
+    outputs are known even while sibling steps update the context in parallel.
+    """
 
-    if not os.path.exists(config_path):
-        logger.log_error(f"❌ Configuration file {config_path} not found.")
-        return
+    def __init__(self, shared):
+        self.shared = shared
+        self.written = set()
 
-    with open(config_path, "r") as f:
-        step_mapping = json.load(f)
+    def __getitem__(self, key):
+        return self.shared[key]
 
-    for step_name, class_name in step_mapping.items():
+    def __setitem__(self, key, value):
+        self.shared[key] = value
+        self.written.add(key)
+
+    def __delitem__(self, key):
+        del self.shared[key]
+        self.written.discard(key)
+
+    def __iter__(self):
+        return iter(self.shared)
+
+    def __len__(self):
+        return len(self.shared)
+
+    def outputs(self):
+        """Returns the values this step set that are still in the context."""
+        return {key: self.shared[key] for key in self.written if key in self.shared}
+
+
+class LazyStep:
+    """
+    Registry entry that imports a step's module the first time the step is
+    created, so a run only pays for the dependencies of the steps it uses.
+    """
+
+    def __init__(self, module_name, class_name, logger):
+        self.module_name = module_name
+        self.class_name = class_name
+        self.logger = logger
+        self.step_class = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        with self.lock:
+            if self.step_class is None:
+                try:
+                    module = importlib.import_module(self.module_name)
+                    self.step_class = getattr(module, self.class_name)
+                except Exception as e:
+                    self.logger.log_error(f"❌ Failed to load step class {self.class_name}: {str(e)}")
+                    raise
+                self.logger.log_debug("✅ Step Imported: %s.%s", self.module_name, self.class_name)
+        return self.step_class
+
+    def __call__(self, logger=None):
+        return self.load()(logger or self.logger)  # ✅ Ensures correct logger!
+
+
+def find_step_module(class_name):
+    """Returns the importable name of a step's module, or None if it does not exist."""
+    # `steps` when `src/` is on the path (deploy.py, tests); `src.steps` from the project root
+    for package in ("steps", "src.steps"):
+        module_name = f"{package}.{class_name.lower()}"
         try:
-            module = importlib.import_module(f"src.steps.{class_name.lower()}")
-            step_class = getattr(module, class_name)
-            STEP_REGISTRY[step_name] = lambda logger=logger, step_class=step_class: step_class(logger)  # ✅ Ensures correct logger!
+            if importlib.util.find_spec(module_name) is not None:
+                return module_name
+        except ModuleNotFoundError:
+            continue
+    return None
 
-            logger.log_debug(f"✅ Step Loaded: {step_name} -> {class_name}")
-        except Exception as e:
-            logger.log_error(f"❌ Failed to load step '{step_name}': {str(e)}")
 
-    logger.log_info(f"✅ Loaded steps: {list(STEP_REGISTRY.keys())}")
+# Load steps from configuration file in `config/`
+def load_steps(logger, step_mapping=None):
+    """Registers the steps of `step_mapping`, by default the one in `config/steps_config.json`."""
+    if step_mapping is None:
+        try:
+            step_mapping = load_steps_config()
+        except FileNotFoundError as e:
+            logger.log_error(f"❌ Configuration file {e.filename} not found.")
+            return
 
+    for step_name, class_name in step_mapping.items():
+        module_name = find_step_module(class_name)
+        if module_name is None:
+            logger.log_error(f"❌ Failed to load step '{step_name}': no module for {class_name}")
+            continue
+        # The module itself is imported when the step is first used
+        STEP_REGISTRY[step_name] = LazyStep(module_name, class_name, logger)
+        logger.log_debug("✅ Step Loaded: %s -> %s", step_name, class_name)
 
+    logger.log_info(f"✅ Loaded steps: {list(STEP_REGISTRY.keys())}")
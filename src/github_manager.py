@@ -3,41 +3,72 @@ import os
 import requests
 import zipfile  
 import io
+import tempfile
+import time
+from urllib.parse import quote
 from deployment_logger import DeploymentLogger  # Import the logger
 
 # Add `src/` to Python's module search path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
+class _RangeMismatch(Exception):
+    """A 206 response whose Content-Range does not continue the partial file."""
+
+
 class GitHubRepositoryManager:
     """
     Manages interactions with a GitHub repository.
     """
 
-    def __init__(self, repo_owner, repo_name, logger: DeploymentLogger, access_token=None):
+    def __init__(self, repo_owner, repo_name, logger: DeploymentLogger, access_token=None, http_cache=None,
+                 session=None, timeout=10, branch=None, api_base=None):
         self.repo_owner = repo_owner
         self.repo_name = repo_name
         self.access_token = access_token  # ✅ Fix: Ensure access_token is a parameter
         self.logger = logger
-        self.api_url = f"https://api.github.com/repos/{repo_owner}/{repo_name}/commits"
+        # GitHub Enterprise (or a local stand-in) serves the same REST API under another base URL
+        self.api_base = (api_base or "https://api.github.com").rstrip("/")
+        self.api_url = f"{self.api_base}/repos/{repo_owner}/{repo_name}/commits"
         self.class_name = self.__class__.__name__
+        self.last_download_stats = None
+        self.http_cache = http_cache  # Optional HTTPCache for conditional API requests
+        # HTTP client: an injected (pooled) session, or the `requests` module itself
+        self.http = session or requests
+        self.timeout = timeout
+        self.branch = branch  # None follows the repository's default branch
 
+    @property
+    def latest_commit_url(self):
+        """
+        URL answering with only the newest commit: the branch ref (a few hundred
+        bytes) when a branch is set, otherwise a one-item commit list of the
+        default branch instead of the full 30-commit page.
+        """
+        if self.branch:
+            return f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}/git/ref/heads/{quote(self.branch)}"
+        return f"{self.api_url}?per_page=1"
 
     def fetch_latest_commit(self):
         """
         Fetches the latest commit hash from GitHub using the REST API.
         """
         try:
-            self.logger.log_info(f"[{self.class_name}] Fetching latest commit for {self.repo_owner}/{self.repo_name}")
+            branch = f" ({self.branch})" if self.branch else ""
+            self.logger.log_info(f"[{self.class_name}] Fetching latest commit for {self.repo_owner}/{self.repo_name}{branch}")
             
-            # Make an API request to get the latest commits
-            response = requests.get(self.api_url, timeout=10)
+            # Make an API request for the newest commit (revalidated with the ETag cache when configured)
+            if self.http_cache is not None:
+                response = self.http_cache.get(self.latest_commit_url, timeout=self.timeout, http=self.http)
+            else:
+                response = self.http.get(self.latest_commit_url, timeout=self.timeout)
             
             # Check if the response is successful (HTTP 200 OK)
             if response.status_code != 200:
                 raise Exception(f"GitHub API error: {response.status_code} - {response.text}")
             
-            # Extract the latest commit hash
-            latest_commit = response.json()[0]["sha"]
+            # Extract the latest commit hash: a ref object for a branch, a commit list otherwise
+            data = response.json()
+            latest_commit = data["object"]["sha"] if isinstance(data, dict) else data[0]["sha"]
             self.logger.log_info(f"[{self.class_name}] Latest commit: {latest_commit}")
             return latest_commit
         
@@ -49,7 +80,17 @@ class GitHubRepositoryManager:
             self.logger.log_error(f"[{self.class_name}] Unexpected error: {str(e)}")
             raise
 
-    def download_repository(self, target_directory):
+    @property
+    def archive_url(self):
+        """ZIP archive URL of the configured branch, or of the default branch when none is set."""
+        return self.archive_url_for(self.branch)
+
+    def archive_url_for(self, ref=None):
+        """ZIP archive URL of `ref` (a branch, tag or commit SHA), or of the default branch."""
+        archive_url = f"{self.api_base}/repos/{self.repo_owner}/{self.repo_name}/zipball"
+        return f"{archive_url}/{quote(ref)}" if ref else archive_url
+
+    def download_repository(self, target_directory, streaming=False, chunk_size=1024 * 1024, max_resume_attempts=3):
         """
         Downloads the GitHub repository as a ZIP archive and saves it in the target directory.
         
@@ -60,14 +101,22 @@ class GitHubRepositoryManager:
         4. Saves and extracts the ZIP file to the specified directory.
         5. Logs the progress and handles errors if they occur.
         
+        With `streaming=True` the archive is written to a temporary file in
+        `chunk_size` pieces and extracted from disk, so memory use stays bounded
+        regardless of the archive size. Interrupted transfers are resumed with an
+        HTTP Range request up to `max_resume_attempts` times.
+        
         :param target_directory: The directory where the repository should be saved and extracted.
         """
-        zip_url = f"https://api.github.com/repos/{self.repo_owner}/{self.repo_name}/zipball/main"
+        if streaming:
+            return self._download_repository_streaming(target_directory, chunk_size, max_resume_attempts)
+
+        zip_url = self.archive_url
         headers = {"Authorization": f"token {self.access_token}"} if self.access_token else {}
         
         try:
             self.logger.log_info(f"Downloading repository: {self.repo_owner}/{self.repo_name} from {zip_url}")
-            response = requests.get(zip_url, headers=headers, stream=True)
+            response = self.http.get(zip_url, headers=headers, stream=True, timeout=self.timeout)
             
             # Check if the request was successful (HTTP 200 OK)
             if response.status_code != 200:
@@ -88,3 +137,141 @@ class GitHubRepositoryManager:
             self.logger.log_error(f"Invalid ZIP file received: {e}")
             raise Exception(f"Invalid ZIP file received: {e}")
 
+    def _download_repository_streaming(self, target_directory, chunk_size, max_resume_attempts):
+        """Streams the ZIP archive to a temporary file, then extracts it from disk."""
+        fd, archive_path = tempfile.mkstemp(prefix=f"{self.repo_name}-", suffix=".zip")
+        os.close(fd)
+
+        try:
+            self.download_archive(archive_path, chunk_size, max_resume_attempts)
+            self.extract_archive(archive_path, target_directory)
+        finally:
+            os.remove(archive_path)
+
+    def download_archive(self, archive_path, chunk_size=1024 * 1024, max_resume_attempts=3, ref=None):
+        """
+        Streams the repository ZIP archive to `archive_path` without extracting it.
+        `ref` pins the archive to a commit SHA (or other ref) instead of the
+        configured branch, whose head may move while the download is running.
+        Returns the download statistics also kept in `last_download_stats`.
+        """
+        zip_url = self.archive_url_for(ref or self.branch)
+        headers = {"Authorization": f"token {self.access_token}"} if self.access_token else {}
+
+        try:
+            self.logger.log_info(f"Streaming repository: {self.repo_owner}/{self.repo_name} from {zip_url}")
+            self.last_download_stats = self._stream_to_file(zip_url, headers, archive_path, chunk_size, max_resume_attempts)
+            return self.last_download_stats
+        except requests.RequestException as e:
+            self.logger.log_error(f"Network error during repository download: {e}")
+            raise Exception(f"Network error during repository download: {e}")
+
+    def extract_archive(self, archive_path, target_directory):
+        """Extracts a repository ZIP archive from disk into `target_directory`."""
+        try:
+            self.logger.log_info("Extracting repository ZIP file...")
+            with zipfile.ZipFile(archive_path) as zip_ref:
+                zip_ref.extractall(target_directory)
+            self.logger.log_info(f"Repository extracted to {target_directory}")
+        except zipfile.BadZipFile as e:
+            self.logger.log_error(f"Invalid ZIP file received: {e}")
+            raise Exception(f"Invalid ZIP file received: {e}")
+
+    def _stream_to_file(self, url, headers, file_path, chunk_size, max_resume_attempts, progress_interval=2.0):
+        """
+        Writes the response body for `url` to `file_path` chunk by chunk.
+
+        If the connection drops mid-transfer, the download continues from the
+        last written byte using an HTTP Range request with `If-Range` set to
+        the first response's strong ETag (or Last-Modified), so a server that
+        regenerated the archive in between answers with the whole new archive
+        instead of the tail of a different one. Without a validator, when the
+        server answers 200, or when the 206 `Content-Range` does not start at
+        the requested byte, the file is rewritten from the start. Returns a
+        dict with bytes, seconds, throughput and resumes.
+        """
+        downloaded = 0
+        total = None
+        resumes = 0
+        validator = None
+        start = last_report = time.monotonic()
+
+        with open(file_path, "wb") as f:
+            while True:
+                request_headers = dict(headers)
+                if downloaded and validator is None:
+                    self.logger.log_info("No ETag or Last-Modified to resume against, restarting download")
+                    f.seek(0)
+                    f.truncate()
+                    downloaded = 0
+                if downloaded:
+                    request_headers["Range"] = f"bytes={downloaded}-"
+                    request_headers["If-Range"] = validator
+
+                try:
+                    with self.http.get(url, headers=request_headers, stream=True, timeout=self.timeout) as response:
+                        if downloaded and response.status_code == 206:
+                            content_range = response.headers.get("Content-Range", "")
+                            if not content_range.startswith(f"bytes {downloaded}-"):
+                                raise _RangeMismatch(content_range)
+                            self.logger.log_info(f"Resuming download at byte {downloaded}")
+                        elif response.status_code == 200:
+                            if downloaded:
+                                self.logger.log_info("Server ignored Range request or the archive changed, "
+                                                     "restarting download")
+                                f.seek(0)
+                                f.truncate()
+                                downloaded = 0
+                            length = response.headers.get("Content-Length")
+                            total = int(length) if length and length.isdigit() else None
+                            etag = response.headers.get("ETag")
+                            # If-Range only accepts strong ETags; weak ones never match
+                            validator = (etag if etag and not etag.startswith("W/")
+                                         else response.headers.get("Last-Modified"))
+                        else:
+                            self.logger.log_error(f"Failed to download repository: {response.status_code} {response.text}")
+                            raise Exception(f"Failed to download repository: {response.status_code}")
+
+                        for chunk in response.iter_content(chunk_size=chunk_size):
+                            f.write(chunk)
+                            downloaded += len(chunk)
+
+                            now = time.monotonic()
+                            if now - last_report >= progress_interval:
+                                last_report = now
+                                self._log_progress(downloaded, total, now - start)
+                    break
+
+                except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError,
+                        _RangeMismatch) as e:
+                    if resumes >= max_resume_attempts:
+                        if isinstance(e, _RangeMismatch):
+                            raise Exception(f"Failed to download repository: unexpected Content-Range '{e}'")
+                        raise
+                    resumes += 1
+                    if isinstance(e, _RangeMismatch):
+                        self.logger.log_error(f"Unexpected Content-Range '{e}' for byte {downloaded}, "
+                                              f"restarting download ({resumes}/{max_resume_attempts})")
+                        f.seek(0)
+                        f.truncate()
+                        downloaded = 0
+                        continue
+                    self.logger.log_error(f"Download interrupted after {downloaded} bytes ({e}), resume attempt {resumes}/{max_resume_attempts}")
+
+        elapsed = time.monotonic() - start
+        self._log_progress(downloaded, total, elapsed)
+        return {
+            "bytes": downloaded,
+            "seconds": round(elapsed, 3),
+            "mb_per_second": round(downloaded / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            "resumes": resumes,
+        }
+
+    def _log_progress(self, downloaded, total, elapsed):
+        """Logs bytes received so far and the average throughput."""
+        rate = downloaded / (1024 * 1024) / elapsed if elapsed else 0.0
+        if total:
+            progress = f"{downloaded / (1024 * 1024):.1f}/{total / (1024 * 1024):.1f} MB ({downloaded * 100 // total}%)"
+        else:
+            progress = f"{downloaded / (1024 * 1024):.1f} MB"
+        self.logger.log_info(f"[{self.class_name}] Downloaded {progress} at {rate:.2f} MB/s")
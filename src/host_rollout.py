@@ -0,0 +1,165 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from deployment_logger import current_log_context, log_context
+
+
+def resolve_targets(params):
+    """
+    Returns the hosts named by step parameters. `target` may be a single host
+    or a list; `targets` adds more hosts, and `host_group` names a list in
+    `host_groups`.
+    """
+    targets = []
+    for value in (params.get("target"), params.get("targets")):
+        if isinstance(value, str):
+            targets.append(value)
+        elif value:
+            targets.extend(value)
+
+    host_group = params.get("host_group")
+    if host_group:
+        host_groups = params.get("host_groups", {})
+        if host_group not in host_groups:
+            raise ValueError(f"❌ Unknown host group: {host_group}")
+        targets.extend(host_groups[host_group])
+
+    return list(dict.fromkeys(targets))
+
+
+class HostRollout:
+    """
+    Rolls a deployment out to many hosts in batches.
+
+    The first `canary_count` hosts form a canary batch that must fully succeed
+    before anything else is touched. The remaining hosts are deployed in batches
+    of `batch_size` (all at once by default), with at most `max_in_flight`
+    hosts in progress at any time. The failure ratio (failed hosts out of all
+    hosts after the canaries) is checked as each host completes, and once it
+    exceeds `max_failure_ratio` no further hosts are started: hosts already in
+    flight finish and the rest are skipped. With a ratio of 0.1, one canary and
+    100 further hosts, the eleventh failure stops the rollout, however early
+    it happens.
+    """
+
+    def __init__(self, logger, max_in_flight=4, canary_count=1, batch_size=None, max_failure_ratio=0.0):
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        if canary_count < 0 or (batch_size is not None and batch_size < 1):
+            raise ValueError("canary_count must not be negative and batch_size must be positive")
+        if not 0.0 <= max_failure_ratio <= 1.0:
+            raise ValueError("max_failure_ratio must be between 0 and 1")
+        self.logger = logger
+        self.max_in_flight = max_in_flight
+        self.canary_count = canary_count
+        self.batch_size = batch_size
+        self.max_failure_ratio = max_failure_ratio
+
+    def plan(self, hosts):
+        """Returns the batches (lists of hosts) the rollout will deploy, in order."""
+        hosts = list(dict.fromkeys(hosts))
+        canaries = hosts[:self.canary_count] if len(hosts) > 1 else []
+        remaining = hosts[len(canaries):]
+        batch_size = self.batch_size or len(remaining) or 1
+
+        batches = [canaries] if canaries else []
+        batches.extend(remaining[i:i + batch_size] for i in range(0, len(remaining), batch_size))
+        return batches
+
+    def run(self, hosts, deploy_host):
+        """
+        Deploys to every host with `deploy_host(host)`, which returns True on
+        success. An exception raised for one host counts as that host failing.
+
+        Returns a report dict: per-host status ("success", "failed" or
+        "skipped"), batch number, duration and error, plus overall counts,
+        whether the rollout was aborted and the total duration.
+        """
+        hosts = list(dict.fromkeys(hosts))
+        batches = self.plan(hosts)
+        has_canary = self.canary_count > 0 and len(hosts) > 1
+        report = {"hosts": {}, "batches": len(batches), "aborted": False, "abort_reason": None}
+        start = time.perf_counter()
+        failed = 0
+        # The ratio is taken over all hosts after the canaries, so one early failure is not 100%
+        rollout_hosts = len(hosts) - (len(batches[0]) if has_canary else 0)
+        # Worker threads do not inherit the caller's log context (run, app, step)
+        caller_context = current_log_context()
+
+        def run_host(host, batch_number):
+            host_start = time.perf_counter()
+            error = None
+            with log_context(**caller_context, host=host):
+                try:
+                    succeeded = deploy_host(host) is True
+                except Exception as e:
+                    succeeded = False
+                    error = str(e)
+                    self.logger.log_error(f"❌ [{host}] Deployment raised: {e}")
+            return host, {
+                "status": "success" if succeeded else "failed",
+                "batch": batch_number,
+                "duration": round(time.perf_counter() - host_start, 3),
+                "error": error,
+            }
+
+        def check_abort(batch_number):
+            if has_canary and batch_number == 1 and failed:
+                report["abort_reason"] = f"{failed} canary host(s) failed"
+            elif failed / rollout_hosts > self.max_failure_ratio:
+                report["abort_reason"] = (f"{failed} of {rollout_hosts} hosts failed, "
+                                          f"more than {self.max_failure_ratio:.0%}")
+            else:
+                return
+            report["aborted"] = True
+            self.logger.log_error(f"❌ Stopping rollout: {report['abort_reason']}.")
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="host") as executor:
+            for batch_number, batch in enumerate(batches, start=1):
+                if not report["aborted"]:
+                    label = "canary batch" if has_canary and batch_number == 1 else f"batch {batch_number}/{len(batches)}"
+                    self.logger.log_info(f"🚀 Rolling out to {label}: {batch}")
+
+                # Hosts are started as others finish, so an abort stops the rest of the batch too
+                waiting = list(batch)
+                in_flight = set()
+                while waiting or in_flight:
+                    while waiting and not report["aborted"] and len(in_flight) < self.max_in_flight:
+                        in_flight.add(executor.submit(run_host, waiting.pop(0), batch_number))
+                    if not in_flight:
+                        break
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        host, result = future.result()
+                        report["hosts"][host] = result
+                        failed += result["status"] == "failed"
+                    if not report["aborted"]:
+                        check_abort(batch_number)
+
+                for host in waiting:
+                    report["hosts"][host] = {"status": "skipped", "batch": batch_number, "duration": 0.0, "error": None}
+
+        # Report hosts in rollout order rather than completion order
+        report["hosts"] = {host: report["hosts"][host] for host in hosts}
+        statuses = [result["status"] for result in report["hosts"].values()]
+        report.update({
+            "succeeded": statuses.count("success"),
+            "failed": statuses.count("failed"),
+            "skipped": statuses.count("skipped"),
+            "duration": round(time.perf_counter() - start, 3),
+        })
+        return report
+
+    def format_report(self, report):
+        """Returns log lines describing a rollout report."""
+        icons = {"success": "✅", "failed": "❌", "skipped": "⏭️"}
+        lines = ["📋 Rollout summary:"]
+        for host, result in report["hosts"].items():
+            details = f" ({result['error']})" if result["error"] else ""
+            lines.append(f"   {icons[result['status']]} {host}: {result['status']} "
+                         f"in {result['duration']}s (batch {result['batch']}){details}")
+        lines.append(
+            f"📋 {report['succeeded']}/{len(report['hosts'])} hosts deployed, {report['failed']} failed, "
+            f"{report['skipped']} skipped in {report['duration']}s"
+            + (f" - aborted: {report['abort_reason']}" if report["aborted"] else "")
+        )
+        return lines
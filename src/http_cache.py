@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+
+# Shared caches per directory, like the step registry: every manager in the process reuses them
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+class CachedResponse:
+    """A stored response served from the cache; mirrors the parts of `requests.Response` the managers use."""
+
+    def __init__(self, entry):
+        self.status_code = entry["status_code"]
+        self.headers = entry["headers"]
+        self.text = entry["body"]
+        self.content = self.text.encode("utf-8")
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class HTTPCache:
+    """
+    Persistent cache of GET responses keyed by URL, validated with conditional requests.
+
+    Responses with an `ETag` or `Last-Modified` header are stored under
+    `<cache_dir>/http/`. Within `ttl` seconds a stored response is returned
+    without contacting the server; after that the request is sent with
+    `If-None-Match`/`If-Modified-Since` and a 304 reuses the stored body
+    (conditional requests answered with 304 do not count against GitHub's rate
+    limit). Entries unused for `max_age` seconds, and the least recently used
+    entries beyond `max_entries`, are evicted.
+    """
+
+    def __init__(self, cache_dir, logger, ttl=30, max_age=7 * 24 * 3600, max_entries=1000):
+        self.cache_dir = os.path.join(cache_dir, "http")
+        self.logger = logger
+        self.ttl = ttl
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rate_limit_remaining = None
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(url, headers):
+        """Cache key for a URL; credentials are part of it since they can change what is visible."""
+        authorization = (headers or {}).get("Authorization", "")
+        return hashlib.sha256(f"{url}\n{authorization}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load(self, key):
+        try:
+            with open(self._entry_path(key), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key, entry):
+        temp_path = f"{self._entry_path(key)}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(temp_path, self._entry_path(key))
+
+    def get(self, url, headers=None, timeout=10, http=None):
+        """
+        Performs a cached GET with `http` (a `requests` session or the module).
+        Returns a `requests.Response`, or a CachedResponse on a cache hit.
+        """
+        http = http or requests
+        key = self.make_key(url, headers)
+        entry = self._load(key)
+        now = time.time()
+
+        if entry is not None and now - entry["validated_at"] < self.ttl:
+            with self.lock:
+                self.hits += 1
+            return CachedResponse(entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                request_headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                request_headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = http.get(url, headers=request_headers, timeout=timeout)
+        self._record_rate_limit(response)
+
+        if response.status_code == 304 and entry is not None:
+            entry["validated_at"] = now
+            self._save(key, entry)
+            with self.lock:
+                self.revalidated += 1
+            return CachedResponse(entry)
+
+        with self.lock:
+            self.misses += 1
+        if response.status_code == 200:
+            validators = {name: response.headers.get(name) for name in ("ETag", "Last-Modified")
+                          if isinstance(response.headers.get(name), str)}
+            if validators:
+                self._save(key, {"url": url, "status_code": 200, "headers": validators,
+                                 "body": response.text, "validated_at": now})
+                self._evict()
+        return response
+
+    def _record_rate_limit(self, response):
+        remaining = getattr(response, "headers", {}).get("X-RateLimit-Remaining")
+        if isinstance(remaining, str) and remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+
+    def _evict(self):
+        """Removes expired entries and the least recently validated ones beyond `max_entries`."""
+        with self.lock:
+            entries = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json"):
+                    path = os.path.join(self.cache_dir, name)
+                    try:
+                        entries.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+
+            entries.sort()
+            cutoff = time.time() - self.max_age
+            excess = len(entries) - self.max_entries
+            for index, (modified, path) in enumerate(entries):
+                if index >= excess and modified >= cutoff:
+                    break
+                try:
+                    os.remove(path)
+                    self.evictions += 1
+                except OSError:
+                    pass
+
+    def stats(self):
+        """Returns hits (fresh), revalidations (304), misses, evictions and requests kept off the rate limit."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "rate_limit_saved": self.hits + self.revalidated,
+                "rate_limit_remaining": self.rate_limit_remaining,
+            }
+
+
+def get_http_cache(cache_dir, logger, **options):
+    """Returns the shared HTTPCache for `cache_dir`, creating it on first use."""
+    cache_dir = os.path.abspath(cache_dir)
+    with _CACHES_LOCK:
+        if cache_dir not in _CACHES:
+            _CACHES[cache_dir] = HTTPCache(cache_dir, logger, **options)
+        return _CACHES[cache_dir]
+
+
+def http_cache_stats():
+    """Returns combined statistics for every HTTP cache used in this process."""
+    totals = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0, "rate_limit_saved": 0}
+    with _CACHES_LOCK:
+        for cache in _CACHES.values():
+            for name, value in cache.stats().items():
+                if name in totals:
+                    totals[name] += value
+    return totals
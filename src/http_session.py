@@ -0,0 +1,64 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from instrumentation import measured, record_network
+
+# Shared session for every API client in the process, created on first use
+_DEFAULT_SESSION = None
+_DEFAULT_SESSION_LOCK = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """
+    `requests.Session` with keep-alive connection pooling, automatic retries of
+    idempotent requests and a default timeout for requests that do not set one.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=32, retries=3, backoff_factor=0.5,
+                 status_forcelist=(429, 500, 502, 503, 504), timeout=30):
+        super().__init__()
+        self.timeout = timeout
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=status_forcelist,
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        response = super().request(method, url, **kwargs)
+        if measured():
+            # Streamed bodies are read later by the caller, so only their declared length is known here
+            received = self._declared_length(response) if kwargs.get("stream") else len(response.content or b"")
+            record_network(bytes_sent=self._declared_length(response.request), bytes_received=received)
+        return response
+
+    @staticmethod
+    def _declared_length(message):
+        """Body size of a request or response from its Content-Length header (0 if absent)."""
+        length = message.headers.get("Content-Length") if message is not None else None
+        return int(length) if length and length.isdigit() else 0
+
+
+def get_session(**options):
+    """
+    Returns the process-wide PooledSession. `options` only apply when the
+    session is created by the first call.
+    """
+    global _DEFAULT_SESSION
+    with _DEFAULT_SESSION_LOCK:
+        if _DEFAULT_SESSION is None:
+            _DEFAULT_SESSION = PooledSession(**options)
+        return _DEFAULT_SESSION
@@ -0,0 +1,218 @@
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+from deployment_logger import current_log_context
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# App label for work done once for all apps of a run (e.g. the batch drift check)
+ALL_APPS = "*"
+
+# Runs that are still referenced by their orchestrator, by run id
+_RUNS = weakref.WeakValueDictionary()
+_RUNS_LOCK = threading.Lock()
+
+
+def peak_rss_bytes():
+    """Returns the process's peak resident set size so far, or None where it is unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # kilobytes on Linux
+
+
+def _current_step():
+    """Returns (run, app, step) for the step the calling thread works for, as bound with `log_context`."""
+    context = current_log_context()
+    run = _RUNS.get(context.get("run_id"))
+    if run is None or not context.get("step"):
+        return None, None, None
+    return run, context.get("app") or ALL_APPS, context["step"]
+
+
+def measured():
+    """Returns True if the calling thread is running a step of a measured run."""
+    return _current_step()[0] is not None
+
+
+def record_network(calls=1, bytes_sent=0, bytes_received=0):
+    """Adds network usage to the step the calling thread works for. Ignored outside a measured run."""
+    run, app, step = _current_step()
+    if run is not None:
+        run.add_network(app, step, calls, bytes_sent, bytes_received)
+
+
+def _empty_metrics():
+    return {"status": None, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_bytes": None,
+            "network_calls": 0, "bytes_sent": 0, "bytes_received": 0}
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class RunMetrics:
+    """
+    Wall time, CPU time, peak RSS and network usage of every step of a run, by app.
+
+    CPU time is that of the thread running the step; work the step hands to
+    helper threads (host rollouts, SFTP windows) shows up in the run's process
+    CPU time instead. Peak RSS is the process high-water mark when the step
+    ended. Network calls and bytes are reported by the HTTP session, SSH
+    connections and file transfers through `record_network`.
+    """
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self.steps = {}
+        self.lock = threading.Lock()
+        with _RUNS_LOCK:
+            _RUNS[run_id] = self
+
+    def _entry(self, app, step):
+        return self.steps.setdefault((app, step), _empty_metrics())
+
+    @contextlib.contextmanager
+    def measure(self, app, step):
+        """
+        Measures the block as one execution of `step` for `app`. Yields a dict
+        whose "status" the caller sets ("success", "failed" or "skipped"); it
+        is "failed" if the block raises.
+        """
+        outcome = {"status": "failed"}
+        start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield outcome
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.thread_time() - cpu_start
+            with self.lock:
+                entry = self._entry(app, step)
+                entry["status"] = outcome["status"]
+                entry["wall_seconds"] += wall
+                entry["cpu_seconds"] += cpu
+                entry["peak_rss_bytes"] = peak_rss_bytes()
+
+    def add_network(self, app, step, calls=1, bytes_sent=0, bytes_received=0):
+        with self.lock:
+            entry = self._entry(app, step)
+            entry["network_calls"] += calls
+            entry["bytes_sent"] += bytes_sent
+            entry["bytes_received"] += bytes_received
+
+    def report(self):
+        """Returns the run report: per-app step metrics and totals, plus run-wide totals."""
+        with self.lock:
+            steps = {key: dict(entry) for key, entry in self.steps.items()}
+
+        apps = {}
+        for (app, step), entry in steps.items():
+            entry["wall_seconds"] = round(entry["wall_seconds"], 3)
+            entry["cpu_seconds"] = round(entry["cpu_seconds"], 3)
+            apps.setdefault(app, {"steps": {}})["steps"][step] = entry
+        for app_report in apps.values():
+            entries = app_report["steps"].values()
+            app_report["totals"] = {key: round(sum(entry[key] for entry in entries), 3)
+                                    for key in ("wall_seconds", "cpu_seconds", "network_calls",
+                                                "bytes_sent", "bytes_received")}
+
+        return {
+            "run_id": self.run_id,
+            "started_at": self.started_at,
+            "wall_seconds": round(time.perf_counter() - self._start, 3),
+            "cpu_seconds": round(time.process_time() - self._cpu_start, 3),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "apps": apps,
+        }
+
+    def format_report(self):
+        """Returns log lines summarizing each measured step."""
+        report = self.report()
+        lines = [f"📊 Run {self.run_id}: {report['wall_seconds']}s wall, {report['cpu_seconds']}s CPU"]
+        for app, app_report in sorted(report["apps"].items()):
+            for step, entry in app_report["steps"].items():
+                lines.append(
+                    f"   {app:<20} {step:<10} {entry['status'] or '-':<8} {entry['wall_seconds']:8.3f}s wall "
+                    f"{entry['cpu_seconds']:8.3f}s CPU  {entry['network_calls']} calls, "
+                    f"{entry['bytes_sent'] / (1024 * 1024):.1f} MB sent, "
+                    f"{entry['bytes_received'] / (1024 * 1024):.1f} MB received"
+                )
+        return lines
+
+    def prometheus_text(self):
+        """Returns the report in the Prometheus text exposition format."""
+        report = self.report()
+        metrics = [
+            ("deployment_step_wall_seconds", "gauge", "Wall time of a deployment step.", "wall_seconds"),
+            ("deployment_step_cpu_seconds", "gauge", "CPU time of the thread that ran a deployment step.",
+             "cpu_seconds"),
+            ("deployment_step_peak_rss_bytes", "gauge", "Process peak resident set size when the step ended.",
+             "peak_rss_bytes"),
+            ("deployment_step_network_calls", "gauge", "HTTP requests, SSH commands and transfers made by a step.",
+             "network_calls"),
+            ("deployment_step_sent_bytes", "gauge", "Bytes sent over the network by a step.", "bytes_sent"),
+            ("deployment_step_received_bytes", "gauge", "Bytes received over the network by a step.",
+             "bytes_received"),
+        ]
+        lines = []
+        for name, kind, help_text, key in metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for app, app_report in sorted(report["apps"].items()):
+                for step, entry in app_report["steps"].items():
+                    if entry[key] is None:
+                        continue
+                    labels = (f'app="{_escape_label(app)}",step="{_escape_label(step)}",'
+                              f'status="{_escape_label(entry["status"])}"')
+                    lines.append(f"{name}{{{labels}}} {entry[key]}")
+
+        # The run id is only an info label so that every run does not start new series
+        lines.extend(["# HELP deployment_run_info Identifies the deployment run the metrics belong to.",
+                      "# TYPE deployment_run_info gauge",
+                      f'deployment_run_info{{run_id="{_escape_label(self.run_id)}"}} 1'])
+        for name, help_text, value in (
+            ("deployment_run_wall_seconds", "Wall time of the deployment run.", report["wall_seconds"]),
+            ("deployment_run_cpu_seconds", "Process CPU time used by the deployment run.", report["cpu_seconds"]),
+            ("deployment_run_start_timestamp_seconds", "Unix time the deployment run started.", report["started_at"]),
+        ):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge",
+                          f"{name} {value}"])
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, path):
+        """Writes the run report as JSON."""
+        self._write_atomic(path, json.dumps(self.report(), indent=2))
+
+    def write_prometheus(self, path):
+        """
+        Writes the metrics for the node exporter's textfile collector. The file
+        is replaced atomically so the collector never reads a partial file.
+        """
+        self._write_atomic(path, self.prometheus_text())
+
+    @staticmethod
+    def _write_atomic(path, text):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.chmod(temp_path, 0o644)  # readable by the collector; mkstemp creates 0600
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -1,21 +1,306 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+# HTTP statuses worth retrying; any other 4xx means the request itself is wrong
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+# Answers to starting a multipart upload from servers that do not implement it
+MULTIPART_UNSUPPORTED_STATUSES = {400, 404, 405, 501}
+
+# Upload totals for every JFrogUploader in this process, reported at the end of a run
+_STATS = {"uploads": 0, "checksum_deploys": 0, "bytes_uploaded": 0, "bytes_skipped": 0}
+_STATS_LOCK = threading.Lock()
+
+
+def upload_stats():
+    """Returns upload totals for this process: uploads, checksum deploys, bytes uploaded and skipped."""
+    with _STATS_LOCK:
+        return dict(_STATS)
+
+
+class FileSlice:
+    """Read-only view of `length` bytes of a file starting at `offset`, streamed by `requests`."""
+
+    def __init__(self, path, offset, length):
+        self.file = open(path, "rb")
+        self.file.seek(offset)
+        self.remaining = length
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+class UploadState:
+    """Progress of one package upload, kept across retry attempts so only failed parts are re-sent."""
+
+    def __init__(self, package_path, url, size, part_size, multipart):
+        self.package_path = package_path
+        self.url = url
+        self.size = size
+        self.multipart = multipart
+        self.parts = [(number, offset, min(part_size, self.size - offset))
+                      for number, offset in enumerate(range(0, self.size, part_size), start=1)] if multipart else []
+        self.upload_id = None
+        self.completed = {}  # part number -> ETag
+        self.fatal = False
+        self.checksums = None
+        self.checksum_checked = False
+        self.deployed_by_checksum = False
+
+
 class JFrogUploader:
-    def __init__(self, repo_url, logger=None):
-        """Initialize JFrogUploader with repo URL and optional logger."""
-        self.repo_url = repo_url
+    """
+    Uploads packages to an Artifactory repository.
+
+    Before the first attempt the file is read once to compute its SHA-1 and
+    SHA-256 (both in the same pass); it is then streamed from disk in a
+    separate read, with the checksums in the `X-Checksum-*` headers so the
+    server can verify them. Multipart uploads are opt-in: with
+    `multipart_threshold` set, artifacts of at least that many bytes are
+    split into `part_size` parts that are uploaded on `concurrency` threads
+    using an S3-style multipart protocol (`?uploads`,
+    `?partNumber=&uploadId=`, complete with `?uploadId=`). Artifactory's
+    deploy API does not offer it, so it is only for servers or proxies that
+    do; if starting a multipart upload is rejected, the file is sent in a
+    single streamed PUT instead. Failed attempts are retried with
+    exponential backoff and full jitter, and a retry only re-sends the parts
+    that did not succeed.
+
+    With `checksum_deploy` enabled, the first attempt is a body-less checksum
+    deploy (`X-Checksum-Deploy: true`): if Artifactory already stores content
+    with the same checksums it links the artifact without any bytes being
+    sent. Any other answer leads to a real upload: 404 for an unknown
+    checksum, or an error from a server or permission setup that does not
+    allow checksum deploys (which the upload then reports itself).
+    """
+
+    def __init__(self, repo_url, logger=None, session=None):
+        """Initialize JFrogUploader with repo URL, optional logger and optional shared HTTP session."""
+        self.repo_url = repo_url.rstrip("/")
         self.logger = logger
+        self._session = session
+        self.access_token = None
+        self.part_size = 16 * 1024 * 1024
+        self.multipart_threshold = None  # Bytes from which to upload in parts; None sends every file in one PUT
+        self.concurrency = 4
+        self.timeout = 60
+        self.backoff_base = 0.5
+        self.backoff_max = 30
+        self.checksum_deploy = True
+        self.last_stats = None
+        self._local = threading.local()
+
+    def _log(self, level, message):
+        if self.logger:
+            getattr(self.logger, f"log_{level}")(message)
+
+    @property
+    def session(self):
+        """
+        Returns the injected shared session, or else this thread's own session,
+        so connections are reused across parts and retries.
+        """
+        if self._session is not None:
+            return self._session
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def _auth_headers(self, headers=None):
+        headers = dict(headers or {})
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        return headers
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff: a random delay up to base * 2^(attempt - 1), capped."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def upload_package(self, package_path, retry_count=3, target_path=None):
+        """
+        Uploads a package to `<repo_url>/<target_path>` (the file name by
+        default) with retries. Returns True once the artifact is stored.
+        """
+        target_path = (target_path or os.path.basename(package_path)).lstrip("/")
+        size = os.path.getsize(package_path) if os.path.exists(package_path) else 0
+        # Kept per call, so concurrent uploads of the same file do not share progress
+        state = UploadState(
+            package_path, f"{self.repo_url}/{target_path}", size, self.part_size,
+            self.multipart_threshold is not None and size >= self.multipart_threshold,
+        )
+        start = time.perf_counter()
 
-    def upload_package(self, package_path, retry_count=3):
-        """Uploads a package to JFrog with retries."""
         attempts = 0
         while attempts < retry_count:
             attempts += 1
-            if self.logger:
-                self.logger.info(f"Attempt {attempts} of {retry_count} to upload {package_path}")
-            print(f"[DEBUG] Attempt {attempts} of {retry_count}")  # 🔍 Print attempt count
-            success = self._attempt_upload(package_path)
-            if success:
-                print("[DEBUG] Upload successful!")  # 🔍 Confirm success
+            self._log("info", f"📤 Attempt {attempts} of {retry_count} to upload {package_path}")
+            if self._attempt_upload(state):
+                self._record_success(state, target_path, attempts, time.perf_counter() - start)
                 return True
-            print("[DEBUG] Upload failed, retrying...")  # 🔍 Retry message
-        print("[DEBUG] Upload failed after retries.")  # 🔍 If all retries fail
+
+            if state.fatal:
+                break
+            if attempts < retry_count:
+                delay = self.backoff_delay(attempts)
+                self._log("info", f"🔄 Upload failed, retrying in {delay:.1f}s...")
+                time.sleep(delay)
+
+        self._log("error", f"❌ Upload of {package_path} failed after {attempts} attempts.")
         return False  # Fail after retries
+
+    def _record_success(self, state, target_path, attempts, elapsed):
+        """Sets `last_stats` for a finished upload and adds it to the process totals."""
+        bytes_skipped = state.size if state.deployed_by_checksum else 0
+        self.last_stats = {
+            "bytes": state.size,
+            "bytes_skipped": bytes_skipped,
+            "checksum_deploy": state.deployed_by_checksum,
+            "seconds": round(elapsed, 3),
+            "mb_per_second": round(state.size / (1024 * 1024) / elapsed, 2) if elapsed else None,
+            "attempts": attempts,
+        }
+        with _STATS_LOCK:
+            _STATS["uploads"] += 1
+            _STATS["checksum_deploys"] += int(state.deployed_by_checksum)
+            _STATS["bytes_uploaded"] += state.size - bytes_skipped
+            _STATS["bytes_skipped"] += bytes_skipped
+
+        if state.deployed_by_checksum:
+            self._log("info", f"✅ Deployed {state.package_path} to {self.repo_url}/{target_path} by checksum, "
+                              f"skipped {state.size / (1024 * 1024):.1f} MB")
+        else:
+            self._log("info", f"✅ Uploaded {state.package_path} to {self.repo_url}/{target_path} "
+                              f"in {self.last_stats['seconds']}s ({self.last_stats['mb_per_second']} MB/s)")
+
+    def _attempt_upload(self, state):
+        """Makes one upload attempt, resuming a multipart upload where the previous attempt stopped."""
+        package_path = state.package_path
+        try:
+            if state.checksums is None:
+                state.checksums = self.file_checksums(package_path)
+            if self.checksum_deploy and not state.checksum_checked:
+                if self._deploy_by_checksum(state):
+                    return True
+            if state.multipart:
+                return self._upload_multipart(state)
+            return self._upload_single(state)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._log("error", f"❌ Connection error while uploading {package_path}: {e}")
+        except OSError as e:
+            self._log("error", f"❌ Cannot read {package_path}: {e}")
+            state.fatal = True
+        return False
+
+    @staticmethod
+    def file_checksums(path):
+        """Returns the SHA-1 and SHA-256 hex digests of a file, read in 1 MB chunks."""
+        sha1, sha256 = hashlib.sha1(), hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha1.update(chunk)
+                sha256.update(chunk)
+        return {"X-Checksum-Sha1": sha1.hexdigest(), "X-Checksum-Sha256": sha256.hexdigest()}
+
+    def _check_response(self, state, response, action):
+        """Returns True for a 2xx response; marks the upload fatal for non-retryable errors."""
+        if 200 <= response.status_code < 300:
+            return True
+        if response.status_code not in RETRYABLE_STATUSES:
+            state.fatal = True
+        self._log("error", f"❌ {action} failed with HTTP {response.status_code}: {response.text[:200]}")
+        return False
+
+    def _deploy_by_checksum(self, state):
+        """
+        Asks Artifactory to deploy the artifact from content it already has.
+        Returns True if it did; False for any other answer (unknown checksum
+        or an error), after which the file is uploaded.
+        """
+        headers = dict(state.checksums, **{"X-Checksum-Deploy": "true", "Content-Length": "0"})
+        response = self.session.put(state.url, headers=self._auth_headers(headers), timeout=self.timeout)
+        state.checksum_checked = True
+        if 200 <= response.status_code < 300:
+            state.deployed_by_checksum = True
+            return True
+        if response.status_code != 404:
+            self._log("info", f"🔹 Checksum deploy of {state.url} returned HTTP {response.status_code}, "
+                              f"uploading the full package.")
+        return False
+
+    def _upload_single(self, state):
+        """Streams the whole file in one PUT request."""
+        body = FileSlice(state.package_path, 0, state.size)
+        try:
+            response = self.session.put(state.url, data=body, headers=self._auth_headers(state.checksums),
+                                        timeout=self.timeout)
+        finally:
+            body.close()
+        return self._check_response(state, response, f"Upload of {state.url}")
+
+    def _upload_multipart(self, state):
+        """Uploads the parts that have not been stored yet, then completes the multipart upload."""
+        if state.upload_id is None:
+            response = self.session.post(f"{state.url}?uploads", headers=self._auth_headers(state.checksums),
+                                         timeout=self.timeout)
+            if response.status_code in MULTIPART_UNSUPPORTED_STATUSES:
+                self._log("info", f"🔹 {state.url} does not accept multipart uploads (HTTP {response.status_code}), "
+                                  f"uploading in a single request.")
+                state.multipart = False
+                return self._upload_single(state)
+            if not self._check_response(state, response, f"Starting multipart upload of {state.url}"):
+                return False
+            state.upload_id = response.json()["uploadId"]
+
+        pending = [part for part in state.parts if part[0] not in state.completed]
+        if pending:
+            self._log("info", f"📤 Uploading {len(pending)} of {len(state.parts)} parts of {state.url} "
+                              f"({self.concurrency} concurrent)")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.concurrency, len(pending) or 1)),
+                                thread_name_prefix="jfrog") as executor:
+            futures = {executor.submit(self._upload_part, state, *part): part[0] for part in pending}
+            for future in as_completed(futures):
+                try:
+                    etag = future.result()
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    self._log("error", f"❌ Part {futures[future]} of {state.url} failed: {e}")
+                    continue
+                if etag is not None:
+                    state.completed[futures[future]] = etag
+
+        if len(state.completed) < len(state.parts):
+            return False
+
+        parts = [{"partNumber": number, "etag": state.completed[number]} for number, _, _ in state.parts]
+        response = self.session.post(f"{state.url}?uploadId={state.upload_id}", json={"parts": parts},
+                                     headers=self._auth_headers(state.checksums), timeout=self.timeout)
+        return self._check_response(state, response, f"Completing multipart upload of {state.url}")
+
+    def _upload_part(self, state, number, offset, length):
+        """Uploads one part; returns its ETag, or None if the server rejected it."""
+        body = FileSlice(state.package_path, offset, length)
+        try:
+            response = self.session.put(f"{state.url}?partNumber={number}&uploadId={state.upload_id}",
+                                        data=body, headers=self._auth_headers(), timeout=self.timeout)
+        finally:
+            body.close()
+        if not self._check_response(state, response, f"Part {number} of {state.url}"):
+            return None
+        return response.headers.get("ETag", str(number))
@@ -1,10 +1,20 @@
+import hashlib
+import posixpath
+import shlex
 import paramiko
 from deployment_logger import DeploymentLogger
+from ssh_pool import DEFAULT_POOL
+from sftp_transfer import SFTPTransferEngine
+from delta_transfer import DeltaTransfer
 
 class RemoteDeployer:
-    """Handles deployment of packages to remote servers via SSH."""
+    """
+    Handles deployment of packages to remote servers via SSH. Remote commands
+    (checks, checksums, delta patching) fail with a timeout error once they
+    go `command_timeout` seconds without output.
+    """
 
-    def __init__(self, server_address, ssh_user, ssh_key_path, logger):
+    def __init__(self, server_address, ssh_user, ssh_key_path, logger, pool=None, port=22, command_timeout=300):
         """Initialize RemoteDeployer with SSH credentials and logging."""
         if not server_address:
             raise ValueError("❌ Server address is required.")
@@ -19,22 +29,38 @@ class RemoteDeployer:
         self.ssh_user = ssh_user
         self.ssh_key_path = ssh_key_path
         self.logger = logger
+        self.port = port
+        self.command_timeout = command_timeout
+        # Connections are shared with every other deployer using the same pool
+        self.pool = pool if pool is not None else DEFAULT_POOL
 
         self.logger.log_info(f"✅ RemoteDeployer initialized for {server_address} as {ssh_user}.")
 
+    def connection(self):
+        """Returns a pooled connection context for this deployer's host and credentials."""
+        return self.pool.connection(self.server_address, self.ssh_user, self.ssh_key_path, port=self.port)
+
+    def run_command(self, command, timeout=None):
+        """
+        Runs a shell command on the remote host. Returns (exit_status, stdout,
+        stderr); raises socket.timeout if it stalls for `timeout` seconds
+        (default: `command_timeout`).
+        """
+        with self.connection() as connection:
+            return connection.exec_command(command, timeout=timeout or self.command_timeout)
+
     def check_remote_directory(self, remote_path):
         """Checks if the remote directory exists and logs its contents."""
 
         self.logger.log_info(f"🔍 Checking remote directory: {remote_path} on {self.server_address}...")
 
         try:
-            ssh = paramiko.SSHClient()
-            ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            ssh.connect(self.server_address, username=self.ssh_user, key_filename=self.ssh_key_path)
-
-            stdin, stdout, stderr = ssh.exec_command(f"if [ -d {remote_path} ]; then ls -l {remote_path}; else echo 'DIRECTORY_NOT_FOUND'; fi")
-            output = stdout.read().decode().strip()
-            error = stderr.read().decode().strip()
+            quoted_path = shlex.quote(remote_path)
+            _, output, error = self.run_command(
+                f"if [ -d {quoted_path} ]; then ls -l {quoted_path}; else echo 'DIRECTORY_NOT_FOUND'; fi"
+            )
+            output = output.strip()
+            error = error.strip()
 
             if error:
                 self.logger.log_error(f"❌ Error accessing remote directory: {error}")
@@ -42,8 +68,7 @@ class RemoteDeployer:
                 self.logger.log_error(f"❌ Remote directory does not exist: {remote_path}")
             else:
                 self.logger.log_info(f"📂 Remote Directory Structure:\n{output}")
-
-            ssh.close()
+                return True
 
         except paramiko.AuthenticationException:
             self.logger.log_error("❌ SSH Authentication Failed. Check credentials.")
@@ -51,35 +76,76 @@ class RemoteDeployer:
             self.logger.log_error(f"❌ SSH Connection Error: {ssh_exception}")
         except Exception as e:
             self.logger.log_error(f"❌ Unexpected Error: {e}")
-
-
-    def deploy_to_server(self, local_package_path, remote_package_path):
-        """Stub: Simulates SSH deployment with validation and logging."""
+        return False
+
+    def upload_file(self, local_path, remote_path, **transfer_options):
+        """
+        Uploads a file over SFTP using a pooled connection. `transfer_options`
+        (chunk_size, window_size, concurrency) tune the SFTPTransferEngine.
+        """
+        return SFTPTransferEngine(self, self.logger, **transfer_options).upload(local_path, remote_path)
+
+    @staticmethod
+    def local_checksum(local_path):
+        """Returns the SHA-256 hex digest of a local file."""
+        digest = hashlib.sha256()
+        with open(local_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def remote_checksum(self, remote_path):
+        """Returns the SHA-256 hex digest of a remote file, or None if it cannot be computed."""
+        exit_status, output, error = self.run_command(f"sha256sum {shlex.quote(remote_path)}")
+        if exit_status != 0:
+            self.logger.log_error(f"❌ Remote checksum failed for {remote_path}: {error.strip()}")
+            return None
+        return output.split()[0] if output.strip() else None
+
+    def deploy_to_server(self, local_package_path, remote_package_path, delta=False, **transfer_options):
+        """
+        Uploads a package over a pooled SSH connection and verifies it with a checksum.
+        With `delta=True` only blocks that differ from the package already at
+        `remote_package_path` are sent (see DeltaTransfer).
+        """
 
         # 🔹 Validate required parameters
         if not local_package_path:
             self.logger.log_error("❌ Local package path is missing.")
-            return
+            return False
         if not remote_package_path:
             self.logger.log_error("❌ Remote deployment path is missing.")
-            return
+            return False
 
-        self.logger.log_info(f"🚀 [STUB] Starting deployment of {local_package_path} to {self.server_address}:{remote_package_path}")
+        self.logger.log_info(f"🚀 Starting deployment of {local_package_path} to {self.server_address}:{remote_package_path}")
 
-        # ✅ New Step: Check remote directory before deployment
-        self.check_remote_directory(remote_package_path)
+        try:
+            # ✅ Check remote directory before deployment
+            remote_directory = posixpath.dirname(remote_package_path) or "."
+            if not self.check_remote_directory(remote_directory):
+                return False
 
-        # 🔹 Simulated Steps:
-        self.logger.log_info(f"🔹 [STUB] Establishing SSH connection to {self.server_address} as {self.ssh_user}...")
-        # TODO: In real implementation, use `paramiko.SSHClient` to establish a connection.
+            self.logger.log_info(f"🔹 Verifying package integrity before transfer...")
+            expected_checksum = self.local_checksum(local_package_path)
 
-        self.logger.log_info(f"🔹 [STUB] Verifying package integrity before transfer...")
-        # TODO: Implement file checksum verification before sending.
+            self.logger.log_info(f"🔹 Uploading {local_package_path} to {remote_package_path}...")
+            if delta:
+                DeltaTransfer(self, self.logger, **transfer_options).upload(local_package_path, remote_package_path)
+            else:
+                self.upload_file(local_package_path, remote_package_path, **transfer_options)
 
-        self.logger.log_info(f"🔹 [STUB] Uploading {local_package_path} to {remote_package_path}...")
-        # TODO: Use SFTP to transfer the file.
+            self.logger.log_info(f"🔹 Verifying file transfer success on remote server...")
+            actual_checksum = self.remote_checksum(remote_package_path)
+            if actual_checksum != expected_checksum:
+                self.logger.log_error(f"❌ Checksum mismatch after upload: expected {expected_checksum}, got {actual_checksum}")
+                return False
 
-        self.logger.log_info(f"🔹 [STUB] Verifying file transfer success on remote server...")
-        # TODO: Perform a remote checksum validation.
+        except paramiko.AuthenticationException:
+            self.logger.log_error("❌ SSH Authentication Failed. Check credentials.")
+            return False
+        except (paramiko.SSHException, OSError) as e:
+            self.logger.log_error(f"❌ SSH Connection Error: {e}")
+            return False
 
-        self.logger.log_info(f"✅ [STUB] Deployment step completed successfully.")
+        self.logger.log_info(f"✅ Deployment step completed successfully.")
+        return True
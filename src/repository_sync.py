@@ -0,0 +1,160 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncGitHubRepositoryManager:
+    """asyncio interface to a GitHubRepositoryManager; calls run on the checker's worker threads."""
+
+    def __init__(self, manager, run_blocking):
+        self.manager = manager
+        self._run_blocking = run_blocking
+
+    async def fetch_latest_commit(self):
+        return await self._run_blocking(self.manager.fetch_latest_commit)
+
+
+class AsyncAzureDevOpsManager:
+    """asyncio interface to an AzureDevOpsManager; calls run on the checker's worker threads."""
+
+    def __init__(self, manager, run_blocking):
+        self.manager = manager
+        self._run_blocking = run_blocking
+
+    async def get_latest_commit(self):
+        return await self._run_blocking(self.manager.get_latest_commit)
+
+    async def compare_with_azure(self, github_commit):
+        return await self._run_blocking(self.manager.compare_with_azure, github_commit)
+
+
+class BatchSyncChecker:
+    """
+    Checks many GitHub/Azure DevOps repository pairs for drift concurrently.
+
+    Every pair's GitHub and Azure DevOps commits are fetched at the same time,
+    with at most `max_concurrency` API calls in flight across the whole batch,
+    so checking a hundred repositories takes about as long as the slowest few
+    calls rather than their sum. The managers' blocking calls run on a thread
+    pool of the same size and share their (pooled) HTTP sessions; a call that
+    takes longer than `timeout` seconds marks its repository as an error.
+    """
+
+    def __init__(self, logger, max_concurrency=16, timeout=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.logger = logger
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._executor = None
+        self._semaphore = None
+
+    async def _run_blocking(self, func, *args):
+        """
+        Runs `func(*args)` on a worker thread once a concurrency slot is free.
+        The slot is held until the thread is done with the call, not just until
+        the caller stops waiting, so calls abandoned after a timeout still count
+        against `max_concurrency`.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore
+        await semaphore.acquire()
+        try:
+            # Carries the caller's log context (run, step) into the worker thread
+            future = self._executor.submit(contextvars.copy_context().run, func, *args)
+        except BaseException:
+            semaphore.release()
+            raise
+        future.add_done_callback(lambda _: self._release_slot(loop, semaphore))
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+
+    @staticmethod
+    def _release_slot(loop, semaphore):
+        """Gives a slot back from the worker thread that finished a call."""
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            pass  # The batch is over and its loop closed; nobody is waiting for the slot
+
+    async def _gather(self, checks):
+        """Runs the `checks` coroutines concurrently with this checker's worker threads and call limit."""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="sync-check")
+        try:
+            return await asyncio.gather(*checks)
+        finally:
+            # Calls abandoned after a timeout may still be running; do not wait for them
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def check_repository(self, name, github_manager, azure_manager):
+        """
+        Compares the latest commits of one repository pair. Returns a result dict
+        with status ("in_sync", "outdated" or "error"), both commits, the error
+        message if any and the duration.
+        """
+        github = AsyncGitHubRepositoryManager(github_manager, self._run_blocking)
+        azure = AsyncAzureDevOpsManager(azure_manager, self._run_blocking)
+        start = time.perf_counter()
+        result = {"status": "error", "github_commit": None, "azure_commit": None, "error": None}
+
+        github_commit, azure_commit = await asyncio.gather(
+            github.fetch_latest_commit(), azure.get_latest_commit(), return_exceptions=True
+        )
+        if isinstance(github_commit, BaseException):
+            result["error"] = f"GitHub: {self._describe(github_commit)}"
+        else:
+            result["github_commit"] = github_commit
+        if isinstance(azure_commit, BaseException):
+            result["error"] = result["error"] or f"Azure DevOps: {self._describe(azure_commit)}"
+        elif azure_commit is None:
+            # AzureDevOpsManager logs its own failures and returns None
+            result["error"] = result["error"] or "Azure DevOps: latest commit unavailable"
+        else:
+            result["azure_commit"] = azure_commit
+
+        if result["error"] is None:
+            result["status"] = "in_sync" if github_commit == azure_commit else "outdated"
+        result["duration"] = round(time.perf_counter() - start, 3)
+        return name, result
+
+    @staticmethod
+    def _describe(error):
+        if isinstance(error, asyncio.TimeoutError):
+            return "timed out"
+        return str(error) or error.__class__.__name__
+
+    async def check_all(self, repositories):
+        """
+        Checks every `(name, github_manager, azure_manager)` entry concurrently.
+
+        Returns a report dict with the per-repository results under
+        "repositories", the in_sync/outdated/error counts and the total duration.
+        """
+        repositories = list(repositories)
+        start = time.perf_counter()
+        self.logger.log_info(f"🔍 Checking {len(repositories)} repositories for drift "
+                             f"({self.max_concurrency} concurrent requests)")
+        results = await self._gather(self.check_repository(*entry) for entry in repositories)
+
+        report = {"repositories": dict(results), "duration": round(time.perf_counter() - start, 3)}
+        for status in ("in_sync", "outdated", "error"):
+            report[status] = sum(1 for result in report["repositories"].values() if result["status"] == status)
+        return report
+
+    def run(self, repositories):
+        """Synchronous entry point for `check_all`, for callers outside an event loop."""
+        return asyncio.run(self.check_all(repositories))
+
+    def format_report(self, report):
+        """Returns log lines describing a batch sync report."""
+        icons = {"in_sync": "✅", "outdated": "⚠️", "error": "❌"}
+        lines = ["📋 Repository sync summary:"]
+        for name, result in report["repositories"].items():
+            details = f" ({result['error']})" if result["error"] else ""
+            lines.append(f"   {icons[result['status']]} {name}: {result['status']} in {result['duration']}s{details}")
+        lines.append(
+            f"📋 {report['in_sync']}/{len(report['repositories'])} repositories in sync, "
+            f"{report['outdated']} outdated, {report['error']} errors in {report['duration']}s"
+        )
+        return lines
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class RunStateStore:
+    """
+    Remembers the inputs of every successful step per app, so unchanged steps
+    can be skipped on the next run like targets of a build system.
+
+    A step's fingerprint covers its name, its parameters, the context values
+    it declares in `fingerprint_context` (e.g. the commit SHA) and the inputs
+    it resolves elsewhere (e.g. a repository URL from the environment). Context
+    values naming existing files contribute the file's SHA-256, so a rebuilt
+    artifact changes the fingerprint even when its path does not. The context
+    values a step set are stored with the fingerprint and restored when the
+    step is skipped; files among them must still be unchanged on disk.
+
+    State lives in `<state_dir>/<app>.json`. File hashes are memoized by
+    path, size and modification time so unchanged artifacts are not re-read.
+    """
+
+    def __init__(self, state_dir, logger):
+        self.state_dir = state_dir
+        self.logger = logger
+        self.lock = threading.Lock()
+        self.skipped = []  # (app, step, seconds saved)
+        self._states = {}
+        self._file_hashes = {}
+
+    def _state_path(self, app):
+        return os.path.join(self.state_dir, f"{app}.json")
+
+    def _state(self, app):
+        if app not in self._states:
+            try:
+                with open(self._state_path(app), "r") as f:
+                    self._states[app] = json.load(f)
+            except (OSError, ValueError):
+                self._states[app] = {"steps": {}}
+        return self._states[app]
+
+    @staticmethod
+    def _file_signature(path):
+        stat = os.stat(path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def file_hash(self, path):
+        """Returns the SHA-256 of a file, re-reading it only when its size or mtime changed."""
+        signature = (os.path.abspath(path), *self._file_signature(path))
+        with self.lock:
+            if signature in self._file_hashes:
+                return self._file_hashes[signature]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        with self.lock:
+            self._file_hashes[signature] = digest.hexdigest()
+        return self._file_hashes[signature]
+
+    def fingerprint(self, step, params, context, context_keys, extra_inputs=None):
+        """
+        Returns the fingerprint of a step's inputs, or None if a declared
+        context value is missing (the inputs cannot be identified).
+        `extra_inputs` are further values the step's result depends on.
+        """
+        inputs = {}
+        for key in context_keys:
+            value = context.get(key)
+            if value is None:
+                return None
+            if isinstance(value, str) and os.path.isfile(value):
+                value = {"file": value, "sha256": self.file_hash(value)}
+            inputs[key] = value
+        payload = json.dumps([step, params, inputs, extra_inputs or {}], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def unchanged(self, app, step, fingerprint):
+        """
+        Returns the stored record if the step last succeeded with the same
+        fingerprint and the files it produced are untouched, otherwise None.
+        """
+        with self.lock:
+            record = self._state(app)["steps"].get(step)
+        if record is None or record["fingerprint"] != fingerprint:
+            return None
+        for path, signature in record["output_files"].items():
+            try:
+                if self._file_signature(path) != signature:
+                    return None
+            except OSError:
+                return None
+        return record
+
+    def record(self, app, step, fingerprint, outputs, duration):
+        """Stores a successful step's fingerprint, the context values it set and its duration."""
+        outputs = {key: value for key, value in outputs.items() if self._serializable(value)}
+        output_files = {}
+        for value in outputs.values():
+            if isinstance(value, str) and os.path.isfile(value):
+                output_files[value] = self._file_signature(value)
+
+        with self.lock:
+            state = self._state(app)
+            state["steps"][step] = {
+                "fingerprint": fingerprint,
+                "outputs": outputs,
+                "output_files": output_files,
+                "duration": round(duration, 3),
+                "finished_at": time.time(),
+            }
+            os.makedirs(self.state_dir, exist_ok=True)
+            temp_path = f"{self._state_path(app)}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(state, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self._state_path(app))
+
+    @staticmethod
+    def _serializable(value):
+        try:
+            json.dumps(value)
+            return True
+        except (TypeError, ValueError):
+            return False
+
+    def mark_skipped(self, app, step, record):
+        with self.lock:
+            self.skipped.append((app, step, record["duration"]))
+
+    def summary(self):
+        """Returns the skipped (app, step) pairs and the total time their last runs took."""
+        with self.lock:
+            return {
+                "skipped": [(app, step) for app, step, _ in self.skipped],
+                "seconds_saved": round(sum(seconds for _, _, seconds in self.skipped), 3),
+            }
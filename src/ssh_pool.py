@@ -0,0 +1,201 @@
+import contextlib
+import threading
+import time
+import paramiko
+
+from instrumentation import record_network
+
+CONNECT_LOCK_STRIPES = 32
+
+
+class PooledConnection:
+    """
+    One authenticated SSH transport shared by many remote operations.
+
+    Each operation opens its own channel on the transport, so concurrent
+    commands and SFTP sessions are multiplexed over a single handshake.
+    Idle SFTP sessions are kept for reuse instead of being closed. Their
+    channels stay open on the server, so they count against `max_channels`
+    until a new channel needs the slot and an idle session is closed for it.
+    """
+
+    def __init__(self, client, max_channels):
+        self.client = client
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.max_channels = max_channels
+        self._open_channels = 0
+        self._idle_sftp = []
+        self._available = threading.Condition()
+
+    def _acquire_channel(self):
+        """Reserves a channel slot, closing an idle SFTP session when all slots are taken."""
+        stale = None
+        with self._available:
+            while self._open_channels >= self.max_channels and not self._idle_sftp:
+                self._available.wait()
+            if self._open_channels >= self.max_channels:
+                # The idle session's slot is handed to the new channel
+                stale = self._idle_sftp.pop()
+            else:
+                self._open_channels += 1
+        if stale is not None:
+            stale.close()
+
+    def _release_channel(self):
+        with self._available:
+            self._open_channels -= 1
+            self._available.notify()
+
+    @property
+    def is_active(self):
+        transport = self.client.get_transport()
+        return transport is not None and transport.is_active()
+
+    def exec_command(self, command, timeout=None):
+        """Runs `command` on its own channel. Returns (exit_status, stdout, stderr) as text."""
+        self._acquire_channel()
+        try:
+            stdin, stdout, stderr = self.client.exec_command(command, timeout=timeout)
+            output = stdout.read()
+            error = stderr.read()
+            record_network(bytes_sent=len(command), bytes_received=len(output) + len(error))
+            return stdout.channel.recv_exit_status(), output.decode(), error.decode()
+        finally:
+            self._release_channel()
+
+    @contextlib.contextmanager
+    def sftp(self):
+        """Yields an SFTP client on this transport, reusing an idle session when available."""
+        with self._available:
+            sftp = self._idle_sftp.pop() if self._idle_sftp else None
+        if sftp is None:
+            self._acquire_channel()
+            try:
+                sftp = self.client.open_sftp()
+            except Exception:
+                self._release_channel()
+                raise
+
+        try:
+            yield sftp
+        except Exception:
+            sftp.close()
+            self._release_channel()
+            raise
+        else:
+            # Parked with its slot still reserved; waiters may take it over
+            with self._available:
+                self._idle_sftp.append(sftp)
+                self._available.notify()
+
+    def close(self):
+        with self._available:
+            idle, self._idle_sftp = self._idle_sftp, []
+            self._open_channels -= len(idle)
+        for sftp in idle:
+            sftp.close()
+        self.client.close()
+
+
+class SSHConnectionPool:
+    """
+    Reuses authenticated SSH connections keyed by (host, port, user, key path).
+
+    Connections stay open between operations and are closed once they have been
+    idle for longer than `idle_timeout` seconds. At most `max_channels` channels
+    are open on one connection at a time, matching sshd's default MaxSessions.
+    """
+
+    def __init__(self, logger=None, idle_timeout=300, max_channels=10, keepalive=30, connect_timeout=15):
+        self.logger = logger
+        self.idle_timeout = idle_timeout
+        self.max_channels = max_channels
+        self.keepalive = keepalive
+        self.connect_timeout = connect_timeout
+        self.handshakes = 0
+        self.reuses = 0
+        self.evictions = 0
+        self._connections = {}
+        # Striped per-key connect locks: a fixed set, so the pool does not keep one lock per host ever seen
+        self._connect_locks = [threading.Lock() for _ in range(CONNECT_LOCK_STRIPES)]
+        self._lock = threading.Lock()
+
+    def _log(self, message):
+        if self.logger is not None:
+            self.logger.log_debug(message)
+
+    def _connect(self, host, port, user, key_path):
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(host, port=port, username=user, key_filename=key_path,
+                       timeout=self.connect_timeout, allow_agent=False, look_for_keys=False)
+        if self.keepalive:
+            client.get_transport().set_keepalive(self.keepalive)
+        return PooledConnection(client, self.max_channels)
+
+    @contextlib.contextmanager
+    def connection(self, host, user, key_path, port=22):
+        """Yields a live PooledConnection for the given credentials, connecting only if needed."""
+        key = (host, port, user, key_path)
+        self.evict_idle()
+
+        key_lock = self._connect_locks[hash(key) % len(self._connect_locks)]
+
+        # Connecting holds only the per-key lock so handshakes to different hosts run in parallel
+        with key_lock:
+            with self._lock:
+                connection = self._connections.get(key)
+                if connection is not None and connection.is_active:
+                    connection.in_use += 1
+                    self.reuses += 1
+                elif connection is not None:
+                    connection.close()
+                    del self._connections[key]
+                    connection = None
+
+            if connection is None:
+                self._log(f"🔐 Opening SSH connection to {user}@{host}:{port}")
+                connection = self._connect(host, port, user, key_path)
+                with self._lock:
+                    self._connections[key] = connection
+                    connection.in_use += 1
+                    self.handshakes += 1
+
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                connection.in_use -= 1
+                connection.last_used = time.monotonic()
+
+    def evict_idle(self):
+        """Closes connections that are not in use and have been idle past `idle_timeout`."""
+        now = time.monotonic()
+        with self._lock:
+            for key, connection in list(self._connections.items()):
+                if connection.in_use == 0 and now - connection.last_used > self.idle_timeout:
+                    self._log(f"🧹 Closing idle SSH connection to {key[2]}@{key[0]}:{key[1]}")
+                    connection.close()
+                    del self._connections[key]
+                    self.evictions += 1
+
+    def close_all(self):
+        with self._lock:
+            for connection in self._connections.values():
+                connection.close()
+            self._connections.clear()
+
+    def stats(self):
+        with self._lock:
+            open_connections = len(self._connections)
+        return {
+            "handshakes": self.handshakes,
+            "reuses": self.reuses,
+            "evictions": self.evictions,
+            "open_connections": open_connections,
+        }
+
+
+# Shared pool used by RemoteDeployer instances that are not given their own
+DEFAULT_POOL = SSHConnectionPool()
@@ -0,0 +1,143 @@
+import collections
+import contextlib
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+
+
+class StackSampler:
+    """
+    Samples the Python stacks of registered threads every `interval` seconds
+    from a daemon thread and counts them in collapsed-stack form
+    (`prefix;outer;...;inner`), the input format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.targets = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, thread_id, prefix):
+        with self.lock:
+            self.targets[thread_id] = prefix
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, thread_id):
+        with self.lock:
+            self.targets.pop(thread_id, None)
+
+    def stop(self):
+        with self.lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self.lock:
+                targets = dict(self.targets)
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            samples = [f"{prefix};{self.collapse(frames[thread_id])}"
+                       for thread_id, prefix in targets.items() if thread_id in frames]
+            with self.lock:
+                self.counts.update(samples)
+
+    @staticmethod
+    def collapse(frame):
+        """Returns the stack ending in `frame`, outermost first, as `;`-separated frame names."""
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+
+class StepProfiler:
+    """
+    Profiles deployment steps for `deploy.py --profile`.
+
+    Each step execution is run under cProfile and dumped to
+    `<output_dir>/<app>.<step>.prof` (open with `python -m pstats` or
+    snakeviz), while a stack sampler records the same steps for a merged
+    `stacks.collapsed` file that flame graph tools read directly. Nothing is
+    installed until `profile` is called, and the orchestrator only calls it
+    when profiling was enabled.
+
+    Both only see the thread that runs the step. Work a step hands to its own
+    thread pools (parallel packaging, SFTP chunks, multi-host rollouts, part
+    uploads) shows up as time spent waiting on those pools, not as the
+    workers' own functions.
+    """
+
+    def __init__(self, output_dir, logger, interval=0.005):
+        self.output_dir = output_dir
+        self.logger = logger
+        self.sampler = StackSampler(interval)
+        self.profile_paths = []
+        os.makedirs(output_dir, exist_ok=True)
+
+    def profile_path(self, app, step):
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{app}.{step}")
+        return os.path.join(self.output_dir, f"{name}.prof")
+
+    @contextlib.contextmanager
+    def profile(self, app, step):
+        """Profiles the block as one execution of `step` for `app`."""
+        thread_id = threading.get_ident()
+        self.sampler.add(thread_id, f"{app};{step}")
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # Only one cProfile may be active at a time on Python 3.12+ (e.g. parallel steps)
+            self.logger.log_debug("🔹 cProfile unavailable for %s/%s: %s", app, step, e)
+            profiler = None
+
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                path = self.profile_path(app, step)
+                profiler.dump_stats(path)
+                if path not in self.profile_paths:
+                    self.profile_paths.append(path)
+            self.sampler.remove(thread_id)
+
+    def top_functions(self, path, limit=5):
+        """Returns (cumulative seconds, function) for the most expensive functions of a profile."""
+        stats = pstats.Stats(path).stats
+        ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [(round(cumulative, 3), f"{name} ({os.path.basename(filename)}:{line})")
+                for (filename, line, name), (_, _, _, cumulative, _) in ranked[:limit]]
+
+    def write_collapsed(self):
+        """Writes the merged sampled stacks of all steps; returns the file path."""
+        self.sampler.stop()
+        path = os.path.join(self.output_dir, "stacks.collapsed")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.sampler.counts.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def finish(self):
+        """Stops sampling, writes the collapsed stacks and logs where every profile went."""
+        collapsed = self.write_collapsed()
+        for path in self.profile_paths:
+            hot = ", ".join(f"{function} {seconds}s" for seconds, function in self.top_functions(path, limit=3))
+            self.logger.log_info(f"🔬 {path}: {hot}")
+        self.logger.log_info(f"🔥 Collapsed stacks ({sum(self.sampler.counts.values())} samples) written to "
+                             f"{collapsed}; render with flamegraph.pl or speedscope")
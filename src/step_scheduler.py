@@ -0,0 +1,207 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+
+class StepTimeline:
+    """Records when each step started and finished during a scheduled run."""
+
+    def __init__(self):
+        self.run_start = time.perf_counter()
+        self.run_end = None
+        self.entries = {}
+        self.dependencies = {}
+        self._lock = threading.Lock()
+
+    def start(self, step):
+        with self._lock:
+            self.entries[step] = {
+                "start": time.perf_counter() - self.run_start,
+                "end": None,
+                "status": "running",
+                "worker": threading.current_thread().name,
+            }
+
+    def finish(self, step, status):
+        with self._lock:
+            entry = self.entries[step]
+            entry["end"] = time.perf_counter() - self.run_start
+            entry["status"] = status
+
+    def mark_skipped(self, step):
+        with self._lock:
+            self.entries[step] = {"start": None, "end": None, "status": "skipped", "worker": None}
+
+    def close(self):
+        self.run_end = time.perf_counter() - self.run_start
+
+    def duration(self, step):
+        entry = self.entries.get(step)
+        if not entry or entry["start"] is None or entry["end"] is None:
+            return 0.0
+        return entry["end"] - entry["start"]
+
+    @property
+    def wall_time(self):
+        return self.run_end if self.run_end is not None else time.perf_counter() - self.run_start
+
+    @property
+    def serial_time(self):
+        """Time the same steps would have taken if run one after another."""
+        return sum(self.duration(step) for step in self.entries)
+
+    def critical_path(self):
+        """Returns (path, seconds) for the longest dependency chain of executed steps."""
+        best = {}
+
+        def longest(step):
+            if step not in best:
+                chains = [longest(dep) for dep in self.dependencies.get(step, ()) if dep in self.entries]
+                path, seconds = max(chains, key=lambda chain: chain[1], default=([], 0.0))
+                best[step] = (path + [step], seconds + self.duration(step))
+            return best[step]
+
+        return max((longest(step) for step in self.entries), key=lambda chain: chain[1], default=([], 0.0))
+
+    def to_dict(self):
+        path, path_seconds = self.critical_path()
+        return {
+            "wall_time": round(self.wall_time, 4),
+            "serial_time": round(self.serial_time, 4),
+            "critical_path": path,
+            "critical_path_time": round(path_seconds, 4),
+            "steps": {
+                step: {
+                    "start": None if entry["start"] is None else round(entry["start"], 4),
+                    "end": None if entry["end"] is None else round(entry["end"], 4),
+                    "duration": round(self.duration(step), 4),
+                    "status": entry["status"],
+                    "worker": entry["worker"],
+                }
+                for step, entry in self.entries.items()
+            },
+        }
+
+    def format_report(self, width=40):
+        """Renders the timeline as text lines with one bar per step."""
+        wall = self.wall_time or 1e-9
+        path, path_seconds = self.critical_path()
+        lines = ["📊 Step timeline:"]
+        for step, entry in sorted(self.entries.items(), key=lambda item: (item[1]["start"] is None, item[1]["start"] or 0)):
+            if entry["start"] is None:
+                lines.append(f"   {step:<12} {'':<{width}} skipped")
+                continue
+            offset = int(entry["start"] / wall * width)
+            length = max(1, int(self.duration(step) / wall * width))
+            bar = (" " * offset + "█" * length)[:width]
+            lines.append(f"   {step:<12} {bar:<{width}} {self.duration(step):7.3f}s {entry['status']}")
+        speedup = self.serial_time / wall if wall else 0.0
+        lines.append(
+            f"   wall={wall:.3f}s serial={self.serial_time:.3f}s "
+            f"critical_path={path_seconds:.3f}s ({' -> '.join(path)}) speedup={speedup:.2f}x"
+        )
+        return lines
+
+
+class StepScheduler:
+    """
+    Runs deployment steps as a dependency graph (DAG) on a bounded worker pool.
+
+    A step becomes ready once every dependency that is part of the same run has
+    completed. Dependencies on steps that were not requested are ignored so that
+    single steps can still be run on their own. The first failing step stops new
+    work from being scheduled; steps already running are allowed to finish.
+    """
+
+    def __init__(self, logger, max_workers=4):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.logger = logger
+        self.max_workers = max_workers
+        self.timeline = None
+
+    @staticmethod
+    def build_graph(steps, dependencies):
+        """Restricts `dependencies` to `steps` and validates that the graph has no cycles."""
+        requested = list(dict.fromkeys(steps))
+        graph = {step: {dep for dep in dependencies.get(step, ()) if dep in requested and dep != step}
+                 for step in requested}
+
+        remaining = {step: set(deps) for step, deps in graph.items()}
+        while remaining:
+            ready = [step for step, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle detected between steps: {sorted(remaining)}")
+            for step in ready:
+                del remaining[step]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return graph
+
+    def run(self, steps, dependencies, run_step):
+        """
+        Executes `run_step(step)` for every step respecting `dependencies`.
+
+        `run_step` returns False (or raises) to signal failure. Returns a tuple of
+        (executed_steps, timeline); the first exception raised by a step is
+        re-raised once in-flight steps have drained, with the timeline still
+        available as `self.timeline`.
+        """
+        graph = self.build_graph(steps, dependencies)
+        timeline = self.timeline = StepTimeline()
+        timeline.dependencies = graph
+
+        pending = dict(graph)
+        completed = set()
+        executed = []
+        failed = None
+        error = None
+
+        def timed_step(step):
+            timeline.start(step)
+            try:
+                result = run_step(step)
+            except Exception:
+                timeline.finish(step, "failed")
+                raise
+            timeline.finish(step, "failed" if result is False else "ok")
+            return result
+
+        def submit_ready(executor, running):
+            for step in [step for step, deps in pending.items() if deps <= completed]:
+                del pending[step]
+                running[executor.submit(timed_step, step)] = step
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="step") as executor:
+            running = {}
+            submit_ready(executor, running)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        succeeded = future.result() is not False
+                    except Exception as e:
+                        succeeded = False
+                        error = error or e
+                        self.logger.log_error(f"❌ Step '{step}' raised: {e}")
+
+                    if succeeded:
+                        completed.add(step)
+                        executed.append(step)
+                    elif failed is None:
+                        failed = step
+                        self.logger.log_error(f"❌ Step '{step}' failed, not scheduling remaining steps.")
+
+                if failed is None:
+                    submit_ready(executor, running)
+
+        for step in pending:
+            timeline.mark_skipped(step)
+        timeline.close()
+
+        if error is not None:
+            raise error
+        return executed, timeline
@@ -1,11 +1,37 @@
+import os
+import shutil
 from deployment_steps import DeploymentStep
 
 class CleanupStep(DeploymentStep):
+    """
+    Removes the source tree the fetch step extracted for the app once the
+    package is built, uploaded and deployed. Only a directory carrying the
+    fetch step's `.commit_sha` marker is removed; the package, the caches and
+    anything else under the build directory are kept. The next fetch extracts
+    the sources again from the archive cache.
+    """
+
+    depends_on = ("package", "upload", "deploy")
+
     def __init__(self, logger):
         super().__init__(logger)  # ✅ Ensure logger is passed correctly
 
-    def execute(self, app=None, target=None):
-        print("[Stub] Cleaning up temporary files...")
-
+    def execute(self, app=None, remove_sources=True, **kwargs):
+        source_dir = self.context.get("source_dir")
+        if not remove_sources or not source_dir:
+            self.logger.log_info(f"🧹 Nothing to clean up for {app}.")
+            return True
 
+        # The fetch target directory holds the marker; the sources may sit in its single top-level folder
+        for directory in (source_dir, os.path.dirname(source_dir)):
+            if os.path.isfile(os.path.join(directory, ".commit_sha")):
+                try:
+                    shutil.rmtree(directory)
+                except OSError as e:
+                    self.logger.log_error(f"❌ Could not remove fetched sources {directory}: {e}")
+                    return False
+                self.logger.log_info(f"🧹 Removed fetched sources of {app}: {directory}")
+                return True
 
+        self.logger.log_info(f"🧹 {source_dir} was not created by the fetch step, leaving it in place.")
+        return True
@@ -1,9 +1,103 @@
+import os
 from deployment_steps import DeploymentStep
+from github_manager import GitHubRepositoryManager
+from azure_manager import AzureDevOpsManager
+from host_rollout import resolve_targets
+from http_cache import get_http_cache
+from version_drift import AppVersionSources, DeployedVersions, VersionDriftEngine
 
 class CompareVersionsStep(DeploymentStep):
+    """
+    Compares an app's GitHub head with its Azure DevOps mirror and with the
+    version deployed on each target host. Sets `context["drift"]` (the app's
+    row of the drift matrix) and `context["in_sync"]`; steps marked
+    `skip_when_in_sync` are then skipped for apps that are already in sync.
+    """
+
+    # Parameters from `step_parameters.json` that tune VersionDriftEngine
+    ENGINE_OPTIONS = ("max_concurrency", "timeout")
+
     def __init__(self, logger):
         super().__init__(logger)  # ✅ Ensure logger is passed correctly
 
-    def execute(self, app=None, target=None):
-        print("[Stub] Comparing versions...")
+    def execute(self, app=None, **kwargs):
+        row = self.context.get("drift")
+        if row is None:
+            sources = self.build_sources(app, kwargs)
+            if sources is None:
+                self.logger.log_info("[Stub] Comparing versions...")
+                return
+            engine = VersionDriftEngine(self.logger, **{key: kwargs[key] for key in self.ENGINE_OPTIONS if key in kwargs})
+            matrix = engine.run([sources])
+            for line in engine.format_report(matrix):
+                self.logger.log_info(line)
+            row = matrix["apps"][app]
+
+        self.context["drift"] = row
+        self.context["in_sync"] = row["status"] == "in_sync"
+        if self.context["in_sync"]:
+            self.logger.log_info(f"✅ {app} is in sync everywhere at {row['github']}, nothing to deploy.")
+
+    def check_apps(self, app_params):
+        """
+        Builds the drift matrix for several apps at once from their formatted
+        step parameters (`{app: params}`). Apps without a repository configured
+        are left out. Apps are checked together by one engine per distinct set of
+        ENGINE_OPTIONS, so per-app overrides of those options are honoured.
+        """
+        groups = {}
+        for app, params in app_params.items():
+            sources = self.build_sources(app, params)
+            if sources is not None:
+                options = tuple((key, params[key]) for key in self.ENGINE_OPTIONS if key in params)
+                groups.setdefault(options, []).append(sources)
+
+        matrix = {"apps": {}, "duration": 0.0, "in_sync": 0, "drift": 0, "error": 0}
+        engine = None
+        for options, sources in (groups or {(): []}).items():
+            engine = VersionDriftEngine(self.logger, **dict(options))
+            group_matrix = engine.run(sources)
+            matrix["apps"].update(group_matrix["apps"])
+            for key in ("duration", "in_sync", "drift", "error"):
+                matrix[key] += group_matrix[key]
+        matrix["duration"] = round(matrix["duration"], 3)
+        for line in engine.format_report(matrix):
+            self.logger.log_info(line)
+        return matrix
+
+    def build_sources(self, app, params):
+        """Creates the managers and host list for one app, or returns None when no repository is configured."""
+        repo_owner = params.get("repo_owner")
+        repo_name = params.get("repo_name", app)
+        if not repo_owner or not repo_name:
+            return None
+
+        session = self.http_session()
+        http_cache = get_http_cache(params.get("cache_dir", ".deploy_cache"), self.logger,
+                                    ttl=params.get("http_cache_ttl", 30))
+        github = GitHubRepositoryManager(
+            repo_owner, repo_name, self.logger,
+            access_token=os.environ.get(params.get("access_token_env", "GITHUB_TOKEN")),
+            http_cache=http_cache, session=session, branch=params.get("branch"), api_base=params.get("api_base"),
+        )
+
+        azure = None
+        organization = params.get("azure_organization") or os.environ.get(params.get("azure_organization_env", ""), "")
+        project = params.get("azure_project") or os.environ.get(params.get("azure_project_env", ""), "")
+        if organization and project:
+            azure_repo = params.get("azure_repo_name", repo_name)
+            azure = AzureDevOpsManager(
+                f"https://dev.azure.com/{organization}/{project}/_git/{azure_repo}", organization, project, azure_repo,
+                os.environ.get(params.get("azure_token_env", "AZURE_DEVOPS_PAT")), self.logger,
+                http_cache=http_cache, session=session, branch=params.get("branch"),
+            )
 
+        deployed_versions = DeployedVersions(
+            self.logger,
+            ssh_user=params.get("ssh_user") or os.environ.get("DEPLOY_SSH_USER"),
+            ssh_key_path=os.path.expanduser(params.get("ssh_key_path") or os.environ.get("DEPLOY_SSH_KEY") or "") or None,
+            port=params.get("ssh_port", 22),
+        )
+        return AppVersionSources(app, github, azure, hosts=resolve_targets(params),
+                                 deployed_versions=deployed_versions,
+                                 remote_package_path=params.get("remote_package_path"))
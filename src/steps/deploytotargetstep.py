@@ -1,8 +1,28 @@
 import os
 from deployment_steps import DeploymentStep
+from remote_deployer import RemoteDeployer
+from host_rollout import HostRollout, resolve_targets
+from version_drift import DeployedVersions
+from instrumentation import measured, record_network
 
 class DeployToTargetStep(DeploymentStep):
-    """Deploys an application package to a remote target using Azure DevOps SSH endpoint."""
+    """
+    Deploys an application package to one or more remote targets over SFTP
+    (optionally as a delta against the previous package on the host), falling
+    back to `scp`. Several targets are rolled out with HostRollout.
+    """
+
+    depends_on = ("package",)
+    skip_when_in_sync = True
+    # Never skipped on unchanged local inputs: the hosts may have drifted since the last run.
+    # Only the compare step, which reads the deployed versions, can tell that a deploy is not needed.
+    fingerprint_context = None
+
+    # Parameters from `step_parameters.json` that tune the SFTP transfer engine
+    TRANSFER_OPTIONS = ("chunk_size", "window_size", "concurrency")
+    # Additional parameters for `transfer_mode: delta`
+    DELTA_OPTIONS = ("block_size", "max_literal_ratio")
+    # `max_in_flight`, `canary_count`, `batch_size` and `max_failure_ratio` tune multi-host rollouts
 
     def __init__(self, logger):
         super().__init__(logger)
@@ -10,20 +30,94 @@ class DeployToTargetStep(DeploymentStep):
     def execute(self, app=None, **kwargs):
         """Executes remote deployment using parameters from `step_parameters.json`."""
 
-        target = kwargs.get("target")  # Retrieve target dynamically
+        try:
+            targets = self.resolve_targets(kwargs)
+        except ValueError as e:
+            self.logger.log_error(str(e))
+            return False
         local_package_path = kwargs.get("local_package_path")
         remote_package_path = kwargs.get("remote_package_path")
 
         # Validate required parameters
-        if not target:
+        if not targets:
             self.logger.log_error("❌ Deployment target is missing in configuration.")
-            return
+            return False
         if not local_package_path or not remote_package_path:
             self.logger.log_error(f"❌ Missing required deployment parameters for {app}.")
-            return
+            return False
+
+        if len(targets) == 1:
+            return self._deploy_to_host(app, targets[0], local_package_path, remote_package_path, kwargs)
+
+        rollout = HostRollout(
+            self.logger,
+            max_in_flight=kwargs.get("max_in_flight", 4),
+            canary_count=kwargs.get("canary_count", 1),
+            batch_size=kwargs.get("batch_size"),
+            max_failure_ratio=kwargs.get("max_failure_ratio", 0.0),
+        )
+        self.logger.log_info(f"🚀 Rolling out {app} to {len(targets)} hosts: {targets}")
+        report = rollout.run(
+            targets, lambda host: self._deploy_to_host(app, host, local_package_path, remote_package_path, kwargs)
+        )
+        self.context["rollout"] = report
+        for line in rollout.format_report(report):
+            self.logger.log_info(line)
+        return report["failed"] == 0 and report["skipped"] == 0
+
+    @staticmethod
+    def resolve_targets(params):
+        """Returns the hosts to deploy to (see `host_rollout.resolve_targets`)."""
+        return resolve_targets(params)
 
+    def _deploy_to_host(self, app, target, local_package_path, remote_package_path, kwargs):
+        """
+        Deploys the package to one host and records the deployed commit next to
+        it (see DeployedVersions) when it is known. Returns True on success.
+        """
         self.logger.log_info(f"🚀 Deploying {app} to {target}...")
 
+        ssh_user = kwargs.get("ssh_user") or os.environ.get("DEPLOY_SSH_USER")
+        ssh_key_path = kwargs.get("ssh_key_path") or os.environ.get("DEPLOY_SSH_KEY")
+        # One deployer per host: the transfer and the version marker share its pooled connection
+        deployer = None
+        if ssh_user and ssh_key_path:
+            deployer = RemoteDeployer(target, ssh_user, os.path.expanduser(ssh_key_path), self.logger,
+                                      port=kwargs.get("ssh_port", 22), command_timeout=kwargs.get("command_timeout", 300))
+        deployed = self._transfer_to_host(app, target, local_package_path, remote_package_path, deployer, kwargs)
+
+        commit_sha = self.context.get("commit_sha")
+        if deployed and commit_sha:
+            # Never fails the deploy: the package is already in place and verified
+            DeployedVersions(self.logger, port=kwargs.get("ssh_port", 22)).write(
+                target, remote_package_path, commit_sha, deployer=deployer)
+        return deployed
+
+    def _transfer_to_host(self, app, target, local_package_path, remote_package_path, deployer, kwargs):
+        """
+        Copies the package to one host over SFTP with `deployer` (None without
+        SSH credentials), falling back to `scp`. Returns True on success.
+        """
+
+        transfer_mode = kwargs.get("transfer_mode", "sftp")
+        if transfer_mode in ("sftp", "delta"):
+            if deployer is not None:
+                option_names = self.TRANSFER_OPTIONS + (self.DELTA_OPTIONS if transfer_mode == "delta" else ())
+                transfer_options = {key: kwargs[key] for key in option_names if key in kwargs}
+                if deployer.deploy_to_server(local_package_path, remote_package_path,
+                                             delta=(transfer_mode == "delta"), **transfer_options):
+                    self.logger.log_info(f"✅ Deployment step completed for {app} -> {target}")
+                    return True
+                if not kwargs.get("fallback_to_scp", True):
+                    return False
+                self.logger.log_error(f"❌ SFTP deployment to {target} failed, falling back to scp.")
+            else:
+                self.logger.log_info("🔹 No SSH user/key configured for SFTP, using scp.")
+
+        return self._deploy_with_scp(app, target, local_package_path, remote_package_path)
+
+    def _deploy_with_scp(self, app, target, local_package_path, remote_package_path):
+        """Copies the package with the system `scp` command."""
         # Run deployment command via Azure DevOps SSH step
         deployment_command = f"scp {local_package_path} {target}:{remote_package_path}"
         self.logger.log_info(f"Executing: {deployment_command}")
@@ -31,6 +125,9 @@ class DeployToTargetStep(DeploymentStep):
         exit_code = os.system(deployment_command)  # Execute the deployment
         if exit_code != 0:
             self.logger.log_error(f"❌ Deployment failed with exit code {exit_code}")
-            return
+            return False
 
+        if measured():
+            record_network(bytes_sent=os.path.getsize(local_package_path))
         self.logger.log_info(f"✅ Deployment step completed for {app} -> {target}")
+        return True
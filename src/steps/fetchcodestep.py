@@ -1,10 +1,87 @@
+import os
+import shutil
+import tempfile
 from deployment_steps import DeploymentStep
+from github_manager import GitHubRepositoryManager
+from artifact_cache import ArtifactCache, get_cache
+from http_cache import get_http_cache
 
 class FetchCodeStep(DeploymentStep):
+    """Fetches the latest commit of the app repository, reusing cached archives when the commit is unchanged."""
+
+    # Runs after the version comparison when both are requested, so in-sync apps are not fetched
+    depends_on = ("compare",)
+    skip_when_in_sync = True
+
     def __init__(self, logger):
         super().__init__(logger)  # ✅ Ensure logger is passed correctly
 
-    def execute(self, app=None, target=None):
-        self.logger.log_info("[Stub] Fetching latest code...")  # ✅ Uses shared logger
+    def execute(self, app=None, **kwargs):
+        repo_owner = kwargs.get("repo_owner")
+        repo_name = kwargs.get("repo_name", app)
+        target_directory = kwargs.get("target_directory")
+
+        if not repo_owner or not repo_name or not target_directory:
+            self.logger.log_info("[Stub] Fetching latest code...")  # ✅ Uses shared logger
+            return
+
+        manager = GitHubRepositoryManager(
+            repo_owner, repo_name, self.logger,
+            access_token=os.environ.get(kwargs.get("access_token_env", "GITHUB_TOKEN")),
+            http_cache=get_http_cache(kwargs.get("cache_dir", ".deploy_cache"), self.logger,
+                                      ttl=kwargs.get("http_cache_ttl", 30)),
+            session=self.http_session(),
+            branch=kwargs.get("branch"),
+            api_base=kwargs.get("api_base"),
+        )
+        commit_sha = manager.fetch_latest_commit()
+        self.context["repository"] = f"{repo_owner}/{repo_name}"
+        self.context["commit_sha"] = commit_sha
+
+        marker_path = os.path.join(target_directory, ".commit_sha")
+        if os.path.exists(marker_path):
+            with open(marker_path, "r") as f:
+                if f.read().strip() == commit_sha:
+                    self.logger.log_info(f"✅ {target_directory} already contains commit {commit_sha}, skipping fetch.")
+                    self.context["source_dir"] = self._source_root(target_directory)
+                    return
+
+        cache = get_cache(kwargs.get("cache_dir", ".deploy_cache"), self.logger,
+                          max_bytes=kwargs.get("cache_max_mb", 2048) * 1024 * 1024)
+        key = ArtifactCache.make_key("source", repo_owner, repo_name, commit_sha)
+
+        # Checked out, so another app's `put` cannot evict the archive while it is extracted
+        with cache.checkout(key) as archive_path:
+            if archive_path is not None:
+                self._extract(manager, archive_path, target_directory, marker_path, commit_sha)
+            else:
+                fd, download_path = tempfile.mkstemp(prefix=f"{repo_name}-", suffix=".zip")
+                os.close(fd)
+                try:
+                    # By SHA, not branch: the branch may have moved since fetch_latest_commit,
+                    # and the archive is cached under this commit
+                    manager.download_archive(download_path, ref=commit_sha)
+                    cache.put(key, download_path, name=f"{repo_owner}/{repo_name}@{commit_sha[:12]}.zip")
+                    self._extract(manager, download_path, target_directory, marker_path, commit_sha)
+                finally:
+                    os.remove(download_path)
+
+        self.context["source_dir"] = self._source_root(target_directory)
 
+    @staticmethod
+    def _extract(manager, archive_path, target_directory, marker_path, commit_sha):
+        # Remove the tree of a previously fetched commit so only one source root remains
+        if os.path.exists(marker_path):
+            shutil.rmtree(target_directory)
+        os.makedirs(target_directory, exist_ok=True)
+        manager.extract_archive(archive_path, target_directory)
+        with open(marker_path, "w") as f:
+            f.write(commit_sha)
 
+    @staticmethod
+    def _source_root(target_directory):
+        """GitHub zipballs contain a single `<owner>-<repo>-<sha>/` folder; returns it when present."""
+        entries = [entry for entry in os.listdir(target_directory) if entry != ".commit_sha"]
+        if len(entries) == 1 and os.path.isdir(os.path.join(target_directory, entries[0])):
+            return os.path.join(target_directory, entries[0])
+        return target_directory
@@ -1,10 +1,66 @@
+import os
+import shutil
 from deployment_steps import DeploymentStep
+from app_packager import AppPackager
+from artifact_cache import ArtifactCache, get_cache
 
 class PackageAppStep(DeploymentStep):
+    """Packages the fetched sources, reusing a cached package built from the same commit and parameters."""
+
+    depends_on = ("fetch",)
+    skip_when_in_sync = True
+    fingerprint_context = ("repository", "commit_sha")
+
     def __init__(self, logger):
         super().__init__(logger)  # ✅ Ensure logger is passed correctly
 
-    def execute(self, app=None, target=None):
-        print(f"[Stub] Packaging app...")
+    def execute(self, app=None, **kwargs):
+        source_dir = self.context.get("source_dir", kwargs.get("source_dir"))
+        output_dir = kwargs.get("output_dir")
+
+        if not source_dir or not output_dir:
+            self.logger.log_error(f"❌ Missing `source_dir` or `output_dir` to package {app}.")
+            return False
+
+        packager = AppPackager(source_dir, output_dir, self.logger, package_name=kwargs.get("package_name", f"{app}.zip"),
+                               workers=kwargs.get("workers"), compression_level=kwargs.get("compression_level", 6),
+                               incremental=kwargs.get("incremental", True))
+        commit_sha = self.context.get("commit_sha")
+
+        # Without a known commit the sources cannot be identified, so always build
+        if not commit_sha:
+            self.context["package_path"] = packager.create_package()
+            self.context["package_manifest"] = packager.manifest_path
+            return
+
+        cache = get_cache(kwargs.get("cache_dir", ".deploy_cache"), self.logger,
+                          max_bytes=kwargs.get("cache_max_mb", 2048) * 1024 * 1024)
+        packaging_params = {key: value for key, value in kwargs.items() if key not in ("cache_dir", "cache_max_mb")}
+        key = ArtifactCache.make_key("package", self.context.get("repository"), commit_sha, packaging_params)
+        manifest_key = ArtifactCache.make_key("package-manifest", key)
 
+        # Checked out, so another app's `put` cannot evict the files while they are copied
+        with cache.checkout(key) as cached_path:
+            if cached_path is not None:
+                os.makedirs(output_dir, exist_ok=True)
+                shutil.copyfile(cached_path, packager.package_path)
+                with cache.checkout(manifest_key) as cached_manifest:
+                    if cached_manifest is not None:
+                        shutil.copyfile(cached_manifest, packager.manifest_path)
+        if cached_path is not None:
+            package_path = packager.package_path
+            self.logger.log_info(f"✅ Reused cached package for {app} at commit {commit_sha}: {package_path}")
+            self.context["package_path"] = package_path
+            self.context["package_manifest"] = packager.manifest_path
+            return
 
+        package_path = packager.create_package()
+        if os.path.exists(package_path):
+            cache.put(key, package_path, name=f"{app}@{commit_sha[:12]}/{os.path.basename(package_path)}")
+            if os.path.exists(packager.manifest_path):
+                cache.put(manifest_key, packager.manifest_path,
+                          name=f"{app}@{commit_sha[:12]}/{os.path.basename(packager.manifest_path)}")
+        else:
+            self.logger.log_error(f"❌ Package {package_path} was not created, nothing to cache.")
+        self.context["package_path"] = package_path
+        self.context["package_manifest"] = packager.manifest_path
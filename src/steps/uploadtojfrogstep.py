@@ -1,10 +1,49 @@
+import os
 from deployment_steps import DeploymentStep
+from jfrog_uploader import JFrogUploader
 
 class UploadToJfrogStep(DeploymentStep):
+    """Uploads the package built by the package step to Artifactory."""
+
+    depends_on = ("package",)
+    skip_when_in_sync = True
+    fingerprint_context = ("package_path",)
+
+    # Parameters from `step_parameters.json` that tune JFrogUploader
+    UPLOAD_OPTIONS = ("part_size", "multipart_threshold", "concurrency", "timeout", "backoff_base", "backoff_max")
 
     def __init__(self, logger):
         super().__init__(logger)  # ✅ Ensure logger is passed correctly
 
-    def execute(self, app=None, target=None):
-        print(f"[Stub] Uploading app to JFrog...")
+    def destination(self, app, params):
+        """Returns (repository URL, target path) the package is uploaded to; either may be None."""
+        repo_url = params.get("repo_url") or os.environ.get(params.get("repo_url_env", "JFROG_REPO_URL"))
+        package_path = self.context.get("package_path", params.get("local_package_path"))
+        target_path = params.get("target_path") or (f"{app}/{os.path.basename(package_path)}" if package_path else None)
+        return repo_url, target_path
+
+    def fingerprint_inputs(self, app, params):
+        # The repository may come from the environment; a new one must get the package again
+        repo_url, target_path = self.destination(app, params)
+        return {"repo_url": repo_url, "target_path": target_path}
+
+    def execute(self, app=None, **kwargs):
+        repo_url, target_path = self.destination(app, kwargs)
+        package_path = self.context.get("package_path", kwargs.get("local_package_path"))
+
+        # Reporting success here would be recorded by the run state and skip the upload on the next run too
+        if not repo_url:
+            self.logger.log_error(f"❌ No Artifactory repository configured for {app} "
+                                  f"(set `repo_url` or {kwargs.get('repo_url_env', 'JFROG_REPO_URL')}).")
+            return False
+        if not package_path:
+            self.logger.log_error(f"❌ No package to upload for {app}: run the package step or set `local_package_path`.")
+            return False
+
+        uploader = JFrogUploader(repo_url, self.logger, session=self.http_session())
+        uploader.access_token = os.environ.get(kwargs.get("access_token_env", "JFROG_ACCESS_TOKEN"))
+        for option in self.UPLOAD_OPTIONS:
+            if option in kwargs:
+                setattr(uploader, option, kwargs[option])
 
+        return uploader.upload_package(package_path, retry_count=kwargs.get("retry_count", 3), target_path=target_path)
@@ -0,0 +1,180 @@
+import asyncio
+import shlex
+import subprocess
+import time
+
+from remote_deployer import RemoteDeployer
+from repository_sync import AsyncAzureDevOpsManager, AsyncGitHubRepositoryManager, BatchSyncChecker
+
+
+class DeployedVersions:
+    """
+    Reads and writes the `<remote package>.version` markers that record which
+    commit is deployed on a host. Commands run over a pooled SSH connection
+    when an SSH user and key are configured (one RemoteDeployer per host, or
+    the caller's), and with the system `ssh` otherwise (like the `scp`
+    deployment fallback).
+    """
+
+    def __init__(self, logger, ssh_user=None, ssh_key_path=None, port=22, timeout=30):
+        self.logger = logger
+        self.ssh_user = ssh_user
+        self.ssh_key_path = ssh_key_path
+        self.port = port
+        self.timeout = timeout
+        self._deployers = {}
+
+    @staticmethod
+    def marker_path(remote_package_path):
+        return f"{remote_package_path}.version"
+
+    def _run(self, host, command, deployer=None):
+        """Runs a shell command on `host`, with `deployer` if given. Returns (exit_status, stdout, stderr)."""
+        if deployer is None and self.ssh_user and self.ssh_key_path:
+            deployer = self._deployers.get(host)
+            if deployer is None:
+                deployer = self._deployers.setdefault(
+                    host, RemoteDeployer(host, self.ssh_user, self.ssh_key_path, self.logger, port=self.port,
+                                         command_timeout=self.timeout))
+        if deployer is not None:
+            return deployer.run_command(command)
+        result = subprocess.run(["ssh", "-o", "BatchMode=yes", "-p", str(self.port), host, command],
+                                capture_output=True, text=True, timeout=self.timeout)
+        return result.returncode, result.stdout, result.stderr
+
+    def read(self, host, remote_package_path):
+        """Returns the commit recorded on `host` for the package, or None if there is no marker."""
+        exit_status, output, _ = self._run(host, f"cat {shlex.quote(self.marker_path(remote_package_path))}")
+        return (output.strip() or None) if exit_status == 0 else None
+
+    def write(self, host, remote_package_path, commit_sha, deployer=None):
+        """
+        Records `commit_sha` as deployed on `host`, over `deployer`'s pooled
+        connection if given. Returns True on success. Failures, including SSH
+        errors and timeouts, are logged as warnings and never raised: the
+        package is deployed either way, and a missing marker only makes drift
+        checks report the host as drifted.
+        """
+        marker = shlex.quote(self.marker_path(remote_package_path))
+        try:
+            exit_status, _, error = self._run(host, f"printf '%s\\n' {shlex.quote(commit_sha)} > {marker}", deployer)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        else:
+            if exit_status == 0:
+                return True
+        self.logger.log_warning(f"⚠️ Could not record deployed version on {host}: {error.strip()}")
+        return False
+
+
+class AppVersionSources:
+    """
+    Where one app's versions come from: its GitHub repository, an optional
+    Azure DevOps mirror, and the hosts it is deployed to (read with
+    `deployed_versions.read(host, remote_package_path)`).
+    """
+
+    def __init__(self, app, github, azure=None, hosts=(), deployed_versions=None, remote_package_path=None):
+        self.app = app
+        self.github = github
+        self.azure = azure
+        self.hosts = list(hosts) if deployed_versions is not None and remote_package_path else []
+        self.deployed_versions = deployed_versions
+        self.remote_package_path = remote_package_path
+
+
+class VersionDriftEngine(BatchSyncChecker):
+    """
+    Builds a version drift matrix for many apps at once.
+
+    For every app the GitHub head, the Azure DevOps mirror's head and the
+    version deployed on each target host are resolved concurrently (at most
+    `max_concurrency` lookups in flight across all apps). An app is "in_sync"
+    when its mirror and every host are at the GitHub head, "drift" when any of
+    them differ, a host has no recorded version or no hosts are configured,
+    and "error" when a lookup failed.
+    """
+
+    async def check_app(self, sources):
+        """Resolves one app's versions. Returns (app, matrix row)."""
+        start = time.perf_counter()
+        lookups = [AsyncGitHubRepositoryManager(sources.github, self._run_blocking).fetch_latest_commit()]
+        if sources.azure is not None:
+            lookups.append(AsyncAzureDevOpsManager(sources.azure, self._run_blocking).get_latest_commit())
+        lookups.extend(self._run_blocking(sources.deployed_versions.read, host, sources.remote_package_path)
+                       for host in sources.hosts)
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+
+        github = results[0]
+        azure = results[1] if sources.azure is not None else None
+        hosts = dict(zip(sources.hosts, results[2 if sources.azure is not None else 1:]))
+        row = {"status": "error", "github": None, "azure": None, "hosts": {}, "drifted": [], "error": None}
+
+        errors = []
+        if isinstance(github, BaseException):
+            errors.append(f"GitHub: {self._describe(github)}")
+        else:
+            row["github"] = github
+        if sources.azure is not None:
+            if isinstance(azure, BaseException):
+                errors.append(f"Azure DevOps: {self._describe(azure)}")
+            elif azure is None:
+                # AzureDevOpsManager logs its own failures and returns None
+                errors.append("Azure DevOps: latest commit unavailable")
+            else:
+                row["azure"] = azure
+        for host, version in hosts.items():
+            if isinstance(version, BaseException):
+                errors.append(f"{host}: {self._describe(version)}")
+                version = None
+            row["hosts"][host] = version
+
+        if errors:
+            row["error"] = "; ".join(errors)
+        else:
+            if sources.azure is not None and row["azure"] != row["github"]:
+                row["drifted"].append("azure")
+            row["drifted"].extend(host for host, version in row["hosts"].items() if version != row["github"])
+            # Without hosts to check nothing shows the app is deployed, so it is never reported in sync
+            row["status"] = "drift" if row["drifted"] or not row["hosts"] else "in_sync"
+        row["duration"] = round(time.perf_counter() - start, 3)
+        return sources.app, row
+
+    async def check_all(self, app_sources):
+        """
+        Checks every AppVersionSources entry concurrently. Returns the drift
+        matrix: rows per app under "apps", in_sync/drift/error counts and the
+        total duration.
+        """
+        app_sources = list(app_sources)
+        start = time.perf_counter()
+        self.logger.log_info(f"🔍 Checking {len(app_sources)} apps for version drift "
+                             f"({self.max_concurrency} concurrent lookups)")
+        results = await self._gather(self.check_app(sources) for sources in app_sources)
+
+        matrix = {"apps": dict(results), "duration": round(time.perf_counter() - start, 3)}
+        for status in ("in_sync", "drift", "error"):
+            matrix[status] = sum(1 for row in matrix["apps"].values() if row["status"] == status)
+        return matrix
+
+    def format_report(self, matrix):
+        """Returns log lines showing every app's versions per source, abbreviated to 8 characters."""
+        icons = {"in_sync": "✅", "drift": "⚠️", "error": "❌"}
+
+        def short(version):
+            return version[:8] if version else "-"
+
+        lines = ["📋 Version drift matrix (GitHub / Azure DevOps / hosts):"]
+        for app, row in matrix["apps"].items():
+            columns = [f"github={short(row['github'])}"]
+            if row["azure"] is not None or "azure" in row["drifted"]:
+                columns.append(f"azure={short(row['azure'])}")
+            columns.extend(f"{host}={short(version)}" for host, version in row["hosts"].items())
+            details = f" ({row['error']})" if row["error"] else (f" (drifted: {', '.join(row['drifted'])})"
+                                                                 if row["drifted"] else "")
+            lines.append(f"   {icons[row['status']]} {app}: {' '.join(columns)} -> {row['status']}{details}")
+        lines.append(
+            f"📋 {matrix['in_sync']}/{len(matrix['apps'])} apps in sync, {matrix['drift']} drifted, "
+            f"{matrix['error']} errors in {matrix['duration']}s"
+        )
+        return lines
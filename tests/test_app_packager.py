@@ -0,0 +1,123 @@
+import sys
+import os
+import hashlib
+import io
+import json
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from app_packager import AppPackager
+
+
+class TestAppPackager(unittest.TestCase):
+    """Tests for reproducible, parallel packaging."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.source_dir = os.path.join(self.workdir.name, "source")
+        self.contents = {
+            "app.py": b"print('hello')\n" * 200,
+            "bin/run.sh": b"#!/bin/sh\nexec python app.py\n",
+            "data/blob.bin": os.urandom(300 * 1024),
+            "data/empty.txt": b"",
+        }
+        for path, data in self.contents.items():
+            self._write(path, data)
+        os.chmod(os.path.join(self.source_dir, "bin", "run.sh"), 0o755)
+        self._write(".git/HEAD", b"ref: refs/heads/main\n")
+        self._write(".commit_sha", b"abc123")
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def _write(self, path, data):
+        full_path = os.path.join(self.source_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(data)
+
+    def _package(self, package_name, output="out", workers=4):
+        packager = AppPackager(self.source_dir, os.path.join(self.workdir.name, output), MagicMock(),
+                               package_name=package_name, workers=workers)
+        with open(packager.create_package(), "rb") as f:
+            return packager, f.read()
+
+    def test_zip_package_contains_the_tree(self):
+        packager, data = self._package("app.zip")
+
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(sorted(archive.namelist()), sorted(self.contents))
+            for path, content in self.contents.items():
+                self.assertEqual(archive.read(path), content)
+            self.assertEqual(archive.getinfo("bin/run.sh").external_attr >> 16 & 0o777, 0o755)
+
+    def test_tar_gz_package_contains_the_tree(self):
+        packager, data = self._package("app.tar.gz")
+
+        with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+            self.assertEqual(sorted(archive.getnames()), sorted(self.contents))
+            for path, content in self.contents.items():
+                self.assertEqual(archive.extractfile(path).read(), content)
+            self.assertEqual(archive.getmember("bin/run.sh").mode, 0o755)
+            self.assertEqual({member.mtime for member in archive.getmembers()}, {packager.epoch})
+
+    def test_packages_are_reproducible(self):
+        """Worker count and file timestamps do not change the package bytes."""
+        for package_name in ("app.zip", "app.tar.gz"):
+            _, first = self._package(package_name, output="first", workers=1)
+            os.utime(os.path.join(self.source_dir, "app.py"), (1, 1))
+            _, second = self._package(package_name, output="second", workers=4)
+            self.assertEqual(first, second, package_name)
+
+    def test_manifest_lists_file_hashes(self):
+        packager, data = self._package("app.tar.gz")
+
+        with open(packager.manifest_path) as f:
+            manifest = json.load(f)
+        hashes = {entry["path"]: entry["sha256"] for entry in manifest["files"]}
+        self.assertEqual(hashes, {path: hashlib.sha256(content).hexdigest() for path, content in self.contents.items()})
+        self.assertEqual(manifest["sha256"], hashlib.sha256(data).hexdigest())
+        self.assertEqual(sum(member["length"] for member in manifest["members"]), len(data))
+
+    def test_rebuild_reuses_members_of_unchanged_files(self):
+        """Only changed files are compressed again and the result matches a clean build."""
+        for package_name in ("app.zip", "app.tar.gz"):
+            self._package(package_name, output="incremental")
+            self._write("app.py", b"print('changed')\n")
+            os.utime(os.path.join(self.source_dir, "data", "empty.txt"), (1, 1))
+
+            packager, rebuilt = self._package(package_name, output="incremental")
+            clean_packager = AppPackager(self.source_dir, os.path.join(self.workdir.name, "clean"), MagicMock(),
+                                         package_name=package_name, incremental=False)
+            with open(clean_packager.create_package(), "rb") as f:
+                self.assertEqual(rebuilt, f.read(), package_name)
+
+            stats = packager.last_stats
+            self.assertGreater(stats["reused_members"], 0, package_name)
+            self.assertLess(stats["compressed_members"], clean_packager.last_stats["compressed_members"], package_name)
+            self._write("app.py", self.contents["app.py"])
+
+    def test_rebuild_ignores_a_package_that_does_not_match_its_manifest(self):
+        packager, _ = self._package("app.zip")
+        with open(packager.package_path, "ab") as f:
+            f.write(b"garbage")
+
+        packager, data = self._package("app.zip")
+        self.assertEqual(packager.last_stats["reused_members"], 0)
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            self.assertIsNone(archive.testzip())
+
+    def test_unsupported_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._package("app.rar")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import sys
+import os
+import tempfile
+import time
+import unittest
+import zipfile
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import artifact_cache
+from artifact_cache import ArtifactCache
+from steps.fetchcodestep import FetchCodeStep
+
+
+class TestArtifactCache(unittest.TestCase):
+    """Tests for the commit-keyed artifact cache."""
+
+    def setUp(self):
+        self.mock_logger = MagicMock()
+        self.workdir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.workdir.name, "cache")
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def _file(self, name, size):
+        path = os.path.join(self.workdir.name, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        return path
+
+    def test_put_then_get_counts_hits_and_bytes_saved(self):
+        """A stored artifact is returned on the next lookup and counted as saved bytes."""
+        cache = ArtifactCache(self.cache_dir, self.mock_logger)
+        key = ArtifactCache.make_key("package", "owner/repo", "abc123", {"format": "zip"})
+
+        self.assertIsNone(cache.get(key))
+        cache.put(key, self._file("app.zip", 100))
+        cached_path = cache.get(key)
+
+        with open(cached_path, "rb") as f:
+            self.assertEqual(f.read(), b"x" * 100)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        self.assertEqual(cache.stats()["bytes_saved"], 100)
+
+    def test_keys_depend_on_every_part(self):
+        """Different commits or packaging parameters produce different keys."""
+        base = ArtifactCache.make_key("package", "owner/repo", "abc123", {"format": "zip"})
+        self.assertNotEqual(base, ArtifactCache.make_key("package", "owner/repo", "def456", {"format": "zip"}))
+        self.assertNotEqual(base, ArtifactCache.make_key("package", "owner/repo", "abc123", {"format": "tar.gz"}))
+        self.assertEqual(base, ArtifactCache.make_key("package", "owner/repo", "abc123", {"format": "zip"}))
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """When the size limit is exceeded, the entry used longest ago is dropped."""
+        cache = ArtifactCache(self.cache_dir, self.mock_logger, max_bytes=250)
+        cache.put("a" * 64, self._file("a", 100))
+        time.sleep(0.01)
+        cache.put("b" * 64, self._file("b", 100))
+        time.sleep(0.01)
+        cache.get("a" * 64)  # `a` is now more recently used than `b`
+        time.sleep(0.01)
+        cache.put("c" * 64, self._file("c", 100))
+
+        self.assertIsNotNone(cache.get("a" * 64))
+        self.assertIsNone(cache.get("b" * 64))
+        self.assertIsNotNone(cache.get("c" * 64))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_new_and_checked_out_entries_are_not_evicted(self):
+        """The entry just added and entries in use survive eviction; files larger than the cache are not cached."""
+        cache = ArtifactCache(self.cache_dir, self.mock_logger, max_bytes=150)
+        cache.put("a" * 64, self._file("a", 100))
+        with cache.checkout("a" * 64) as path:
+            self.assertIsNotNone(cache.put("b" * 64, self._file("b", 100)))
+            self.assertTrue(os.path.exists(path))
+        self.assertIsNotNone(cache.get("b" * 64))
+
+        self.assertIsNone(cache.put("c" * 64, self._file("c", 200)))
+        self.assertIsNone(cache.get("c" * 64))
+        self.assertIsNotNone(cache.get("b" * 64))
+
+    def test_index_persists_between_instances(self):
+        """A new cache instance on the same directory sees earlier entries."""
+        ArtifactCache(self.cache_dir, self.mock_logger).put("k" * 64, self._file("k", 10))
+        self.assertIsNotNone(ArtifactCache(self.cache_dir, self.mock_logger).get("k" * 64))
+
+    @patch("steps.fetchcodestep.GitHubRepositoryManager")
+    def test_fetch_step_skips_download_on_cache_hit(self, mock_manager_class):
+        """The second fetch of an unchanged commit is served from the cache."""
+        manager = mock_manager_class.return_value
+        manager.fetch_latest_commit.return_value = "abc123"
+
+        def download_archive(path, ref=None):
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.writestr("owner-repo-abc123/app.py", "print('hi')")
+
+        manager.download_archive.side_effect = download_archive
+        manager.extract_archive.side_effect = lambda path, target: zipfile.ZipFile(path).extractall(target)
+
+        params = {"repo_owner": "owner", "repo_name": "repo", "cache_dir": self.cache_dir}
+        with patch.dict(artifact_cache._CACHES, clear=True):
+            for target in ("first", "second"):
+                step = FetchCodeStep(self.mock_logger)
+                step.execute("repo", target_directory=os.path.join(self.workdir.name, target), **params)
+
+        self.assertEqual(manager.download_archive.call_count, 1)
+        self.assertEqual(manager.download_archive.call_args.kwargs["ref"], "abc123")
+        self.assertEqual(step.context["commit_sha"], "abc123")
+        self.assertTrue(step.context["source_dir"].endswith("owner-repo-abc123"))
+
+    @patch("steps.fetchcodestep.GitHubRepositoryManager")
+    def test_fetch_step_extracts_archives_too_large_to_cache(self, mock_manager_class):
+        manager = mock_manager_class.return_value
+        manager.fetch_latest_commit.return_value = "abc123"
+
+        def download_archive(path, ref=None):
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.writestr("owner-repo-abc123/app.py", "print('hi')" * 100)
+
+        manager.download_archive.side_effect = download_archive
+        manager.extract_archive.side_effect = lambda path, target: zipfile.ZipFile(path).extractall(target)
+
+        with patch.dict(artifact_cache._CACHES, clear=True):
+            step = FetchCodeStep(self.mock_logger)
+            step.execute("repo", target_directory=os.path.join(self.workdir.name, "target"), repo_owner="owner",
+                         repo_name="repo", cache_dir=self.cache_dir, cache_max_mb=0)
+
+        self.assertTrue(os.path.exists(os.path.join(step.context["source_dir"], "app.py")))
+        self.assertEqual(artifact_cache.get_cache(self.cache_dir, self.mock_logger).stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
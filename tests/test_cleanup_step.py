@@ -0,0 +1,68 @@
+import sys
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from steps.cleanupstep import CleanupStep
+
+
+class TestCleanupStep(unittest.TestCase):
+    """Tests for removing the fetched sources after a run."""
+
+    def setUp(self):
+        self.mock_logger = MagicMock()
+        self.workdir = tempfile.TemporaryDirectory()
+        self.fetch_dir = os.path.join(self.workdir.name, "build", "app")
+        self.source_dir = os.path.join(self.fetch_dir, "owner-app-abc123")
+        os.makedirs(self.source_dir)
+        with open(os.path.join(self.fetch_dir, ".commit_sha"), "w") as f:
+            f.write("abc123")
+        self.package_path = os.path.join(self.workdir.name, "build", "app.zip")
+        with open(self.package_path, "w") as f:
+            f.write("package")
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def _step(self, **context):
+        step = CleanupStep(self.mock_logger)
+        step.context = dict(context)
+        return step
+
+    def test_removes_the_fetched_source_tree(self):
+        """The directory the fetch step extracted is removed; the package stays."""
+        step = self._step(source_dir=self.source_dir, package_path=self.package_path)
+
+        self.assertTrue(step.execute("app"))
+        self.assertFalse(os.path.exists(self.fetch_dir))
+        self.assertTrue(os.path.exists(self.package_path))
+        self.mock_logger.log_info.assert_called()
+
+    def test_leaves_directories_not_created_by_fetch(self):
+        """A `source_dir` without the fetch marker is never removed."""
+        os.remove(os.path.join(self.fetch_dir, ".commit_sha"))
+        step = self._step(source_dir=self.source_dir)
+
+        self.assertTrue(step.execute("app"))
+        self.assertTrue(os.path.isdir(self.source_dir))
+
+    def test_nothing_to_clean_without_fetch(self):
+        """Without fetched sources, or with `remove_sources` off, nothing is removed."""
+        self.assertTrue(self._step().execute("app"))
+        self.assertTrue(self._step(source_dir=self.source_dir).execute("app", remove_sources=False))
+        self.assertTrue(os.path.isdir(self.source_dir))
+
+    def test_removal_error_fails_the_step(self):
+        """An error while removing the sources is logged and fails the step."""
+        step = self._step(source_dir=self.source_dir)
+        with patch("steps.cleanupstep.shutil.rmtree", side_effect=OSError("busy")):
+            self.assertFalse(step.execute("app"))
+        self.mock_logger.log_error.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
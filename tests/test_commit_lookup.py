@@ -0,0 +1,69 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from azure_manager import AzureDevOpsManager
+from github_manager import GitHubRepositoryManager
+
+
+class TestCommitLookup(unittest.TestCase):
+    """Latest-commit lookups request only the newest commit, for the default or a chosen branch."""
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get.return_value.status_code = 200
+
+    def _azure(self, branch=None):
+        return AzureDevOpsManager("https://dev.azure.com/org/repo", "org", "project", "repo", "token",
+                                  MagicMock(), session=self.session, branch=branch)
+
+    def test_github_default_branch_requests_one_commit(self):
+        self.session.get.return_value.json.return_value = [{"sha": "abc123"}]
+        manager = GitHubRepositoryManager("vzlatsin", "app", MagicMock(), session=self.session)
+
+        self.assertEqual(manager.fetch_latest_commit(), "abc123")
+        self.assertEqual(self.session.get.call_args[0][0],
+                         "https://api.github.com/repos/vzlatsin/app/commits?per_page=1")
+        self.assertEqual(manager.archive_url, "https://api.github.com/repos/vzlatsin/app/zipball")
+
+    def test_github_branch_reads_the_head_ref(self):
+        self.session.get.return_value.json.return_value = {
+            "ref": "refs/heads/release/1.2", "object": {"sha": "def456", "type": "commit"}}
+        manager = GitHubRepositoryManager("vzlatsin", "app", MagicMock(), session=self.session, branch="release/1.2")
+
+        self.assertEqual(manager.fetch_latest_commit(), "def456")
+        self.assertEqual(self.session.get.call_args[0][0],
+                         "https://api.github.com/repos/vzlatsin/app/git/ref/heads/release/1.2")
+        self.assertTrue(manager.archive_url.endswith("/zipball/release/1.2"))
+        self.assertTrue(manager.archive_url_for("def456").endswith("/zipball/def456"))
+
+    def test_azure_default_branch_requests_one_commit(self):
+        self.session.get.return_value.json.return_value = {"value": [{"commitId": "abc123"}]}
+        manager = self._azure()
+
+        self.assertEqual(manager.get_latest_commit(), "abc123")
+        self.assertIn("/commits?searchCriteria.$top=1&", self.session.get.call_args[0][0])
+
+    def test_azure_branch_matches_the_exact_ref(self):
+        """The refs filter is a prefix match, so only the exact branch name counts."""
+        self.session.get.return_value.json.return_value = {"value": [
+            {"name": "refs/heads/main-old", "objectId": "old999"},
+            {"name": "refs/heads/main", "objectId": "abc123"},
+        ]}
+        manager = self._azure(branch="main")
+
+        self.assertEqual(manager.get_latest_commit(), "abc123")
+        self.assertIn("/refs?filter=heads/main&", self.session.get.call_args[0][0])
+
+    def test_azure_missing_branch_returns_none(self):
+        self.session.get.return_value.json.return_value = {"value": [{"name": "refs/heads/main-old",
+                                                                      "objectId": "old999"}]}
+        self.assertIsNone(self._azure(branch="main").get_latest_commit())
+
+
+if __name__ == "__main__":
+    unittest.main()
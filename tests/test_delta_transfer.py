@@ -0,0 +1,103 @@
+import sys
+import os
+import random
+import shutil
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from delta_remote import patch as apply_delta
+from delta_transfer import DeltaTransfer, compute_delta, local_signature
+
+
+class LocalDeployer:
+    """Deployer stand-in that runs remote commands in a local shell and copies uploads."""
+
+    server_address = "ldctlm01"
+
+    def __init__(self):
+        self.uploads = []
+
+    def run_command(self, command):
+        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        return result.returncode, result.stdout, result.stderr
+
+    def upload_file(self, local_path, remote_path, **transfer_options):
+        self.uploads.append((remote_path, os.path.getsize(local_path)))
+        shutil.copyfile(local_path, remote_path)
+
+
+class TestDeltaTransfer(unittest.TestCase):
+    """Tests for rsync-style delta uploads."""
+
+    block_size = 4096
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        rng = random.Random(7)
+        self.old_data = bytes(rng.getrandbits(8) for _ in range(300 * 1024))
+        # Shift everything after 10 KB by inserting bytes, and rewrite a region further on
+        self.new_data = (self.old_data[:10000] + b"inserted" + self.old_data[10000:150000]
+                         + b"x" * 5000 + self.old_data[155000:])
+        self.old_path = self._write("old.tar.gz", self.old_data)
+        self.new_path = self._write("new.tar.gz", self.new_data)
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def _write(self, name, data):
+        path = os.path.join(self.workdir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_delta_roundtrip_survives_shifted_content(self):
+        """Blocks are matched at unaligned offsets and the patch rebuilds the new file."""
+        delta_path = os.path.join(self.workdir.name, "app.delta")
+        output_path = os.path.join(self.workdir.name, "rebuilt.tar.gz")
+
+        literal_bytes, matched_blocks = compute_delta(
+            self.new_path, local_signature(self.old_path, self.block_size), self.block_size, delta_path)
+        apply_delta(self.old_path, delta_path, output_path)
+
+        with open(output_path, "rb") as f:
+            self.assertEqual(f.read(), self.new_data)
+        self.assertLess(literal_bytes, 20 * 1024)
+        self.assertGreater(matched_blocks, 65)
+        self.assertLess(os.path.getsize(delta_path), 20 * 1024)
+
+    def test_unrelated_data_is_not_worth_a_delta(self):
+        delta_path = os.path.join(self.workdir.name, "app.delta")
+        unrelated_path = self._write("unrelated.tar.gz", os.urandom(len(self.new_data)))
+        self.assertIsNone(compute_delta(unrelated_path, local_signature(self.old_path, self.block_size),
+                                        self.block_size, delta_path, max_literal_ratio=0.5))
+
+    def test_upload_patches_the_remote_copy(self):
+        """Only the delta is uploaded and the remote file ends up identical."""
+        deployer = LocalDeployer()
+        remote_path = self._write("remote.tar.gz", self.old_data)
+
+        stats = DeltaTransfer(deployer, MagicMock(), block_size=self.block_size).upload(self.new_path, remote_path)
+
+        with open(remote_path, "rb") as f:
+            self.assertEqual(f.read(), self.new_data)
+        self.assertTrue(stats["delta"])
+        self.assertEqual(deployer.uploads, [(f"{remote_path}.delta", stats["bytes_sent"])])
+        self.assertFalse(os.path.exists(f"{remote_path}.delta"))
+
+    def test_upload_without_basis_sends_the_full_package(self):
+        deployer = LocalDeployer()
+        remote_path = os.path.join(self.workdir.name, "missing.tar.gz")
+
+        stats = DeltaTransfer(deployer, MagicMock(), block_size=self.block_size).upload(self.new_path, remote_path)
+
+        self.assertFalse(stats["delta"])
+        self.assertEqual(deployer.uploads, [(remote_path, len(self.new_data))])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deploy_client import DaemonClient
+from deploy_daemon import DeploymentDaemon, serve
+
+
+class FakeOrchestrator:
+    """Orchestrator stand-in whose jobs take `delay` seconds and fail for app 'broken'."""
+
+    STEPS = ("fetch", "package", "deploy")
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.forced = []
+        self.active_apps = []
+        self.overlapped = False
+
+    def known_steps(self, steps):
+        return [step for step in steps if step in self.STEPS]
+
+    def for_job(self, force=False):
+        self.forced.append(force)
+        return self
+
+    def execute_for_apps(self, steps, apps, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.overlapped = self.overlapped or any(app in self.active_apps for app in apps)
+            self.active_apps.extend(apps)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            for app in apps:
+                self.active_apps.remove(app)
+        return {app: {"status": "failed" if app == "broken" else "success", "executed_steps": steps,
+                      "duration": self.delay, "error": None} for app in apps}
+
+
+class TestDeploymentDaemon(unittest.TestCase):
+    """Tests for queued deployment jobs in a long-lived process."""
+
+    def wait_for(self, daemon, job_id):
+        deadline = time.time() + 5
+        while daemon.status(job_id)["status"] not in ("succeeded", "failed") and time.time() < deadline:
+            time.sleep(0.01)
+        return daemon.status(job_id)
+
+    def test_jobs_run_within_the_concurrency_limit(self):
+        orchestrator = FakeOrchestrator(delay=0.05)
+        daemon = DeploymentDaemon(orchestrator, MagicMock(), max_concurrent_jobs=2)
+        daemon.start()
+
+        jobs = [daemon.submit(["deploy"], [f"app{i}"]) for i in range(5)]
+        finished = [self.wait_for(daemon, job["id"]) for job in jobs]
+        daemon.stop()
+
+        self.assertEqual([job["status"] for job in finished], ["succeeded"] * 5)
+        self.assertEqual(orchestrator.peak, 2)
+        self.assertEqual(finished[0]["results"]["app0"]["executed_steps"], ["deploy"])
+
+    def test_failed_app_fails_the_job(self):
+        daemon = DeploymentDaemon(FakeOrchestrator(), MagicMock())
+        daemon.start()
+        job = self.wait_for(daemon, daemon.submit(["deploy"], ["app", "broken"])["id"])
+        daemon.stop()
+        self.assertEqual(job["status"], "failed")
+
+    def test_jobs_sharing_an_app_do_not_overlap(self):
+        orchestrator = FakeOrchestrator(delay=0.05)
+        daemon = DeploymentDaemon(orchestrator, MagicMock(), max_concurrent_jobs=3)
+        daemon.start()
+
+        jobs = [daemon.submit(["deploy"], ["shared", "app1"]), daemon.submit(["deploy"], ["app2", "shared"]),
+                daemon.submit(["deploy"], ["app3"])]
+        finished = [self.wait_for(daemon, job["id"]) for job in jobs]
+        daemon.stop()
+
+        self.assertEqual([job["status"] for job in finished], ["succeeded"] * 3)
+        self.assertFalse(orchestrator.overlapped)
+        self.assertEqual(orchestrator.peak, 2)
+        self.assertGreaterEqual(finished[1]["started_at"], finished[0]["finished_at"])
+
+    def test_jobs_for_idle_apps_are_not_held_up_by_a_busy_app(self):
+        """With the shared app busy, a free worker runs the next job for another app instead of waiting."""
+        orchestrator = FakeOrchestrator(delay=0.2)
+        daemon = DeploymentDaemon(orchestrator, MagicMock(), max_concurrent_jobs=2)
+        daemon.start()
+
+        first = daemon.submit(["deploy"], ["shared"])
+        second = daemon.submit(["deploy"], ["shared"])
+        other = daemon.submit(["deploy"], ["other"])
+        finished = {job["id"]: self.wait_for(daemon, job["id"]) for job in (first, second, other)}
+        daemon.stop()
+
+        self.assertLess(finished[other["id"]]["started_at"], finished[first["id"]]["finished_at"])
+        self.assertGreaterEqual(finished[second["id"]]["started_at"], finished[first["id"]]["finished_at"])
+        self.assertFalse(orchestrator.overlapped)
+
+    def test_oldest_finished_jobs_are_evicted(self):
+        daemon = DeploymentDaemon(FakeOrchestrator(), MagicMock(), max_concurrent_jobs=1, max_finished_jobs=2)
+        daemon.start()
+
+        jobs = [daemon.submit(["deploy"], [f"app{i}"]) for i in range(4)]
+        self.wait_for(daemon, jobs[-1]["id"])
+        daemon.stop()
+
+        self.assertEqual([job["id"] for job in daemon.list_jobs()], [job["id"] for job in jobs[2:]])
+        self.assertIsNone(daemon.status(jobs[0]["id"]))
+
+    def test_invalid_jobs_are_rejected(self):
+        daemon = DeploymentDaemon(FakeOrchestrator(), MagicMock())
+        with self.assertRaises(ValueError):
+            daemon.submit([], ["app"])
+
+    def test_jobs_need_lists_of_names(self):
+        daemon = DeploymentDaemon(FakeOrchestrator(), MagicMock())
+        for steps, apps in (("deploy", ["web"]), (["deploy"], "web"), (["deploy", 3], ["web"]),
+                            (["deploy"], [""]), (None, ["web"])):
+            with self.assertRaisesRegex(ValueError, "must be a non-empty list of names"):
+                daemon.submit(steps, apps)
+        self.assertEqual(daemon.list_jobs(), [])
+
+    def test_unknown_steps_are_rejected(self):
+        daemon = DeploymentDaemon(FakeOrchestrator(), MagicMock())
+        with self.assertRaisesRegex(ValueError, "unknown steps: deploi"):
+            daemon.submit(["fetch", "deploi"], ["web"])
+
+    def test_max_workers_must_be_a_positive_integer(self):
+        daemon = DeploymentDaemon(FakeOrchestrator(), MagicMock())
+        for max_workers in (0, -1, "4", 2.5, True):
+            with self.assertRaisesRegex(ValueError, "max_workers must be a positive integer"):
+                daemon.submit(["deploy"], ["web"], max_workers=max_workers)
+
+
+class TestDaemonHTTPAPI(unittest.TestCase):
+    """The thin client talks to the daemon over its local HTTP API."""
+
+    def setUp(self):
+        self.orchestrator = FakeOrchestrator(delay=0.02)
+        self.daemon = DeploymentDaemon(self.orchestrator, MagicMock(), max_concurrent_jobs=1, max_queued_jobs=2)
+        self.daemon.start()
+        self.server = serve(self.daemon, port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = DaemonClient(f"http://127.0.0.1:{self.server.server_address[1]}")
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.daemon.stop()
+
+    def test_submit_wait_and_list(self):
+        job = self.client.submit(["fetch", "deploy"], ["app1", "app2"], force=True)
+        self.assertEqual(job["status"], "queued")
+
+        finished = self.client.wait(job["id"], poll_interval=0.01)
+
+        self.assertEqual(finished["status"], "succeeded")
+        self.assertEqual(set(finished["results"]), {"app1", "app2"})
+        self.assertEqual(self.orchestrator.forced, [True])
+        self.assertEqual([entry["id"] for entry in self.client.list_jobs()], [job["id"]])
+        self.assertEqual(self.client.health()["jobs"], {"succeeded": 1})
+
+    def test_errors_are_reported(self):
+        with self.assertRaisesRegex(RuntimeError, "HTTP 404"):
+            self.client.status("missing")
+        with self.assertRaisesRegex(RuntimeError, "HTTP 400"):
+            self.client.submit([], ["app"])
+        for body in (["deploy"], "deploy", 3):
+            with self.assertRaisesRegex(RuntimeError, "HTTP 400.*expected a JSON object"):
+                self.client._request("POST", "/jobs", body)
+        with self.assertRaisesRegex(RuntimeError, "HTTP 400.*steps must be a non-empty list"):
+            self.client._request("POST", "/jobs", {"steps": "deploy", "apps": "web"})
+        with self.assertRaisesRegex(RuntimeError, "HTTP 400.*unknown steps"):
+            self.client.submit(["deploi"], ["web"])
+        with self.assertRaisesRegex(RuntimeError, "HTTP 400.*max_workers"):
+            self.client.submit(["deploy"], ["web"], max_workers="4")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import deployment_config
+from deployment_config import ConfigError, StepParameters, load_step_parameters, load_steps_config
+from deployment_orchestrator import DeploymentOrchestrator
+from host_rollout import resolve_targets
+
+
+class TestDeploymentConfig(unittest.TestCase):
+    """Tests for cached, validated and compiled configuration loading."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.config_dir = self.workdir.name
+        self.write("steps_config", {"fetch": "FetchCodeStep", "deploy": "DeployToTargetStep"})
+        self.write("step_parameters", {
+            "fetch": {"repo_name": "{app}", "target_directory": "build/{app}/source", "retry_count": 3},
+            "deploy": {"target": "host1", "remote_package_path": "/srv/{app}.tar.gz", "pattern": "{{app}}"},
+        })
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def write(self, name, config):
+        path = os.path.join(self.config_dir, f"{name}.json")
+        with open(path, "w") as f:
+            json.dump(config, f)
+        # Make a rewrite within the same mtime tick visible, like a later edit would be
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_parameters_are_formatted_per_app(self):
+        parameters = load_step_parameters(config_dir=self.config_dir)
+        self.assertEqual(parameters.for_app("fetch", "billing"),
+                         {"repo_name": "billing", "target_directory": "build/billing/source", "retry_count": 3})
+        self.assertEqual(parameters.for_app("deploy", "billing")["pattern"], "{app}")
+        self.assertEqual(parameters.for_app("unknown", "billing"), {})
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        first = load_step_parameters(config_dir=self.config_dir)
+        with patch("deployment_config.json.loads") as loads:
+            self.assertIs(load_step_parameters(config_dir=self.config_dir), first)
+            loads.assert_not_called()
+
+        self.write("step_parameters", {"fetch": {"repo_name": "renamed-{app}"}})
+        self.assertEqual(load_step_parameters(config_dir=self.config_dir).for_app("fetch", "a"),
+                         {"repo_name": "renamed-a"})
+
+    def test_touched_file_with_same_content_keeps_compiled_parameters(self):
+        first = load_step_parameters(config_dir=self.config_dir)
+        path = os.path.join(self.config_dir, "step_parameters.json")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIs(load_step_parameters(config_dir=self.config_dir), first)
+
+    def test_environment_overlay_is_merged(self):
+        self.write("step_parameters.prod", {"deploy": {"target": "prod-host"},
+                                            "apps": {"billing": {"deploy": {"target": "billing-host"}}}})
+        parameters = load_step_parameters("prod", config_dir=self.config_dir)
+        self.assertEqual(parameters.for_app("deploy", "web")["target"], "prod-host")
+        self.assertEqual(parameters.for_app("deploy", "web")["remote_package_path"], "/srv/web.tar.gz")
+        self.assertEqual(parameters.for_app("deploy", "billing")["target"], "billing-host")
+        self.assertEqual(load_step_parameters(config_dir=self.config_dir).for_app("deploy", "web")["target"], "host1")
+
+        with self.assertRaises(ConfigError):
+            load_step_parameters("staging", config_dir=self.config_dir)
+
+    def test_host_groups_are_accepted(self):
+        self.write("step_parameters", {
+            "deploy": {"host_group": "web", "host_groups": {"web": ["web1", "web2"], "batch": ["batch1"]}},
+            "apps": {"billing": {"deploy": {"host_groups": {"web": ["billing-web1"]}}}},
+        })
+        parameters = load_step_parameters(config_dir=self.config_dir)
+        self.assertEqual(resolve_targets(parameters.for_app("deploy", "web")), ["web1", "web2"])
+        self.assertEqual(resolve_targets(parameters.for_app("deploy", "billing")), ["billing-web1"])
+
+        self.write("step_parameters", {"deploy": {"host_groups": {"web": "web1", "batch": ["batch1", 2]}}})
+        with self.assertRaises(ConfigError) as raised:
+            load_step_parameters(config_dir=self.config_dir)
+        self.assertIn("deploy.host_groups.web: expected a list of host names", str(raised.exception))
+        self.assertIn("deploy.host_groups.batch: expected a list of host names", str(raised.exception))
+
+    def test_invalid_configuration_is_rejected(self):
+        self.write("step_parameters", {"fetch": {"repo_name": "{application}", "retry_count": "3"},
+                                       "deploy": ["not", "an", "object"]})
+        with self.assertRaises(ConfigError) as raised:
+            load_step_parameters(config_dir=self.config_dir)
+        message = str(raised.exception)
+        self.assertIn("fetch.repo_name: unknown placeholder {application}", message)
+        self.assertIn("fetch.retry_count: expected int", message)
+        self.assertIn("deploy: expected an object", message)
+
+        self.write("step_parameters", {"http": {"pool_maxsize": "32", "proxy": "http://proxy"}})
+        with self.assertRaises(ConfigError) as raised:
+            load_step_parameters(config_dir=self.config_dir)
+        self.assertIn("http.pool_maxsize: expected a number", str(raised.exception))
+        self.assertIn("http.proxy: unknown option", str(raised.exception))
+
+        self.write("steps_config", {"fetch": "steps.FetchCodeStep"})
+        with self.assertRaises(ConfigError):
+            load_steps_config(config_dir=self.config_dir)
+
+    def test_orchestrator_uses_compiled_parameters(self):
+        orchestrator = DeploymentOrchestrator(MagicMock(), run_state_dir=None)
+        self.assertEqual(orchestrator._format_params("fetch", "billing")["repo_name"], "billing")
+
+        orchestrator.step_parameters = {"package": {"package_name": "{app}.tar.gz"}}
+        self.assertEqual(orchestrator._format_params("package", "web"), {"package_name": "web.tar.gz"})
+        self.assertIsInstance(orchestrator.for_job().parameters, StepParameters)
+        self.assertIs(orchestrator.for_job().parameters, orchestrator.parameters)
+
+    def test_missing_files_are_reported(self):
+        logger = MagicMock()
+        with patch.object(deployment_config, "CONFIG_DIR", os.path.join(self.config_dir, "missing")):
+            orchestrator = DeploymentOrchestrator(logger, run_state_dir=None)
+        self.assertEqual(orchestrator.step_config, {})
+        self.assertEqual(orchestrator.step_parameters, {})
+        self.assertTrue(any("not found" in call.args[0] for call in logger.log_error.call_args_list))
+
+
+if __name__ == "__main__":
+    unittest.main()
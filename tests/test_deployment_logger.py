@@ -0,0 +1,83 @@
+import sys
+import os
+import json
+import logging
+import tempfile
+import threading
+import unittest
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deployment_logger import DeploymentLogger, LOGGER_NAME, log_context, shutdown_logging
+
+
+class CountingValue:
+    """Counts how often it is converted to a string."""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "value"
+
+
+class TestDeploymentLogger(unittest.TestCase):
+    """Tests for handler setup, lazy formatting and structured JSON records."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.workdir.name, "logs", "deploy.log")
+
+    def tearDown(self):
+        shutdown_logging()
+        self.workdir.cleanup()
+
+    def read_records(self):
+        shutdown_logging()
+        with open(self.log_file, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_handlers_are_not_duplicated(self):
+        DeploymentLogger(console=False, log_file=self.log_file)
+        handlers = list(logging.getLogger(LOGGER_NAME).handlers)
+        for _ in range(3):
+            DeploymentLogger()
+
+        self.assertEqual(logging.getLogger(LOGGER_NAME).handlers, handlers)
+
+    def test_suppressed_debug_arguments_are_not_formatted(self):
+        logger = DeploymentLogger(console=False)
+        value = CountingValue()
+
+        logger.log_debug("🔹 Parameters: %s", value)
+
+        self.assertEqual(value.formatted, 0)
+
+    def test_queued_json_records_carry_context_and_fields(self):
+        logger = DeploymentLogger(json_format=True, use_queue=True, console=False, log_file=self.log_file)
+
+        def deploy(app):
+            with log_context(run_id="run1", app=app, step="deploy"):
+                logger.log_info("Deployed %s", app, duration=1.5, host=f"{app}-host")
+
+        threads = [threading.Thread(target=deploy, args=(f"app{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.log_warning("done")
+
+        records = self.read_records()
+        self.assertEqual(len(records), 5)
+        by_app = {record.get("app"): record for record in records}
+        self.assertEqual(by_app["app2"]["message"], "Deployed app2")
+        self.assertEqual(by_app["app2"]["host"], "app2-host")
+        self.assertEqual(by_app["app2"]["run_id"], "run1")
+        self.assertEqual(by_app["app2"]["duration"], 1.5)
+        self.assertEqual(by_app[None]["level"], "WARNING")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deployment_orchestrator import DeploymentOrchestrator
+from deployment_steps import DeploymentStep, STEP_REGISTRY
+
+
+class RecordingStep(DeploymentStep):
+    """Test step that records the apps it ran for and fails for app 'broken'."""
+    calls = []
+    lock = threading.Lock()
+
+    def execute(self, app=None, **kwargs):
+        time.sleep(0.05)
+        with self.lock:
+            RecordingStep.calls.append(app)
+        return app != "broken"
+
+
+class TestDeploymentOrchestrator(unittest.TestCase):
+    """Tests for running the step pipeline for several apps in one process."""
+
+    def setUp(self):
+        self.mock_logger = MagicMock()
+        self.saved_registry = dict(STEP_REGISTRY)
+        self.orchestrator = DeploymentOrchestrator(self.mock_logger)
+        STEP_REGISTRY["record"] = lambda logger: RecordingStep(logger)
+        RecordingStep.calls = []
+
+    def tearDown(self):
+        STEP_REGISTRY.clear()
+        STEP_REGISTRY.update(self.saved_registry)
+
+    def test_execute_for_apps_aggregates_results(self):
+        """Each app gets its own result entry and failures do not affect other apps."""
+        results = self.orchestrator.execute_for_apps(["record"], ["app1", "broken", "app2"], max_parallel_apps=3)
+
+        self.assertEqual(results["app1"]["status"], "success")
+        self.assertEqual(results["app2"]["status"], "success")
+        self.assertEqual(results["broken"]["status"], "failed")
+        self.assertEqual(results["app1"]["executed_steps"], ["record"])
+        self.assertEqual(results["broken"]["executed_steps"], [])
+        self.assertEqual(sorted(RecordingStep.calls), ["app1", "app2", "broken"])
+
+    def test_execute_for_apps_respects_concurrency_limit(self):
+        """Apps run concurrently, bounded by max_parallel_apps."""
+        apps = [f"app{i}" for i in range(4)]
+
+        start = time.perf_counter()
+        self.orchestrator.execute_for_apps(["record"], apps, max_parallel_apps=4)
+        parallel_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.orchestrator.execute_for_apps(["record"], apps, max_parallel_apps=1)
+        serial_time = time.perf_counter() - start
+
+        self.assertLess(parallel_time, serial_time)
+
+    def test_execute_for_apps_reports_exceptions(self):
+        """A step that raises marks only that app as failed."""
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        STEP_REGISTRY["explode"] = lambda logger: MagicMock(execute=failing, depends_on=())
+
+        results = self.orchestrator.execute_for_apps(["explode"], ["app1"])
+        self.assertEqual(results["app1"]["status"], "failed")
+        self.assertEqual(results["app1"]["error"], "boom")
+
+
+if __name__ == "__main__":
+    unittest.main()
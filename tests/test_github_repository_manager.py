@@ -6,9 +6,10 @@ import io
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
 import zipfile
+import tempfile
 
 import unittest
-from unittest.mock import patch  # Import `patch` to mock API calls
+from unittest.mock import MagicMock, patch  # Import `patch` to mock API calls
 import requests
 from github_manager import GitHubRepositoryManager
 from deployment_logger import DeploymentLogger  # Import logger
@@ -109,5 +110,84 @@ class TestGitHubRepositoryManager(unittest.TestCase):
                 self.manager.download_repository("/fake/path")
             self.assertIn("Invalid ZIP file received", str(context.exception))
 
+    def _streamed_response(self, status_code, chunks, error=None, headers=None):
+        """Builds a mock streaming response yielding `chunks`, optionally raising `error` afterwards."""
+        def iter_content(chunk_size=None):
+            for chunk in chunks:
+                yield chunk
+            if error is not None:
+                raise error
+
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.status_code = status_code
+        response.headers = headers or {}
+        response.iter_content.side_effect = iter_content
+        return response
+
+    @patch("github_manager.requests.get")
+    def test_download_repository_streaming_resumes_with_range(self, mock_get):
+        """An interrupted streaming download resumes from the last byte with a Range request."""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+            zip_file.writestr("repo-main/dummy.txt", "This is a test file." * 100)
+        data = zip_buffer.getvalue()
+        split = len(data) // 2
+
+        mock_get.side_effect = [
+            self._streamed_response(200, [data[:split]], requests.exceptions.ChunkedEncodingError("dropped"),
+                                    headers={"Content-Length": str(len(data)), "ETag": '"v1"'}),
+            self._streamed_response(206, [data[split:]],
+                                    headers={"Content-Range": f"bytes {split}-{len(data) - 1}/{len(data)}"}),
+        ]
+
+        with tempfile.TemporaryDirectory() as target:
+            self.manager.download_repository(target, streaming=True)
+            with open(os.path.join(target, "repo-main", "dummy.txt")) as f:
+                self.assertEqual(f.read(), "This is a test file." * 100)
+
+        self.assertEqual(mock_get.call_args_list[1][1]["headers"]["Range"], f"bytes={split}-")
+        self.assertEqual(mock_get.call_args_list[1][1]["headers"]["If-Range"], '"v1"')
+        self.assertEqual({call[1]["timeout"] for call in mock_get.call_args_list}, {self.manager.timeout})
+        self.assertEqual(self.manager.last_download_stats["resumes"], 1)
+        self.assertEqual(self.manager.last_download_stats["bytes"], len(data))
+
+    @patch("github_manager.requests.get")
+    def test_download_repository_streaming_restarts_when_resume_is_unsafe(self, mock_get):
+        """Without a validator, or with a Content-Range that does not continue the file, the download restarts."""
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+            zip_file.writestr("repo-main/dummy.txt", "This is a test file." * 100)
+        data = zip_buffer.getvalue()
+        split = len(data) // 2
+        dropped = requests.exceptions.ChunkedEncodingError("dropped")
+
+        mock_get.side_effect = [
+            self._streamed_response(200, [data[:split]], dropped, headers={"ETag": '"v1"'}),
+            self._streamed_response(206, [b"spliced"], headers={"Content-Range": f"bytes 0-6/{len(data)}"}),
+            self._streamed_response(200, [data[:split]], dropped),
+            self._streamed_response(200, [data]),
+        ]
+
+        with tempfile.TemporaryDirectory() as target:
+            self.manager.download_repository(target, streaming=True)
+            with open(os.path.join(target, "repo-main", "dummy.txt")) as f:
+                self.assertEqual(f.read(), "This is a test file." * 100)
+
+        self.assertNotIn("Range", mock_get.call_args_list[2][1]["headers"])
+        self.assertNotIn("Range", mock_get.call_args_list[3][1]["headers"])
+        self.assertEqual(self.manager.last_download_stats["bytes"], len(data))
+
+    @patch("github_manager.requests.get")
+    def test_download_repository_streaming_api_failure(self, mock_get):
+        """Streaming mode raises the same error as the in-memory path on HTTP failures."""
+        mock_get.return_value = self._streamed_response(500, [])
+        mock_get.return_value.text = "Internal Server Error"
+
+        with tempfile.TemporaryDirectory() as target:
+            with self.assertRaises(Exception) as context:
+                self.manager.download_repository(target, streaming=True)
+        self.assertIn("Failed to download repository", str(context.exception))
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)  # Run tests with detailed output
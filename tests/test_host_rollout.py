@@ -0,0 +1,161 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from host_rollout import HostRollout
+from steps.deploytotargetstep import DeployToTargetStep
+
+
+class TestHostRollout(unittest.TestCase):
+    """Tests for canary-first, batched multi-host rollouts."""
+
+    hosts = [f"host{i}" for i in range(1, 8)]
+
+    def test_plan_puts_canaries_first(self):
+        rollout = HostRollout(MagicMock(), canary_count=1, batch_size=3)
+        self.assertEqual(rollout.plan(self.hosts),
+                         [["host1"], ["host2", "host3", "host4"], ["host5", "host6", "host7"]])
+
+    def test_single_host_has_no_canary(self):
+        self.assertEqual(HostRollout(MagicMock(), canary_count=2).plan(["host1"]), [["host1"]])
+
+    def test_max_in_flight_limits_concurrency(self):
+        """No more than `max_in_flight` hosts are deployed at the same time."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def deploy_host(host):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return True
+
+        report = HostRollout(MagicMock(), max_in_flight=2, canary_count=0).run(self.hosts, deploy_host)
+
+        self.assertEqual(state["peak"], 2)
+        self.assertEqual(report["succeeded"], 7)
+        self.assertFalse(report["aborted"])
+
+    def test_failed_canary_stops_the_rollout(self):
+        deployed = []
+
+        def deploy_host(host):
+            deployed.append(host)
+            return host != "host1"
+
+        report = HostRollout(MagicMock(), canary_count=1, max_failure_ratio=0.5).run(self.hosts, deploy_host)
+
+        self.assertEqual(deployed, ["host1"])
+        self.assertTrue(report["aborted"])
+        self.assertEqual(report["skipped"], 6)
+        self.assertEqual(report["hosts"]["host1"]["status"], "failed")
+
+    def test_failure_ratio_stops_later_batches(self):
+        """Batches stop once failures exceed the allowed ratio; errors are recorded per host."""
+        def deploy_host(host):
+            if host in ("host2", "host3"):
+                raise IOError("connection refused")
+            return True
+
+        report = HostRollout(MagicMock(), canary_count=1, batch_size=3, max_failure_ratio=0.25).run(self.hosts, deploy_host)
+
+        self.assertTrue(report["aborted"])
+        self.assertEqual((report["succeeded"], report["failed"], report["skipped"]), (2, 2, 3))
+        self.assertEqual(report["hosts"]["host2"]["error"], "connection refused")
+        self.assertEqual(report["hosts"]["host7"]["batch"], 3)
+
+    def test_failure_ratio_is_checked_as_hosts_complete(self):
+        """Without batches, failures still stop hosts that have not been started yet."""
+        deployed = []
+
+        def deploy_host(host):
+            deployed.append(host)
+            return host not in ("host2", "host3", "host4", "host5")
+
+        report = HostRollout(MagicMock(), max_in_flight=1, canary_count=1, max_failure_ratio=0.5).run(
+            self.hosts, deploy_host)
+
+        # 3 of the 6 hosts after the canary is still within 50%, the fourth failure is not
+        self.assertEqual(deployed, ["host1", "host2", "host3", "host4", "host5"])
+        self.assertTrue(report["aborted"])
+        self.assertEqual((report["succeeded"], report["failed"], report["skipped"]), (1, 4, 2))
+        self.assertEqual(list(report["hosts"]), self.hosts)
+
+    def test_one_early_failure_does_not_stop_a_large_rollout(self):
+        """The ratio is failures out of all non-canary hosts, not out of the hosts finished so far."""
+        hosts = [f"host{i}" for i in range(1, 21)]
+
+        def deploy_host(host):
+            return host != "host2"
+
+        report = HostRollout(MagicMock(), max_in_flight=1, canary_count=1, max_failure_ratio=0.1).run(
+            hosts, deploy_host)
+
+        self.assertFalse(report["aborted"])
+        self.assertEqual((report["succeeded"], report["failed"], report["skipped"]), (19, 1, 0))
+
+        report = HostRollout(MagicMock(), max_in_flight=1, canary_count=1, max_failure_ratio=0.1).run(
+            hosts, lambda host: host not in ("host2", "host3"))
+        self.assertTrue(report["aborted"])  # 2 of 19 is over 10%
+        self.assertEqual((report["failed"], report["skipped"]), (2, 17))
+
+    def test_invalid_settings_are_rejected(self):
+        with self.assertRaises(ValueError):
+            HostRollout(MagicMock(), max_in_flight=0)
+        with self.assertRaises(ValueError):
+            HostRollout(MagicMock(), max_failure_ratio=2)
+
+
+class TestDeployToTargetStepRollout(unittest.TestCase):
+    """Tests for deploying one package to several targets."""
+
+    params = {"local_package_path": "build/app.tar.gz", "remote_package_path": "/deployments/app.tar.gz"}
+
+    def test_targets_are_resolved_from_lists_and_groups(self):
+        targets = DeployToTargetStep.resolve_targets({
+            "target": "ldctlm01", "targets": ["ldctlm02", "ldctlm01"],
+            "host_group": "prod", "host_groups": {"prod": ["ldctlm03"]},
+        })
+        self.assertEqual(targets, ["ldctlm01", "ldctlm02", "ldctlm03"])
+
+    def test_unknown_host_group_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DeployToTargetStep.resolve_targets({"host_group": "prod"})
+
+    def test_unknown_host_group_fails_the_step(self):
+        logger = MagicMock()
+        self.assertFalse(DeployToTargetStep(logger).execute("app", host_group="prod", **self.params))
+        logger.log_error.assert_called_once_with("❌ Unknown host group: prod")
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("steps.deploytotargetstep.os.system", return_value=0)
+    def test_every_target_is_deployed_and_reported(self, mock_system):
+        step = DeployToTargetStep(MagicMock())
+
+        self.assertTrue(step.execute("app", target=["ldctlm01", "ldctlm02", "ldctlm03"], **self.params))
+
+        self.assertEqual(mock_system.call_count, 3)
+        self.assertEqual(step.context["rollout"]["succeeded"], 3)
+        self.assertEqual(set(step.context["rollout"]["hosts"]), {"ldctlm01", "ldctlm02", "ldctlm03"})
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("steps.deploytotargetstep.os.system", return_value=1)
+    def test_failed_rollout_fails_the_step(self, mock_system):
+        step = DeployToTargetStep(MagicMock())
+
+        self.assertFalse(step.execute("app", targets=["ldctlm01", "ldctlm02"], **self.params))
+        self.assertEqual(mock_system.call_count, 1)
+        self.assertTrue(step.context["rollout"]["aborted"])
+
+
+if __name__ == "__main__":
+    unittest.main()
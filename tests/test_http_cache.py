@@ -0,0 +1,113 @@
+import sys
+import os
+import json
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from http_cache import HTTPCache
+from github_manager import GitHubRepositoryManager
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = json.dumps(payload) if payload is not None else ""
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeAPI:
+    """Answers 304 when the request carries the current ETag, like GitHub does."""
+
+    def __init__(self, payload, etag='"v1"'):
+        self.payload = payload
+        self.etag = etag
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return FakeResponse(304, headers={"ETag": self.etag})
+        return FakeResponse(200, self.payload, headers={"ETag": self.etag, "X-RateLimit-Remaining": "4999"})
+
+
+class TestHTTPCache(unittest.TestCase):
+    """Tests for the conditional-request API cache."""
+
+    url = "https://api.github.com/repos/vzlatsin/app/commits"
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.api = FakeAPI([{"sha": "abc123"}])
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def _cache(self, **options):
+        return HTTPCache(self.workdir.name, MagicMock(), **options)
+
+    def test_fresh_entry_is_served_without_a_request(self):
+        cache = self._cache(ttl=60)
+        cache.get(self.url, http=self.api)
+        response = cache.get(self.url, http=self.api)
+
+        self.assertTrue(response.from_cache)
+        self.assertEqual(response.json(), [{"sha": "abc123"}])
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["rate_limit_remaining"], 4999)
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        """After the TTL the request carries If-None-Match and a 304 reuses the stored body."""
+        self._cache(ttl=0).get(self.url, http=self.api)
+        cache = self._cache(ttl=0)  # A new process reads the persisted entry
+        response = cache.get(self.url, http=self.api)
+
+        self.assertEqual(self.api.requests[-1]["If-None-Match"], '"v1"')
+        self.assertEqual(response.json(), [{"sha": "abc123"}])
+        self.assertEqual(cache.stats()["revalidated"], 1)
+
+    def test_changed_resource_replaces_the_entry(self):
+        cache = self._cache(ttl=0)
+        cache.get(self.url, http=self.api)
+        self.api.payload, self.api.etag = [{"sha": "def456"}], '"v2"'
+
+        self.assertEqual(cache.get(self.url, http=self.api).json(), [{"sha": "def456"}])
+        self.assertEqual(cache.get(self.url, http=self.api).json(), [{"sha": "def456"}])
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_credentials_are_part_of_the_key(self):
+        cache = self._cache(ttl=60)
+        cache.get(self.url, headers={"Authorization": "token a"}, http=self.api)
+        cache.get(self.url, headers={"Authorization": "token b"}, http=self.api)
+        self.assertEqual(len(self.api.requests), 2)
+
+    def test_least_recently_validated_entries_are_evicted(self):
+        cache = self._cache(ttl=60, max_entries=2)
+        for index in range(3):
+            cache.get(f"{self.url}?page={index}", http=self.api)
+            time.sleep(0.01)
+
+        self.assertEqual(cache.stats()["evictions"], 1)
+        cache.get(f"{self.url}?page=0", http=self.api)
+        self.assertEqual(len(self.api.requests), 4)
+
+    @patch("github_manager.requests.get")
+    def test_github_manager_uses_the_cache(self, mock_get):
+        mock_get.side_effect = self.api.get
+        manager = GitHubRepositoryManager("vzlatsin", "app", MagicMock(), http_cache=self._cache(ttl=0))
+
+        self.assertEqual(manager.fetch_latest_commit(), "abc123")
+        self.assertEqual(manager.fetch_latest_commit(), "abc123")
+        self.assertEqual(self.api.requests[-1]["If-None-Match"], '"v1"')
+
+
+if __name__ == "__main__":
+    unittest.main()
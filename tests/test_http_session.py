@@ -0,0 +1,98 @@
+import sys
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import requests
+
+import http_session
+from http_session import PooledSession, get_session
+from deployment_orchestrator import DeploymentOrchestrator
+from deployment_steps import DeploymentStep, STEP_REGISTRY
+from azure_manager import AzureDevOpsManager
+from github_manager import GitHubRepositoryManager
+from jfrog_uploader import JFrogUploader
+
+
+class TestPooledSession(unittest.TestCase):
+    """Tests for the shared, pooled HTTP session."""
+
+    def test_adapter_pools_and_retries(self):
+        session = PooledSession(pool_maxsize=16, retries=5)
+        adapter = session.get_adapter("https://api.github.com")
+
+        self.assertEqual(adapter._pool_maxsize, 16)
+        self.assertEqual(adapter.max_retries.total, 5)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertNotIn("PUT", adapter.max_retries.allowed_methods)
+
+    @patch.object(requests.Session, "request")
+    def test_default_timeout_is_applied(self, mock_request):
+        session = PooledSession(timeout=7)
+        session.get("https://api.github.com")
+        session.get("https://api.github.com", timeout=2)
+
+        self.assertEqual(mock_request.call_args_list[0][1]["timeout"], 7)
+        self.assertEqual(mock_request.call_args_list[1][1]["timeout"], 2)
+
+    def test_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_session_options_come_from_the_http_section(self):
+        """Steps create the shared session with the `http` options of `step_parameters.json`."""
+        sessions = []
+
+        class SessionStep(DeploymentStep):
+            def execute(self, app=None, **kwargs):
+                sessions.append(self.http_session())
+
+        saved_registry = dict(STEP_REGISTRY)
+        self.addCleanup(lambda: (STEP_REGISTRY.clear(), STEP_REGISTRY.update(saved_registry)))
+        STEP_REGISTRY["session"] = lambda logger: SessionStep(logger)
+        orchestrator = DeploymentOrchestrator(MagicMock(), run_state_dir=None)
+        orchestrator.step_parameters = {"http": {"pool_maxsize": 7, "retries": 1, "timeout": 5}}
+
+        with patch.object(http_session, "_DEFAULT_SESSION", None):
+            orchestrator.execute_steps(["session"], "app")
+
+        self.assertEqual(sessions[0].timeout, 5)
+        adapter = sessions[0].get_adapter("https://api.github.com")
+        self.assertEqual((adapter._pool_maxsize, adapter.max_retries.total), (7, 1))
+
+
+class TestSessionInjection(unittest.TestCase):
+    """The managers and the uploader use an injected session instead of new connections."""
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get.return_value.status_code = 200
+
+    def test_github_manager_uses_the_session(self):
+        self.session.get.return_value.json.return_value = [{"sha": "abc123"}]
+        manager = GitHubRepositoryManager("vzlatsin", "app", MagicMock(), session=self.session)
+
+        self.assertEqual(manager.fetch_latest_commit(), "abc123")
+        self.session.get.assert_called_once_with(manager.latest_commit_url, timeout=10)
+
+    def test_azure_manager_uses_the_session_with_a_timeout(self):
+        self.session.get.return_value.json.return_value = {"value": [{"commitId": "def456"}]}
+        manager = AzureDevOpsManager("https://dev.azure.com/org/repo", "org", "project", "repo", "token",
+                                     MagicMock(), session=self.session, timeout=5)
+
+        self.assertEqual(manager.get_latest_commit(), "def456")
+        self.assertEqual(self.session.get.call_args[1]["timeout"], 5)
+
+    def test_jfrog_uploader_uses_the_session_with_per_request_auth(self):
+        uploader = JFrogUploader("https://jfrog.example.com/repo", MagicMock(), session=self.session)
+        uploader.access_token = "secret"
+
+        self.assertIs(uploader.session, self.session)
+        self.assertEqual(uploader._auth_headers({"X": "1"}), {"X": "1", "Authorization": "Bearer secret"})
+        self.session.headers.__setitem__.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
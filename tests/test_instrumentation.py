@@ -0,0 +1,99 @@
+import sys
+import os
+import json
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deployment_logger import log_context
+from deployment_orchestrator import DeploymentOrchestrator
+from deployment_steps import DeploymentStep, STEP_REGISTRY
+from host_rollout import HostRollout
+from instrumentation import RunMetrics, record_network
+
+
+class DownloadStep(DeploymentStep):
+    """Reports two network calls."""
+
+    def execute(self, app=None, **kwargs):
+        record_network(bytes_received=1000)
+        record_network(bytes_sent=10, bytes_received=500)
+
+
+class RolloutStep(DeploymentStep):
+    """Uploads to two hosts on rollout worker threads."""
+
+    def execute(self, app=None, **kwargs):
+        report = HostRollout(self.logger, max_in_flight=2, canary_count=0).run(
+            ["host1", "host2"], lambda host: record_network(bytes_sent=2048) or True)
+        return report["failed"] == 0
+
+
+class FailingStep(DeploymentStep):
+    def execute(self, app=None, **kwargs):
+        return False
+
+
+class TestRunMetrics(unittest.TestCase):
+    """The orchestrator measures every step of a run."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.saved_registry = dict(STEP_REGISTRY)
+        STEP_REGISTRY["download"] = lambda logger: DownloadStep(logger)
+        STEP_REGISTRY["rollout"] = lambda logger: RolloutStep(logger)
+        STEP_REGISTRY["failing"] = lambda logger: FailingStep(logger)
+        self.orchestrator = DeploymentOrchestrator(MagicMock(), run_state_dir=None)
+
+    def tearDown(self):
+        STEP_REGISTRY.clear()
+        STEP_REGISTRY.update(self.saved_registry)
+        self.workdir.cleanup()
+
+    def test_report_has_per_step_and_per_app_metrics(self):
+        self.orchestrator.execute_steps(["download", "rollout"], "app1")
+        self.orchestrator.execute_steps(["download", "failing"], "app2")
+
+        report = self.orchestrator.metrics.report()
+        download = report["apps"]["app1"]["steps"]["download"]
+        self.assertEqual(download["status"], "success")
+        self.assertEqual((download["network_calls"], download["bytes_sent"], download["bytes_received"]),
+                         (2, 10, 1500))
+        self.assertGreaterEqual(download["wall_seconds"], 0)
+        self.assertIn("cpu_seconds", download)
+
+        # Network use on rollout worker threads is attributed to the step that started them
+        self.assertEqual(report["apps"]["app1"]["steps"]["rollout"]["bytes_sent"], 4096)
+        self.assertEqual(report["apps"]["app1"]["totals"]["network_calls"], 4)
+        self.assertEqual(report["apps"]["app2"]["steps"]["failing"]["status"], "failed")
+        self.assertEqual(report["run_id"], self.orchestrator.run_id)
+
+    def test_reports_are_written_as_json_and_prometheus_text(self):
+        self.orchestrator.execute_steps(["download"], 'app"1')
+        json_path = os.path.join(self.workdir.name, "report.json")
+        prometheus_path = os.path.join(self.workdir.name, "textfile", "deploy.prom")
+
+        self.orchestrator.write_run_report(json_path=json_path, prometheus_path=prometheus_path)
+
+        with open(json_path) as f:
+            self.assertIn('app"1', json.load(f)["apps"])
+        with open(prometheus_path) as f:
+            metrics = f.read()
+        self.assertIn("# TYPE deployment_step_wall_seconds gauge", metrics)
+        self.assertIn('deployment_step_received_bytes{app="app\\"1",step="download",status="success"} 1500', metrics)
+        self.assertIn(f'deployment_run_info{{run_id="{self.orchestrator.run_id}"}} 1', metrics)
+        self.assertEqual(os.listdir(os.path.dirname(prometheus_path)), ["deploy.prom"])
+
+    def test_network_use_outside_a_measured_step_is_ignored(self):
+        metrics = RunMetrics("standalone")
+        record_network(bytes_sent=1)
+        with log_context(run_id="standalone"):
+            record_network(bytes_sent=1)
+        self.assertEqual(metrics.report()["apps"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,15 @@
 import sys
 import os
+import hashlib
+import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 # ✅ Ensure correct module import
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
 
-from jfrog_uploader import JFrogUploader  # ✅ Now it should work!
+from jfrog_uploader import JFrogUploader, upload_stats  # ✅ Now it should work!
 
 class TestJFrogUploader(unittest.TestCase):
     """Basic logging and retry test for JFrogUploader"""
@@ -44,5 +47,184 @@ class TestJFrogUploader(unittest.TestCase):
         self.assertTrue(result, "[ERROR] Upload did not succeed after retries.")  
         self.assertEqual(retry_counter["count"], 2, f"[ERROR] Expected 2 retries, got {retry_counter['count']}.")
 
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload or {}
+        self.headers = headers or {}
+        self.text = ""
+
+    def json(self):
+        return self.payload
+
+
+class FakeArtifactory:
+    """Session stand-in that records uploaded bytes and can fail chosen parts once."""
+
+    def __init__(self, fail_parts=(), status=503, multipart=True):
+        self.fail_parts = set(fail_parts)
+        self.multipart = multipart
+        self.status = status
+        self.parts = {}
+        self.part_requests = []
+        self.stored = {}
+        self.checksum_requests = []
+        self.headers = {}
+
+    def put(self, url, data=None, headers=None, timeout=None):
+        if (headers or {}).get("X-Checksum-Deploy") == "true":
+            self.checksum_requests.append(url)
+            known = any(stored_headers["X-Checksum-Sha256"] == headers["X-Checksum-Sha256"]
+                        for _, stored_headers in self.stored.values())
+            if known:
+                self.stored[url] = (None, headers)
+            return FakeResponse(201 if known else 404)
+
+        body = b"".join(iter(lambda: data.read(1000), b""))
+        if "partNumber=" in url:
+            number = int(url.split("partNumber=")[1].split("&")[0])
+            self.part_requests.append(number)
+            if number in self.fail_parts:
+                self.fail_parts.discard(number)
+                return FakeResponse(self.status)
+            self.parts[number] = body
+            return FakeResponse(200, headers={"ETag": f"etag-{number}"})
+        if self.fail_parts:
+            self.fail_parts.pop()
+            return FakeResponse(self.status)
+        self.stored[url] = (body, headers)
+        return FakeResponse(201)
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        if url.endswith("?uploads"):
+            return FakeResponse(200, {"uploadId": "u1"}) if self.multipart else FakeResponse(405)
+        self.stored[url.split("?")[0]] = (b"".join(self.parts[part["partNumber"]] for part in json["parts"]), headers)
+        return FakeResponse(201)
+
+
+class TestJFrogUploadEngine(unittest.TestCase):
+    """Tests for streamed, multipart and resumed uploads."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.package_path = os.path.join(self.workdir.name, "app.tar.gz")
+        self.data = os.urandom(10 * 1024 + 5)
+        with open(self.package_path, "wb") as f:
+            f.write(self.data)
+        self.uploader = JFrogUploader(repo_url="https://jfrog.example.com/repo/", logger=MagicMock())
+        self.uploader.backoff_base = 0.001
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def _use(self, artifactory):
+        session_patch = patch("jfrog_uploader.requests.Session", return_value=artifactory)
+        session_patch.start()
+        self.addCleanup(session_patch.stop)
+        return artifactory
+
+    def test_small_package_is_streamed_with_checksums(self):
+        artifactory = self._use(FakeArtifactory())
+
+        self.assertTrue(self.uploader.upload_package(self.package_path, target_path="app/app.tar.gz"))
+
+        body, headers = artifactory.stored["https://jfrog.example.com/repo/app/app.tar.gz"]
+        self.assertEqual(body, self.data)
+        self.assertEqual(headers["X-Checksum-Sha256"], hashlib.sha256(self.data).hexdigest())
+
+    def test_known_checksum_skips_the_upload(self):
+        """The second upload of the same bytes is deployed by checksum only."""
+        artifactory = self._use(FakeArtifactory())
+        before = upload_stats()
+
+        self.assertTrue(self.uploader.upload_package(self.package_path, target_path="app/1.0/app.tar.gz"))
+        self.assertFalse(self.uploader.last_stats["checksum_deploy"])
+        self.assertTrue(self.uploader.upload_package(self.package_path, target_path="app/1.1/app.tar.gz"))
+
+        self.assertTrue(self.uploader.last_stats["checksum_deploy"])
+        self.assertEqual(self.uploader.last_stats["bytes_skipped"], len(self.data))
+        self.assertIsNone(artifactory.stored["https://jfrog.example.com/repo/app/1.1/app.tar.gz"][0])
+        self.assertEqual(len(artifactory.checksum_requests), 2)
+        after = upload_stats()
+        self.assertEqual(after["bytes_skipped"] - before["bytes_skipped"], len(self.data))
+        self.assertEqual(after["bytes_uploaded"] - before["bytes_uploaded"], len(self.data))
+
+    def test_checksum_deploy_can_be_disabled(self):
+        artifactory = self._use(FakeArtifactory())
+        self.uploader.checksum_deploy = False
+
+        self.assertTrue(self.uploader.upload_package(self.package_path))
+        self.assertEqual(artifactory.checksum_requests, [])
+
+    def test_retry_resends_only_failed_parts(self):
+        """A failed part is the only one uploaded again on the next attempt."""
+        artifactory = self._use(FakeArtifactory(fail_parts={2}))
+        self.uploader.part_size = 4096
+        self.uploader.multipart_threshold = 0
+        self.uploader.concurrency = 2
+
+        self.assertTrue(self.uploader.upload_package(self.package_path, retry_count=3))
+
+        self.assertEqual(sorted(artifactory.part_requests), [1, 2, 2, 3])
+        self.assertEqual(artifactory.stored["https://jfrog.example.com/repo/app.tar.gz"][0], self.data)
+        self.assertEqual(self.uploader.last_stats["attempts"], 2)
+
+    def test_multipart_is_opt_in(self):
+        self.assertIsNone(self.uploader.multipart_threshold)
+        artifactory = self._use(FakeArtifactory())
+
+        self.assertTrue(self.uploader.upload_package(self.package_path))
+        self.assertEqual(artifactory.part_requests, [])
+
+    def test_rejected_multipart_falls_back_to_a_single_put(self):
+        artifactory = self._use(FakeArtifactory(multipart=False))
+        self.uploader.part_size = 4096
+        self.uploader.multipart_threshold = 0
+
+        self.assertTrue(self.uploader.upload_package(self.package_path, retry_count=1))
+
+        self.assertEqual(artifactory.part_requests, [])
+        self.assertEqual(artifactory.stored["https://jfrog.example.com/repo/app.tar.gz"][0], self.data)
+
+    def test_client_errors_are_not_retried(self):
+        artifactory = self._use(FakeArtifactory(fail_parts={1}, status=403))
+        self.uploader._attempt_upload = MagicMock(wraps=self.uploader._attempt_upload)
+
+        self.assertFalse(self.uploader.upload_package(self.package_path, retry_count=3))
+        self.assertEqual(self.uploader._attempt_upload.call_count, 1)
+
+    def test_concurrent_uploads_of_one_file_keep_their_own_state(self):
+        """Two uploads of the same package on one uploader overlap without clobbering each other."""
+        both_started = threading.Barrier(2, timeout=5)
+        targets = []
+
+        def upload_single(state):
+            both_started.wait()
+            targets.append(state.url)
+            return True
+
+        self.uploader.checksum_deploy = False
+        self.uploader._upload_single = upload_single
+        results = {}
+        threads = [threading.Thread(target=lambda target=target: results.__setitem__(
+            target, self.uploader.upload_package(self.package_path, retry_count=1, target_path=target)))
+            for target in ("a/app.tar.gz", "b/app.tar.gz")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, {"a/app.tar.gz": True, "b/app.tar.gz": True})
+        self.assertEqual(sorted(targets), ["https://jfrog.example.com/repo/a/app.tar.gz",
+                                           "https://jfrog.example.com/repo/b/app.tar.gz"])
+
+    def test_backoff_is_capped_and_jittered(self):
+        self.uploader.backoff_base, self.uploader.backoff_max = 1, 4
+        delays = [self.uploader.backoff_delay(attempt) for attempt in range(1, 10) for _ in range(20)]
+        self.assertTrue(all(0 <= delay <= 4 for delay in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
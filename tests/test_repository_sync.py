@@ -0,0 +1,105 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from repository_sync import BatchSyncChecker
+
+
+class SlowManager:
+    """Manager stand-in whose commit lookups take `delay` seconds and track how many run at once."""
+
+    def __init__(self, commit, delay=0.0, tracker=None, error=None):
+        self.commit = commit
+        self.delay = delay
+        self.tracker = tracker
+        self.error = error
+
+    def _lookup(self):
+        if self.tracker is not None:
+            with self.tracker["lock"]:
+                self.tracker["active"] += 1
+                self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        try:
+            time.sleep(self.delay)
+            if self.error is not None:
+                raise self.error
+            return self.commit
+        finally:
+            if self.tracker is not None:
+                with self.tracker["lock"]:
+                    self.tracker["active"] -= 1
+
+    fetch_latest_commit = _lookup
+    get_latest_commit = _lookup
+
+
+class TestBatchSyncChecker(unittest.TestCase):
+    """Tests for concurrent drift checks across many repositories."""
+
+    def test_statuses_are_reported_per_repository(self):
+        repositories = [
+            ("app", SlowManager("abc"), SlowManager("abc")),
+            ("api", SlowManager("def"), SlowManager("old")),
+            ("web", SlowManager(None, error=Exception("GitHub API error: 404")), SlowManager("abc")),
+            ("etl", SlowManager("abc"), SlowManager(None)),
+        ]
+
+        report = BatchSyncChecker(MagicMock()).run(repositories)
+
+        statuses = {name: result["status"] for name, result in report["repositories"].items()}
+        self.assertEqual(statuses, {"app": "in_sync", "api": "outdated", "web": "error", "etl": "error"})
+        self.assertEqual((report["in_sync"], report["outdated"], report["error"]), (1, 1, 2))
+        self.assertEqual(report["repositories"]["api"]["azure_commit"], "old")
+        self.assertEqual(report["repositories"]["web"]["error"], "GitHub: GitHub API error: 404")
+        self.assertIn("Azure DevOps", report["repositories"]["etl"]["error"])
+
+    def test_checks_run_concurrently_within_the_limit(self):
+        """Forty slow repositories finish in a few call durations, never exceeding max_concurrency calls."""
+        tracker = {"lock": threading.Lock(), "active": 0, "peak": 0}
+        repositories = [(f"repo{i}", SlowManager("abc", 0.05, tracker), SlowManager("abc", 0.05, tracker))
+                        for i in range(40)]
+
+        start = time.perf_counter()
+        report = BatchSyncChecker(MagicMock(), max_concurrency=20).run(repositories)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(report["in_sync"], 40)
+        self.assertLessEqual(tracker["peak"], 20)
+        self.assertLess(elapsed, 80 * 0.05 / 4)
+
+    def test_slow_calls_time_out_as_errors(self):
+        repositories = [("app", SlowManager("abc", 0.5), SlowManager("abc"))]
+
+        report = BatchSyncChecker(MagicMock(), timeout=0.05).run(repositories)
+
+        self.assertEqual(report["repositories"]["app"]["status"], "error")
+        self.assertEqual(report["repositories"]["app"]["error"], "GitHub: timed out")
+
+    def test_timed_out_calls_hold_their_slot_until_they_finish(self):
+        """Calls queued behind an abandoned call wait for its thread instead of timing out in the pool's queue."""
+        repositories = [("slow", SlowManager("abc", 0.3), SlowManager("abc"))]
+        repositories += [(f"repo{i}", SlowManager("abc", 0.01), SlowManager("abc", 0.01)) for i in range(3)]
+
+        report = BatchSyncChecker(MagicMock(), max_concurrency=1, timeout=0.1).run(repositories)
+
+        statuses = {name: result["status"] for name, result in report["repositories"].items()}
+        self.assertEqual(statuses, {"slow": "error", "repo0": "in_sync", "repo1": "in_sync", "repo2": "in_sync"})
+
+    def test_format_report_summarizes_counts(self):
+        checker = BatchSyncChecker(MagicMock())
+        report = checker.run([("app", SlowManager("abc"), SlowManager("old"))])
+        self.assertIn("0/1 repositories in sync, 1 outdated, 0 errors", checker.format_report(report)[-1])
+
+    def test_invalid_concurrency_is_rejected(self):
+        with self.assertRaises(ValueError):
+            BatchSyncChecker(MagicMock(), max_concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
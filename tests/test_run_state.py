@@ -0,0 +1,196 @@
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deployment_orchestrator import DeploymentOrchestrator
+from deployment_steps import DeploymentStep, STEP_REGISTRY
+from run_state import RunStateStore
+
+
+class CommitStep(DeploymentStep):
+    """Always runs and publishes the commit chosen by the test."""
+    commit_sha = "abc123"
+
+    def execute(self, app=None, **kwargs):
+        self.context["commit_sha"] = CommitStep.commit_sha
+
+
+class BuildStep(DeploymentStep):
+    """Writes a package for the current commit; counts how often it really ran."""
+    fingerprint_context = ("commit_sha",)
+    runs = 0
+    output_dir = None
+
+    def execute(self, app=None, **kwargs):
+        BuildStep.runs += 1
+        package_path = os.path.join(BuildStep.output_dir, f"{app}.tar.gz")
+        with open(package_path, "w") as f:
+            f.write(self.context["commit_sha"])
+        self.context["package_path"] = package_path
+
+
+class PackageExistsStep(DeploymentStep):
+    """Fails unless the package path in the context exists."""
+
+    def execute(self, app=None, **kwargs):
+        return os.path.exists(self.context.get("package_path", ""))
+
+
+class SiblingStep(DeploymentStep):
+    """Sets a context value while BuildStep runs in parallel."""
+    depends_on = ("commit",)
+    done = None
+
+    def execute(self, app=None, **kwargs):
+        self.context["rollout"] = "sibling"
+        SiblingStep.done.set()
+
+
+class ParallelBuildStep(BuildStep):
+    """BuildStep that finishes only after SiblingStep changed the shared context."""
+    depends_on = ("commit",)
+
+    def execute(self, app=None, **kwargs):
+        SiblingStep.done.wait(5)
+        super().execute(app, **kwargs)
+
+
+class TestRunStateStore(unittest.TestCase):
+    """Tests for step input fingerprints."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.store = RunStateStore(os.path.join(self.workdir.name, "state"), MagicMock())
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_file_inputs_are_fingerprinted_by_content(self):
+        path = os.path.join(self.workdir.name, "app.tar.gz")
+        with open(path, "w") as f:
+            f.write("one")
+        first = self.store.fingerprint("upload", {"retry_count": 3}, {"package_path": path}, ("package_path",))
+        with open(path, "w") as f:
+            f.write("two")
+        os.utime(path, ns=(1, 1))
+
+        self.assertNotEqual(first, self.store.fingerprint("upload", {"retry_count": 3}, {"package_path": path},
+                                                          ("package_path",)))
+        self.assertNotEqual(first, self.store.fingerprint("upload", {"retry_count": 5}, {"package_path": path},
+                                                          ("package_path",)))
+
+    def test_missing_input_cannot_be_fingerprinted(self):
+        self.assertIsNone(self.store.fingerprint("package", {}, {"app": "app"}, ("commit_sha",)))
+
+    def test_records_persist_across_stores(self):
+        self.store.record("app", "package", "f1", {"package_version": "1.0"}, 2.5)
+        reloaded = RunStateStore(self.store.state_dir, MagicMock())
+
+        self.assertEqual(reloaded.unchanged("app", "package", "f1")["outputs"], {"package_version": "1.0"})
+        self.assertIsNone(reloaded.unchanged("app", "package", "f2"))
+
+
+class TestUnchangedStepSkipping(unittest.TestCase):
+    """The orchestrator skips steps whose inputs match their last successful run."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.saved_registry = dict(STEP_REGISTRY)
+        STEP_REGISTRY["commit"] = lambda logger: CommitStep(logger)
+        STEP_REGISTRY["build"] = lambda logger: BuildStep(logger)
+        CommitStep.commit_sha = "abc123"
+        BuildStep.runs = 0
+        BuildStep.output_dir = self.workdir.name
+
+    def tearDown(self):
+        STEP_REGISTRY.clear()
+        STEP_REGISTRY.update(self.saved_registry)
+        self.workdir.cleanup()
+
+    def orchestrator(self, force=False):
+        return DeploymentOrchestrator(MagicMock(), run_state_dir=os.path.join(self.workdir.name, "state"), force=force)
+
+    def test_unchanged_step_is_skipped_and_its_outputs_restored(self):
+        self.orchestrator().execute_steps(["commit", "build"], "app")
+        orchestrator = self.orchestrator()
+        executed = orchestrator.execute_steps(["commit", "build"], "app")
+
+        self.assertEqual(executed, ["commit", "build"])
+        self.assertEqual(BuildStep.runs, 1)
+        self.assertEqual(orchestrator.run_state.summary()["skipped"], [("app", "build")])
+
+        # A later step still sees the restored package path
+        STEP_REGISTRY["check"] = lambda logger: PackageExistsStep(logger)
+        self.assertEqual(orchestrator.execute_steps(["commit", "build", "check"], "app"), ["commit", "build", "check"])
+
+    def test_changed_input_runs_the_step(self):
+        self.orchestrator().execute_steps(["commit", "build"], "app")
+        CommitStep.commit_sha = "def456"
+        self.orchestrator().execute_steps(["commit", "build"], "app")
+        self.assertEqual(BuildStep.runs, 2)
+
+    def test_missing_output_runs_the_step(self):
+        self.orchestrator().execute_steps(["commit", "build"], "app")
+        os.remove(os.path.join(self.workdir.name, "app.tar.gz"))
+        self.orchestrator().execute_steps(["commit", "build"], "app")
+        self.assertEqual(BuildStep.runs, 2)
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_unconfigured_upload_fails_and_is_not_recorded(self):
+        """Without a repository the upload step fails instead of reporting a stub success."""
+        orchestrator = self.orchestrator()
+        orchestrator.step_parameters = {"upload": {"target_path": "{app}/{app}.tar.gz"}}
+
+        self.assertEqual(orchestrator.execute_steps(["commit", "build", "upload"], "app"), ["commit", "build"])
+        self.assertIsNone(orchestrator.run_state._state("app")["steps"].get("upload"))
+
+    def test_only_values_set_by_the_step_are_recorded(self):
+        """Context values set by a sibling step running in parallel are not recorded as the build's outputs."""
+        STEP_REGISTRY["build"] = lambda logger: ParallelBuildStep(logger)
+        STEP_REGISTRY["sibling"] = lambda logger: SiblingStep(logger)
+        SiblingStep.done = threading.Event()
+        orchestrator = self.orchestrator()
+
+        orchestrator.execute_steps_parallel(["commit", "build", "sibling"], "app", max_workers=2)
+
+        outputs = orchestrator.run_state._state("app")["steps"]["build"]["outputs"]
+        self.assertEqual(outputs, {"package_path": os.path.join(self.workdir.name, "app.tar.gz")})
+
+    def test_deploy_is_not_skipped_on_unchanged_local_inputs(self):
+        from steps.deploytotargetstep import DeployToTargetStep
+        self.assertIsNone(DeployToTargetStep.fingerprint_context)
+
+    def test_new_repository_from_the_environment_runs_the_upload(self):
+        """The upload destination is fingerprinted even when it comes from JFROG_REPO_URL."""
+        from steps.uploadtojfrogstep import UploadToJfrogStep
+        steps = ["commit", "build", "upload"]
+        with patch("steps.uploadtojfrogstep.JFrogUploader") as uploader, \
+                patch.object(UploadToJfrogStep, "http_session"):
+            uploader.return_value.upload_package.return_value = True
+            with patch.dict(os.environ, {"JFROG_REPO_URL": "https://old.example/artifactory"}):
+                self.orchestrator().execute_steps(steps, "app")
+                self.orchestrator().execute_steps(steps, "app")
+            self.assertEqual(uploader.return_value.upload_package.call_count, 1)
+
+            with patch.dict(os.environ, {"JFROG_REPO_URL": "https://new.example/artifactory"}):
+                self.assertEqual(self.orchestrator().execute_steps(steps, "app"), steps)
+            self.assertEqual(uploader.return_value.upload_package.call_count, 2)
+            self.assertEqual(uploader.call_args[0][0], "https://new.example/artifactory")
+
+    def test_force_runs_every_step(self):
+        self.orchestrator().execute_steps(["commit", "build"], "app")
+        orchestrator = self.orchestrator(force=True)
+        orchestrator.execute_steps(["commit", "build"], "app")
+
+        self.assertEqual(BuildStep.runs, 2)
+        self.assertEqual(orchestrator.run_state.summary()["skipped"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import sys
+import os
+import contextlib
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from sftp_transfer import SFTPTransferEngine
+from steps.deploytotargetstep import DeployToTargetStep
+
+
+class LocalRemoteFile:
+    """File wrapper that accepts the paramiko-only set_pipelined call."""
+
+    def __init__(self, path, mode):
+        self.file = open(path, mode)
+
+    def set_pipelined(self, pipelined=True):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.file.close()
+
+
+class LocalSFTP:
+    """Minimal SFTP client stand-in that treats remote paths as local paths."""
+
+    def open(self, path, mode):
+        return LocalRemoteFile(path, mode)
+
+    def posix_rename(self, old, new):
+        os.replace(old, new)
+
+
+class LocalConnection:
+    """Pooled connection stand-in that counts SFTP sessions in use at the same time."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def sftp(self):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            yield LocalSFTP()
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class TestSFTPTransferEngine(unittest.TestCase):
+    """Tests for chunked, concurrent SFTP uploads."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.local_path = os.path.join(self.workdir.name, "app.tar.gz")
+        self.remote_path = os.path.join(self.workdir.name, "remote.tar.gz")
+        self.data = os.urandom(1024 * 1024 + 123)
+        with open(self.local_path, "wb") as f:
+            f.write(self.data)
+
+        self.connection = LocalConnection()
+        self.deployer = MagicMock(server_address="ldctlm01")
+        self.deployer.connection.return_value = contextlib.nullcontext(self.connection)
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_parallel_windows_reassemble_the_file(self):
+        """Windows uploaded on several channels produce an identical remote file."""
+        engine = SFTPTransferEngine(self.deployer, MagicMock(), chunk_size=4096, window_size=100 * 1024, concurrency=4)
+        stats = engine.upload(self.local_path, self.remote_path)
+
+        with open(self.remote_path, "rb") as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertFalse(os.path.exists(f"{self.remote_path}.part"))
+        self.assertEqual(stats["bytes"], len(self.data))
+        self.assertEqual(stats["windows"], 11)
+        self.assertLessEqual(self.connection.max_active, 4)
+
+    def test_empty_file_is_uploaded(self):
+        """A zero-byte package still produces the remote file."""
+        open(self.local_path, "wb").close()
+        SFTPTransferEngine(self.deployer, MagicMock()).upload(self.local_path, self.remote_path)
+        self.assertEqual(os.path.getsize(self.remote_path), 0)
+
+    def test_invalid_settings_are_rejected(self):
+        with self.assertRaises(ValueError):
+            SFTPTransferEngine(self.deployer, MagicMock(), concurrency=0)
+
+
+class TestDeployToTargetStepTransfer(unittest.TestCase):
+    """Tests for choosing between the SFTP engine and scp."""
+
+    params = {"target": "ldctlm01", "local_package_path": "build/app.tar.gz",
+              "remote_package_path": "/deployments/app.tar.gz", "concurrency": 2}
+
+    @patch("steps.deploytotargetstep.os.system", return_value=0)
+    @patch("steps.deploytotargetstep.RemoteDeployer")
+    def test_sftp_is_used_when_credentials_are_configured(self, mock_deployer_class, mock_system):
+        mock_deployer_class.return_value.deploy_to_server.return_value = True
+        step = DeployToTargetStep(MagicMock())
+
+        self.assertTrue(step.execute("app", ssh_user="deploy", ssh_key_path="/keys/id_rsa", **self.params))
+        mock_deployer_class.return_value.deploy_to_server.assert_called_once_with(
+            "build/app.tar.gz", "/deployments/app.tar.gz", delta=False, concurrency=2)
+        mock_system.assert_not_called()
+
+    @patch("steps.deploytotargetstep.os.system", return_value=0)
+    @patch("steps.deploytotargetstep.RemoteDeployer")
+    def test_failed_sftp_falls_back_to_scp(self, mock_deployer_class, mock_system):
+        mock_deployer_class.return_value.deploy_to_server.return_value = False
+        step = DeployToTargetStep(MagicMock())
+
+        self.assertTrue(step.execute("app", ssh_user="deploy", ssh_key_path="/keys/id_rsa", **self.params))
+        mock_system.assert_called_once_with("scp build/app.tar.gz ldctlm01:/deployments/app.tar.gz")
+
+    @patch("steps.deploytotargetstep.RemoteDeployer")
+    def test_failed_version_marker_does_not_fail_the_deploy(self, mock_deployer_class):
+        """The marker is written over the deploy's own connection; an SSH error there is only a warning."""
+        deployer = mock_deployer_class.return_value
+        deployer.deploy_to_server.return_value = True
+        deployer.run_command.side_effect = OSError("connection reset")
+        step = DeployToTargetStep(MagicMock())
+        step.context["commit_sha"] = "a" * 40
+
+        self.assertTrue(step.execute("app", ssh_user="deploy", ssh_key_path="/keys/id_rsa", **self.params))
+        mock_deployer_class.assert_called_once()
+        self.assertIn(".version", deployer.run_command.call_args[0][0])
+        step.logger.log_warning.assert_called_once()
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("steps.deploytotargetstep.os.system", return_value=0)
+    @patch("steps.deploytotargetstep.RemoteDeployer")
+    def test_scp_is_used_without_credentials(self, mock_deployer_class, mock_system):
+        DeployToTargetStep(MagicMock()).execute("app", **self.params)
+        mock_deployer_class.assert_not_called()
+        mock_system.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
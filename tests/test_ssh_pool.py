@@ -0,0 +1,142 @@
+import sys
+import os
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from ssh_pool import SSHConnectionPool
+from remote_deployer import RemoteDeployer
+
+
+class TestSSHConnectionPool(unittest.TestCase):
+    """Tests for pooled SSH connections."""
+
+    def setUp(self):
+        patcher = patch("ssh_pool.paramiko.SSHClient")
+        self.mock_client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_client_class.side_effect = lambda: MagicMock()
+
+    def test_connection_is_reused_for_same_credentials(self):
+        """Repeated operations against one host share a single handshake."""
+        pool = SSHConnectionPool()
+        connections = []
+        for _ in range(3):
+            with pool.connection("ldctlm01", "deploy", "/keys/id_rsa") as connection:
+                connections.append(connection)
+
+        self.assertTrue(all(connection is connections[0] for connection in connections))
+
+        self.assertEqual(self.mock_client_class.call_count, 1)
+        self.assertEqual(pool.stats()["handshakes"], 1)
+        self.assertEqual(pool.stats()["reuses"], 2)
+
+    def test_different_credentials_get_separate_connections(self):
+        """Host, user and key are all part of the pool key."""
+        pool = SSHConnectionPool()
+        for host, user, key in [("a", "deploy", "k1"), ("b", "deploy", "k1"), ("a", "root", "k1"), ("a", "deploy", "k2")]:
+            with pool.connection(host, user, key):
+                pass
+        self.assertEqual(pool.stats()["handshakes"], 4)
+
+    def test_idle_connections_are_evicted(self):
+        """Connections unused for longer than idle_timeout are closed."""
+        pool = SSHConnectionPool(idle_timeout=0.01)
+        with pool.connection("ldctlm01", "deploy", "/keys/id_rsa") as connection:
+            client = connection.client
+        time.sleep(0.02)
+        pool.evict_idle()
+
+        client.close.assert_called_once()
+        self.assertEqual(pool.stats()["evictions"], 1)
+        self.assertEqual(pool.stats()["open_connections"], 0)
+
+    def test_dead_transport_is_replaced(self):
+        """A connection whose transport dropped is reconnected on next use."""
+        pool = SSHConnectionPool()
+        with pool.connection("ldctlm01", "deploy", "/keys/id_rsa") as connection:
+            connection.client.get_transport.return_value.is_active.return_value = False
+        with pool.connection("ldctlm01", "deploy", "/keys/id_rsa"):
+            pass
+        self.assertEqual(pool.stats()["handshakes"], 2)
+
+    def test_sftp_sessions_are_reused(self):
+        """An SFTP session returned to the connection is handed out again."""
+        pool = SSHConnectionPool()
+        with pool.connection("ldctlm01", "deploy", "/keys/id_rsa") as connection:
+            with connection.sftp() as first:
+                pass
+            with connection.sftp() as second:
+                pass
+        self.assertIs(first, second)
+        connection.client.open_sftp.assert_called_once()
+
+    def test_idle_sftp_sessions_count_against_max_channels(self):
+        """A parked SFTP session keeps its channel, so a command at the limit closes it first."""
+        pool = SSHConnectionPool(max_channels=1)
+        with pool.connection("ldctlm01", "deploy", "/keys/id_rsa") as connection:
+            client = connection.client
+            stdout, stderr = MagicMock(), MagicMock()
+            stdout.read.return_value = stderr.read.return_value = b""
+            stdout.channel.recv_exit_status.return_value = 0
+            client.exec_command.return_value = (MagicMock(), stdout, stderr)
+
+            with connection.sftp() as sftp:
+                pass
+            sftp.close.assert_not_called()
+            self.assertEqual(connection.exec_command("true")[0], 0)
+            sftp.close.assert_called_once()
+            self.assertEqual(connection._open_channels, 0)
+
+            with connection.sftp():
+                pass
+        self.assertEqual(client.open_sftp.call_count, 2)
+
+    def test_deploy_uses_one_connection_for_all_operations(self):
+        """Directory check, upload and checksum verification share one pooled connection."""
+        pool = SSHConnectionPool()
+        deployer = RemoteDeployer("ldctlm01", "deploy", "/keys/id_rsa", MagicMock(), pool=pool)
+        checksum = RemoteDeployer.local_checksum(__file__)
+
+        def exec_command(command, timeout=None):
+            output = f"{checksum}  /deployments/app.tar.gz" if command.startswith("sha256sum") else "total 0"
+            stdout = MagicMock()
+            stdout.read.return_value = output.encode()
+            stdout.channel.recv_exit_status.return_value = 0
+            stderr = MagicMock()
+            stderr.read.return_value = b""
+            return MagicMock(), stdout, stderr
+
+        self.mock_client_class.side_effect = lambda: MagicMock(exec_command=MagicMock(side_effect=exec_command))
+
+        self.assertTrue(deployer.deploy_to_server(__file__, "/deployments/app.tar.gz"))
+        self.assertEqual(pool.stats()["handshakes"], 1)
+
+    def test_remote_commands_have_a_timeout_and_bare_paths_use_the_login_directory(self):
+        pool = SSHConnectionPool()
+        deployer = RemoteDeployer("ldctlm01", "deploy", "/keys/id_rsa", MagicMock(), pool=pool, command_timeout=45)
+        checksum = RemoteDeployer.local_checksum(__file__)
+        commands = []
+
+        def exec_command(command, timeout=None):
+            commands.append((command, timeout))
+            output = f"{checksum}  app.tar.gz" if command.startswith("sha256sum") else "total 0"
+            stdout = MagicMock()
+            stdout.read.return_value = output.encode()
+            stdout.channel.recv_exit_status.return_value = 0
+            stderr = MagicMock()
+            stderr.read.return_value = b""
+            return MagicMock(), stdout, stderr
+
+        self.mock_client_class.side_effect = lambda: MagicMock(exec_command=MagicMock(side_effect=exec_command))
+
+        self.assertTrue(deployer.deploy_to_server(__file__, "app.tar.gz"))
+        self.assertIn("[ -d . ]", commands[0][0])
+        self.assertEqual({timeout for _, timeout in commands}, {45})
+
+
+if __name__ == "__main__":
+    unittest.main()
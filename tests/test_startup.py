@@ -0,0 +1,84 @@
+import sys
+import os
+import subprocess
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../src"))
+sys.path.insert(0, SRC_DIR)
+
+from deployment_steps import LazyStep, STEP_REGISTRY, load_steps
+from steps.cleanupstep import CleanupStep
+
+# Third-party packages that only the network and SSH steps need
+HEAVY_MODULES = ("requests", "urllib3", "paramiko")
+
+
+# Runs deploy.main() in a fresh interpreter and prints the exit code and every module it loaded
+STARTUP_SCRIPT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+sys.argv = ["deploy.py"] + sys.argv[2:]
+import deploy
+code = deploy.main()
+print(code)
+print("\\n".join(sys.modules))
+"""
+
+
+def startup_imports(*steps):
+    """Runs `deploy.py` for `steps` in a new interpreter; returns (exit code, imported module names)."""
+    result = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, SRC_DIR, "--steps", *steps, "--app", "demo"],
+                            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=60)
+    lines = result.stdout.splitlines()
+    start = next(index for index, line in enumerate(lines) if line.lstrip("-").isdigit())
+    return int(lines[start]), set(lines[start + 1:])
+
+
+class TestLazyStepLoading(unittest.TestCase):
+    """Step modules are imported on first use, not when the registry is built."""
+
+    def setUp(self):
+        self.saved_registry = dict(STEP_REGISTRY)
+
+    def tearDown(self):
+        STEP_REGISTRY.clear()
+        STEP_REGISTRY.update(self.saved_registry)
+
+    def test_registry_holds_lazy_entries(self):
+        logger = MagicMock()
+        load_steps(logger)
+
+        self.assertIsInstance(STEP_REGISTRY["fetch"], LazyStep)
+        step = STEP_REGISTRY["cleanup"](logger)
+        self.assertIsInstance(step, CleanupStep)
+        self.assertIs(step.logger, logger)
+
+    def test_import_errors_surface_on_first_use(self):
+        logger = MagicMock()
+        STEP_REGISTRY["broken"] = LazyStep("steps.cleanupstep", "MissingStep", logger)
+
+        with self.assertRaises(AttributeError):
+            STEP_REGISTRY["broken"](logger)
+        logger.log_error.assert_called_once()
+
+
+class TestCLIStartup(unittest.TestCase):
+    """`deploy.py` only imports what the requested steps need."""
+
+    def test_trivial_step_skips_heavy_imports(self):
+        returncode, modules = startup_imports("cleanup")
+
+        self.assertEqual(returncode, 0)
+        self.assertIn("steps.cleanupstep", modules)
+        self.assertNotIn("steps.fetchcodestep", modules)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, modules)
+        # Profiling support is only loaded with --profile
+        self.assertNotIn("step_profiler", modules)
+        self.assertNotIn("cProfile", modules)
+
+
+if __name__ == "__main__":
+    unittest.main()
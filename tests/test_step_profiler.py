@@ -0,0 +1,69 @@
+import sys
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deployment_orchestrator import DeploymentOrchestrator
+from deployment_steps import DeploymentStep, STEP_REGISTRY
+
+
+def checksum_loop(rounds):
+    total = 0
+    for value in range(rounds):
+        total = (total * 31 + value) % 1000003
+    return total
+
+
+class ChecksumStep(DeploymentStep):
+    """Spends about 100 ms of CPU time."""
+
+    def execute(self, app=None, **kwargs):
+        for _ in range(20):
+            checksum_loop(50000)
+
+
+class TestStepProfiler(unittest.TestCase):
+    """Tests for `deploy.py --profile` output."""
+
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.saved_registry = dict(STEP_REGISTRY)
+        STEP_REGISTRY["checksum"] = lambda logger: ChecksumStep(logger)
+        self.orchestrator = DeploymentOrchestrator(MagicMock(), run_state_dir=None)
+
+    def tearDown(self):
+        STEP_REGISTRY.clear()
+        STEP_REGISTRY.update(self.saved_registry)
+        self.workdir.cleanup()
+
+    def test_profiling_is_off_by_default(self):
+        self.assertIsNone(self.orchestrator.profiler)
+        self.assertEqual(self.orchestrator.execute_steps(["checksum"], "app"), ["checksum"])
+
+    def test_steps_are_profiled_and_sampled(self):
+        profiler = self.orchestrator.enable_profiling(self.workdir.name, interval=0.001)
+        self.orchestrator.execute_steps(["checksum"], "app1")
+        self.orchestrator.execute_for_apps(["checksum"], ["app2"])
+        profiler.finish()
+
+        stats = pstats.Stats(os.path.join(self.workdir.name, "app1.checksum.prof"))
+        self.assertIn("checksum_loop", {name for _, _, name in stats.stats})
+        self.assertTrue(os.path.exists(os.path.join(self.workdir.name, "app2.checksum.prof")))
+
+        with open(os.path.join(self.workdir.name, "stacks.collapsed")) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith(("app1;checksum;", "app2;checksum;")))
+            self.assertGreater(int(count), 0)
+        self.assertTrue(any("checksum_loop (test_step_profiler.py" in line for line in lines))
+
+
+if __name__ == "__main__":
+    unittest.main()
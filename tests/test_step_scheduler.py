@@ -0,0 +1,95 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from step_scheduler import StepScheduler
+
+
+class TestStepScheduler(unittest.TestCase):
+    """Tests for DAG-based step scheduling."""
+
+    def setUp(self):
+        self.mock_logger = MagicMock()
+        self.dependencies = {
+            "compare": ("fetch",),
+            "package": ("fetch",),
+            "upload": ("package",),
+            "deploy": ("package",),
+            "cleanup": ("upload", "deploy"),
+        }
+
+    def test_dependencies_run_before_dependents(self):
+        """Every step starts only after its dependencies have finished."""
+        order = []
+        lock = threading.Lock()
+
+        def run_step(step):
+            with lock:
+                order.append(step)
+
+        scheduler = StepScheduler(self.mock_logger, max_workers=4)
+        steps = ["cleanup", "deploy", "upload", "package", "compare", "fetch"]
+        executed, timeline = scheduler.run(steps, self.dependencies, run_step)
+
+        self.assertEqual(sorted(executed), sorted(steps))
+        for step, deps in self.dependencies.items():
+            for dep in deps:
+                self.assertLess(order.index(dep), order.index(step), f"{dep} should run before {step}")
+                self.assertLessEqual(timeline.entries[dep]["end"], timeline.entries[step]["start"])
+
+    def test_independent_steps_run_concurrently(self):
+        """Independent steps overlap, so wall time is close to the critical path."""
+        def run_step(step):
+            time.sleep(0.1)
+
+        scheduler = StepScheduler(self.mock_logger, max_workers=4)
+        _, timeline = scheduler.run(["fetch", "compare", "package"], self.dependencies, run_step)
+
+        path, path_seconds = timeline.critical_path()
+        self.assertEqual(path[0], "fetch")
+        self.assertGreater(timeline.serial_time, 0.29)
+        self.assertLess(timeline.wall_time, 0.28)
+        self.assertAlmostEqual(timeline.wall_time, path_seconds, delta=0.05)
+
+    def test_unrequested_dependencies_are_ignored(self):
+        """A step can run on its own even if its dependencies were not requested."""
+        scheduler = StepScheduler(self.mock_logger)
+        executed, _ = scheduler.run(["cleanup"], self.dependencies, lambda step: None)
+        self.assertEqual(executed, ["cleanup"])
+
+    def test_failure_stops_dependent_steps(self):
+        """A failing step prevents its dependents from being scheduled."""
+        scheduler = StepScheduler(self.mock_logger, max_workers=2)
+        steps = ["fetch", "package", "upload", "deploy", "cleanup"]
+        executed, timeline = scheduler.run(steps, self.dependencies, lambda step: step != "package")
+
+        self.assertEqual(executed, ["fetch"])
+        self.assertEqual(timeline.entries["package"]["status"], "failed")
+        for step in ["upload", "deploy", "cleanup"]:
+            self.assertEqual(timeline.entries[step]["status"], "skipped")
+
+    def test_exception_is_reraised_after_draining(self):
+        """Exceptions raised by a step are propagated to the caller."""
+        def run_step(step):
+            if step == "fetch":
+                raise RuntimeError("boom")
+
+        scheduler = StepScheduler(self.mock_logger)
+        with self.assertRaises(RuntimeError):
+            scheduler.run(["fetch", "package"], self.dependencies, run_step)
+        self.assertEqual(scheduler.timeline.entries["package"]["status"], "skipped")
+
+    def test_cycle_is_rejected(self):
+        """Cyclic dependencies raise a ValueError before anything runs."""
+        with self.assertRaises(ValueError):
+            StepScheduler.build_graph(["a", "b"], {"a": ("b",), "b": ("a",)})
+
+
+if __name__ == "__main__":
+    unittest.main()
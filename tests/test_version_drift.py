@@ -0,0 +1,210 @@
+import sys
+import os
+import subprocess
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Ensure `src/` is in the module path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from deployment_orchestrator import DeploymentOrchestrator
+from deployment_steps import DeploymentStep, STEP_REGISTRY
+from steps.compareversionsstep import CompareVersionsStep
+from version_drift import AppVersionSources, DeployedVersions, VersionDriftEngine
+
+HEAD = "a" * 40
+OLD = "b" * 40
+
+
+def manager(commit=None, error=None):
+    fake = MagicMock()
+    fake.fetch_latest_commit.side_effect = error
+    fake.fetch_latest_commit.return_value = commit
+    fake.get_latest_commit.return_value = commit
+    return fake
+
+
+class FakeDeployedVersions:
+    """Stand-in for DeployedVersions backed by a dict of host -> commit."""
+
+    def __init__(self, versions):
+        self.versions = versions
+
+    def read(self, host, remote_package_path):
+        if isinstance(self.versions.get(host), Exception):
+            raise self.versions[host]
+        return self.versions.get(host)
+
+
+def app_sources(app, azure=HEAD, hosts=None):
+    """Sources for an app whose GitHub head is HEAD; `azure=None` leaves out the mirror."""
+    hosts = {"ldctlm01": HEAD, "ldctlm02": HEAD} if hosts is None else hosts
+    return AppVersionSources(app, manager(HEAD), manager(azure) if azure is not None else None, hosts=list(hosts),
+                             deployed_versions=FakeDeployedVersions(hosts),
+                             remote_package_path=f"/deployments/{app}.tar.gz")
+
+
+class TestVersionDriftEngine(unittest.TestCase):
+    """Tests for the GitHub / Azure DevOps / host drift matrix."""
+
+    def test_matrix_reports_each_source(self):
+        matrix = VersionDriftEngine(MagicMock()).run([
+            app_sources("app"),
+            app_sources("api", azure=OLD),
+            app_sources("web", hosts={"ldctlm01": HEAD, "ldctlm02": None}),
+            app_sources("etl", hosts={"ldctlm01": IOError("connection refused")}),
+            app_sources("cli", azure=None, hosts={}),
+        ])
+
+        rows = matrix["apps"]
+        self.assertEqual({app: row["status"] for app, row in rows.items()},
+                         {"app": "in_sync", "api": "drift", "web": "drift", "etl": "error", "cli": "drift"})
+        self.assertEqual(rows["app"]["hosts"], {"ldctlm01": HEAD, "ldctlm02": HEAD})
+        self.assertEqual(rows["api"]["drifted"], ["azure"])
+        self.assertEqual(rows["web"]["drifted"], ["ldctlm02"])
+        self.assertEqual(rows["etl"]["error"], "ldctlm01: connection refused")
+        self.assertEqual((matrix["in_sync"], matrix["drift"], matrix["error"]), (1, 3, 1))
+
+    def test_github_failure_is_an_error(self):
+        sources = app_sources("app")
+        sources.github = manager(error=Exception("GitHub API error: 500"))
+
+        row = VersionDriftEngine(MagicMock()).run([sources])["apps"]["app"]
+
+        self.assertEqual(row["status"], "error")
+        self.assertIn("GitHub: GitHub API error: 500", row["error"])
+
+    def test_format_report_shows_short_versions(self):
+        engine = VersionDriftEngine(MagicMock())
+        lines = engine.format_report(engine.run([app_sources("api", azure=OLD)]))
+        self.assertIn("github=aaaaaaaa azure=bbbbbbbb ldctlm01=aaaaaaaa", lines[1])
+        self.assertIn("drifted: azure", lines[1])
+
+
+class TestDeployedVersions(unittest.TestCase):
+    """Tests for the `.version` markers written next to deployed packages."""
+
+    @patch("version_drift.subprocess.run")
+    def test_markers_are_read_and_written_over_ssh(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=0, stdout=f"{HEAD}\n", stderr="")
+        versions = DeployedVersions(MagicMock())
+
+        self.assertEqual(versions.read("ldctlm01", "/deployments/app.tar.gz"), HEAD)
+        self.assertTrue(versions.write("ldctlm01", "/deployments/app.tar.gz", HEAD))
+        self.assertEqual(mock_run.call_args_list[0][0][0][-1], "cat /deployments/app.tar.gz.version")
+        self.assertIn(f"{HEAD} > /deployments/app.tar.gz.version", mock_run.call_args_list[1][0][0][-1])
+
+    @patch("version_drift.subprocess.run")
+    def test_failed_marker_write_is_a_warning(self, mock_run):
+        """SSH errors and timeouts while writing a marker are logged, never raised."""
+        logger = MagicMock()
+        mock_run.side_effect = subprocess.TimeoutExpired("ssh", 30)
+
+        self.assertFalse(DeployedVersions(logger).write("ldctlm01", "/deployments/app.tar.gz", HEAD))
+        deployer = MagicMock()
+        deployer.run_command.side_effect = OSError("connection reset")
+        self.assertFalse(DeployedVersions(logger).write("ldctlm01", "/deployments/app.tar.gz", HEAD,
+                                                        deployer=deployer))
+
+        self.assertEqual(logger.log_warning.call_count, 2)
+        self.assertIn("connection reset", logger.log_warning.call_args[0][0])
+        logger.log_error.assert_not_called()
+
+    @patch("version_drift.RemoteDeployer")
+    def test_one_deployer_is_reused_per_host(self, mock_deployer_class):
+        mock_deployer_class.return_value.run_command.return_value = (0, f"{HEAD}\n", "")
+        versions = DeployedVersions(MagicMock(), ssh_user="deploy", ssh_key_path="/keys/id_rsa")
+
+        for _ in range(3):
+            self.assertEqual(versions.read("ldctlm01", "/deployments/app.tar.gz"), HEAD)
+
+        mock_deployer_class.assert_called_once()
+        given = MagicMock()
+        given.run_command.return_value = (0, "", "")
+        self.assertTrue(versions.write("ldctlm02", "/deployments/app.tar.gz", HEAD, deployer=given))
+        given.run_command.assert_called_once()
+        mock_deployer_class.assert_called_once()
+
+    @patch("version_drift.subprocess.run")
+    def test_missing_marker_reads_as_none(self, mock_run):
+        mock_run.return_value = MagicMock(returncode=1, stdout="", stderr="No such file")
+        self.assertIsNone(DeployedVersions(MagicMock()).read("ldctlm01", "/deployments/app.tar.gz"))
+
+
+class TestInSyncSkipping(unittest.TestCase):
+    """Apps found in sync by the compare step skip the steps that would redeploy them."""
+
+    class DeployStep(DeploymentStep):
+        skip_when_in_sync = True
+        deployed = []
+        lock = threading.Lock()
+
+        def execute(self, app=None, **kwargs):
+            with self.lock:
+                self.deployed.append(app)
+
+    def setUp(self):
+        self.saved_registry = dict(STEP_REGISTRY)
+        self.orchestrator = DeploymentOrchestrator(MagicMock())
+        STEP_REGISTRY["compare"] = lambda logger: CompareVersionsStep(logger)
+        STEP_REGISTRY["deploy"] = lambda logger: self.DeployStep(logger)
+        self.DeployStep.deployed = []
+
+    def tearDown(self):
+        STEP_REGISTRY.clear()
+        STEP_REGISTRY.update(self.saved_registry)
+
+    def test_compare_step_sets_in_sync(self):
+        step = CompareVersionsStep(MagicMock())
+        with patch.object(CompareVersionsStep, "build_sources", return_value=app_sources("app")):
+            step.execute("app", repo_owner="vzlatsin")
+
+        self.assertTrue(step.context["in_sync"])
+        self.assertEqual(step.context["drift"]["github"], HEAD)
+
+    def test_drift_is_checked_once_for_all_apps(self):
+        """The batch matrix decides which apps deploy; in-sync apps still count as successful."""
+        matrix = {"apps": {"app1": {"status": "in_sync", "github": HEAD},
+                           "app2": {"status": "drift", "github": HEAD}}}
+        with patch.object(CompareVersionsStep, "check_apps", return_value=matrix) as mock_check:
+            results = self.orchestrator.execute_for_apps(["compare", "deploy"], ["app1", "app2"])
+
+        mock_check.assert_called_once()
+        self.assertEqual(set(mock_check.call_args[0][0]), {"app1", "app2"})
+        self.assertEqual(self.DeployStep.deployed, ["app2"])
+        self.assertEqual(results["app1"]["status"], "success")
+        self.assertEqual(results["app1"]["executed_steps"], ["compare", "deploy"])
+
+    def test_parallel_steps_wait_for_compare_before_checking_in_sync(self):
+        """The deploy step declares no dependency on compare, but still runs after it in a parallel run."""
+        self.assertEqual(self.orchestrator.step_dependencies(["compare", "deploy"]),
+                         {"compare": (), "deploy": ("compare",)})
+        self.assertEqual(self.orchestrator.step_dependencies(["deploy"]), {"deploy": ()})
+
+        with patch.object(CompareVersionsStep, "build_sources", return_value=app_sources("app")):
+            self.orchestrator.execute_steps_parallel(["deploy", "compare"], "app", max_workers=2)
+
+        self.assertEqual(self.DeployStep.deployed, [])
+
+    def test_engine_options_are_taken_per_app(self):
+        engines = []
+
+        class RecordingEngine(VersionDriftEngine):
+            def __init__(self, logger, **options):
+                super().__init__(logger, **options)
+                engines.append(options)
+
+        step = CompareVersionsStep(MagicMock())
+        app_params = {"app1": {"max_concurrency": 4}, "app2": {"max_concurrency": 4}, "app3": {"timeout": 5}}
+        with patch.object(CompareVersionsStep, "build_sources", side_effect=lambda app, _: app_sources(app)), \
+                patch("steps.compareversionsstep.VersionDriftEngine", RecordingEngine):
+            matrix = step.check_apps(app_params)
+
+        self.assertEqual(engines, [{"max_concurrency": 4}, {"timeout": 5}])
+        self.assertEqual(set(matrix["apps"]), {"app1", "app2", "app3"})
+        self.assertEqual(matrix["in_sync"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()